@@ -0,0 +1,366 @@
+"""Asyncio client of a CDN gateway.
+
+[`AsyncClient`][proxystore.cdn.async_client.AsyncClient] sends the same
+requests as the synchronous [`Client`][proxystore.cdn.client.Client] for
+objects stored by the gateway, but with [`aiohttp`][aiohttp] so a single
+event loop can keep many transfers in flight without a thread per request.
+Connections are kept alive in a pool shared by all requests of the client.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sys
+import time
+import uuid
+from types import TracebackType
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Sequence
+from typing import TypeVar
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover
+    import warnings
+
+    warnings.warn(
+        f'{e}. To enable the async CDN client, install proxystore with '
+        '"pip install proxystore[cdn]".',
+        stacklevel=2,
+    )
+
+if sys.version_info >= (3, 11):  # pragma: >=3.11 cover
+    from typing import Self
+else:  # pragma: <3.11 cover
+    from typing_extensions import Self
+
+from proxystore.cdn.constants import DEFAULT_ASYNC_LIMIT
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class AsyncClient:
+    """Asyncio client of a CDN gateway.
+
+    The connection pool is created on the first request so the client can
+    be constructed outside of an event loop. The client must be closed with
+    [`close()`][proxystore.cdn.async_client.AsyncClient.close] (or used as
+    an async context manager) from the event loop that used it.
+
+    Args:
+        metadata_server: Address (`host:port`) of the gateway.
+        limit: Maximum number of concurrent connections. Batch methods also
+            keep at most this many requests in flight.
+        limit_per_host: Maximum number of concurrent connections per host
+            (`0` for no limit).
+        timeout: Total timeout in seconds of a request (`None` for no
+            timeout).
+    """
+
+    def __init__(
+        self,
+        metadata_server: str,
+        limit: int = DEFAULT_ASYNC_LIMIT,
+        limit_per_host: int = 0,
+        timeout: float | None = None,
+    ) -> None:
+        if limit < 1:
+            raise ValueError(f'limit must be at least 1. Got {limit}.')
+        self.metadata_server = metadata_server
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def _http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _url(self, *parts: str) -> str:
+        return '/'.join((f'http://{self.metadata_server}/storage', *parts))
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def evict(self, key: str, token_user: str) -> None:
+        """Evict an object.
+
+        Raises:
+            ClientResponseError: If the gateway returns an error.
+        """
+        async with self._http().delete(self._url(token_user, key)) as response:
+            if not response.ok:
+                await _raise_for_status(response, 'Server')
+
+    async def exists(self, key: str, token_user: str) -> bool:
+        """Check if an object exists.
+
+        Raises:
+            ClientResponseError: If the gateway returns an error.
+        """
+        url = self._url(token_user, key, 'exists')
+        async with self._http().get(url) as response:
+            if not response.ok:
+                await _raise_for_status(response, 'Server')
+            return (await response.json(content_type=None))['exists']
+
+    async def get(self, key: str, token_user: str) -> bytes | None:
+        """Get an object stored without client-side dispersal.
+
+        Returns:
+            The object or `None` if the gateway returned neither the object
+            nor a 404.
+
+        Raises:
+            ClientResponseError: If the object does not exist.
+        """
+        async with self._http().get(self._url(token_user, key)) as response:
+            if response.status == 404:
+                await _raise_for_status(response, 'DynoStore')
+            if response.status == 200:
+                return await response.read()
+        return None
+
+    async def put(
+        self,
+        data: bytes,
+        token_user: str,
+        catalog: str,
+        key: str | None = None,
+        name: str | None = None,
+        is_encrypted: bool = False,
+        resiliency: int = 0,
+        number_of_chunks: int = 1,
+        required_chunks: int = 1,
+        nodes: list[str] | None = None,
+    ) -> dict[str, float]:
+        """Put an object for the gateway to store.
+
+        Args:
+            data: Object to put.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            key: Key of the object. A new UUID if `None`.
+            name: Name of the object. Defaults to the hash of the object.
+            is_encrypted: If the object is encrypted.
+            resiliency: Resiliency level of gateway side dispersal.
+            number_of_chunks: Number of fragments of gateway side dispersal.
+            required_chunks: Number of fragments required to restore the
+                object.
+            nodes: Storage nodes to use for D-Rex placement.
+
+        Returns:
+            Dictionary with the total, metadata and upload times in ms.
+
+        Raises:
+            ClientResponseError: If the gateway returns an error.
+        """
+        start = time.perf_counter_ns()
+        key = str(uuid.uuid4()) if key is None else key
+        data_hash = hashlib.sha3_256(data).hexdigest()
+        payload = {
+            'name': data_hash if name is None else name,
+            'size': len(data),
+            'hash': data_hash,
+            'key': key,
+            'is_encrypted': int(is_encrypted),
+            'resiliency': resiliency,
+            'chunks': number_of_chunks,
+            'required_chunks': required_chunks,
+            'nodes': nodes,
+        }
+        form = aiohttp.FormData()
+        form.add_field(
+            'json',
+            json.dumps(payload),
+            filename='payload.json',
+            content_type='application/json',
+        )
+        form.add_field(
+            'data',
+            data,
+            filename='data.bin',
+            content_type='application/octet-stream',
+        )
+        url = self._url(token_user, catalog, key)
+        async with self._http().put(url, data=form) as response:
+            if response.status != 201:
+                await _raise_for_status(response, 'Metadata server')
+            result = await response.json(content_type=None)
+        end = time.perf_counter_ns()
+        return {
+            'total_time': (end - start) / 1e6,
+            'metadata_time': result['total_time'] / 1e6,
+            'upload_time': result['time_upload'] / 1e6,
+        }
+
+    async def _gather(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+    ) -> list[R]:
+        semaphore = asyncio.Semaphore(self.limit)
+
+        async def _run(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+
+        return list(await asyncio.gather(*(_run(item) for item in items)))
+
+    async def _post_batch(
+        self,
+        op: str,
+        keys: Sequence[str],
+        token_user: str,
+    ) -> dict[str, Any]:
+        # Sends one metadata request for all keys.
+        url = self._url(token_user, 'batch')
+        body = {'op': op, 'keys': list(keys)}
+        async with self._http().post(url, json=body) as response:
+            if not response.ok:
+                await _raise_for_status(response, 'Server')
+            return await response.json(content_type=None)
+
+    async def evict_batch(self, keys: Sequence[str], token_user: str) -> None:
+        """Evict a batch of objects with one request."""
+        if len(keys) > 0:
+            await self._post_batch('evict', keys, token_user)
+
+    async def exists_batch(
+        self,
+        keys: Sequence[str],
+        token_user: str,
+    ) -> list[bool]:
+        """Check if a batch of objects exist with one request.
+
+        Returns:
+            List with the same order as `keys`.
+        """
+        if len(keys) == 0:
+            return []
+        return (await self._post_batch('exists', keys, token_user))['exists']
+
+    async def metadata_batch(
+        self,
+        keys: Sequence[str],
+        token_user: str,
+    ) -> list[dict[str, Any] | None]:
+        """Get the metadata of a batch of objects with one request.
+
+        Returns:
+            List with the same order as `keys` (see
+            [`Client.metadata_batch()`][proxystore.cdn.client.Client.metadata_batch]).
+        """
+        if len(keys) == 0:
+            return []
+        return (await self._post_batch('get', keys, token_user))['objects']
+
+    async def get_batch(
+        self,
+        keys: Sequence[str],
+        token_user: str,
+    ) -> list[bytes | None]:
+        """Get a batch of objects.
+
+        The objects are looked up with one metadata request and the objects
+        that exist are downloaded concurrently.
+
+        Returns:
+            List with the same order as `keys` with the objects or `None`
+            for keys without an object.
+        """
+        entries = await self.metadata_batch(keys, token_user)
+
+        async def _get(key: str) -> bytes | None:
+            # The object may be evicted after it was looked up.
+            try:
+                return await self.get(key, token_user)
+            except aiohttp.ClientResponseError as e:
+                if e.status == 404:
+                    return None
+                raise
+
+        present = [
+            key for key, entry in zip(keys, entries) if entry is not None
+        ]
+        objects = iter(await self._gather(_get, present))
+        return [None if entry is None else next(objects) for entry in entries]
+
+    async def put_batch(
+        self,
+        objs: Sequence[bytes],
+        token_user: str,
+        catalog: str,
+        keys: Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, float]]:
+        """Put a batch of objects concurrently.
+
+        Args:
+            objs: Objects to put.
+            token_user: User token.
+            catalog: Catalog to put the objects in.
+            keys: Keys of the objects. New UUIDs if `None`.
+            kwargs: Keyword arguments passed to each
+                [`put()`][proxystore.cdn.async_client.AsyncClient.put].
+
+        Returns:
+            List of timing metrics with the same order as `objs`.
+        """
+        if keys is None:
+            keys = [str(uuid.uuid4()) for _ in objs]
+        elif len(keys) != len(objs):
+            raise ValueError(
+                f'Got {len(objs)} objects but {len(keys)} keys.',
+            )
+        return await self._gather(
+            lambda item: self.put(
+                item[1],
+                token_user,
+                catalog,
+                key=item[0],
+                **kwargs,
+            ),
+            list(zip(keys, objs)),
+        )
+
+
+async def _raise_for_status(
+    response: aiohttp.ClientResponse,
+    server: str,
+) -> None:
+    text = await response.text(errors='replace')
+    raise aiohttp.ClientResponseError(
+        response.request_info,
+        response.history,
+        status=response.status,
+        message=(
+            f'{server} returned HTTP error code {response.status}. {text}'
+        ),
+        headers=response.headers,
+    )
@@ -0,0 +1,223 @@
+"""Latency-aware load balancing over CDN gateways.
+
+A [`GatewayBalancer`][proxystore.cdn.balancer.GatewayBalancer] routes each
+request to one of several gateways that serve the same objects with the
+power of two choices: two healthy gateways are sampled at random and the
+one with the lower load, its moving average latency times its number of
+requests in flight plus one, is chosen. This is the approach of the
+`2CHOICES_UF` load balancer of the Mictlan connector
+([`MictlanConnector`][proxystore.connectors.mictlan.MictlanConnector]).
+
+Gateways whose requests fail to connect are marked unhealthy and skipped
+until a background health check
+([`probe_gateway()`][proxystore.cdn.balancer.probe_gateway]) reaches them
+again.
+"""
+from __future__ import annotations
+
+import contextlib
+import random
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Generator
+from typing import Iterable
+from typing import Sequence
+
+import requests
+
+from proxystore.cdn.constants import GATEWAY_HEALTH_INTERVAL
+from proxystore.cdn.constants import GATEWAY_HEALTH_TIMEOUT
+from proxystore.cdn.constants import LATENCY_EWMA_WEIGHT
+
+FAILOVER_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+"""Errors that mark a gateway unhealthy and are retried on another one."""
+
+
+def probe_gateway(
+    session: requests.Session,
+    gateway: str,
+    timeout: float = GATEWAY_HEALTH_TIMEOUT,
+) -> bool:
+    """Check if a gateway is up.
+
+    Any HTTP response other than a server error means the gateway is up.
+
+    Args:
+        session: Session to send the request with.
+        gateway: Address (`host:port`) of the gateway.
+        timeout: Seconds to wait for a response.
+    """
+    try:
+        response = session.get(f'http://{gateway}/', timeout=timeout)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code < 500
+
+
+class _GatewayState:
+    def __init__(self) -> None:
+        self.latency = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.healthy = True
+
+    def load(self) -> float:
+        return self.latency * (self.in_flight + 1)
+
+
+class GatewayBalancer:
+    """Power of two choices load balancer over gateways.
+
+    Args:
+        gateways: Addresses (`host:port`) of the gateways.
+        probe: Function that checks if a gateway is up. Health checks are
+            disabled if `None`.
+        health_interval: Seconds between health checks of all gateways.
+        weight: Weight of the newest sample in the latency moving average.
+        failover_errors: Errors of a request that mark the gateway
+            unhealthy.
+
+    Raises:
+        ValueError: If `gateways` is empty.
+    """
+
+    def __init__(
+        self,
+        gateways: Sequence[str],
+        probe: Callable[[str], bool] | None = None,
+        health_interval: float = GATEWAY_HEALTH_INTERVAL,
+        weight: float = LATENCY_EWMA_WEIGHT,
+        failover_errors: tuple[type[BaseException], ...] = FAILOVER_ERRORS,
+    ) -> None:
+        if len(gateways) == 0:
+            raise ValueError('At least one gateway is required.')
+        self.gateways = list(gateways)
+        self.weight = weight
+        self.failover_errors = failover_errors
+        self._probe = probe
+        self._states = {gateway: _GatewayState() for gateway in self.gateways}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if probe is not None and len(self.gateways) > 1:
+            self._thread = threading.Thread(
+                target=self._health_loop,
+                args=(health_interval,),
+                daemon=True,
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the health checks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _health_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.check_health()
+
+    def check_health(self) -> None:
+        """Probe every gateway and update if it is healthy."""
+        assert self._probe is not None
+        for gateway in self.gateways:
+            healthy = self._probe(gateway)
+            with self._lock:
+                self._states[gateway].healthy = healthy
+
+    def choose(self, exclude: Iterable[str] = ()) -> str:
+        """Choose the gateway to send a request to.
+
+        Args:
+            exclude: Gateways not to choose (e.g., gateways already tried
+                for the request).
+
+        Returns:
+            The less loaded of two random healthy gateways. Unhealthy
+            gateways are only chosen if no healthy gateway is left.
+
+        Raises:
+            ValueError: If every gateway is excluded.
+        """
+        excluded = set(exclude)
+        with self._lock:
+            candidates = [
+                gateway
+                for gateway in self.gateways
+                if gateway not in excluded and self._states[gateway].healthy
+            ]
+            if len(candidates) == 0:
+                candidates = [
+                    gateway
+                    for gateway in self.gateways
+                    if gateway not in excluded
+                ]
+            if len(candidates) == 0:
+                raise ValueError('All gateways are excluded.')
+            if len(candidates) == 1:
+                return candidates[0]
+            first, second = random.sample(candidates, 2)
+            if self._states[second].load() < self._states[first].load():
+                return second
+            return first
+
+    @contextlib.contextmanager
+    def track(self, gateway: str) -> Generator[None, None, None]:
+        """Track a request sent to a gateway.
+
+        The request counts as in flight in the context. Its latency is
+        added to the moving average of the gateway unless it raises one of
+        the `failover_errors`, which marks the gateway unhealthy.
+        """
+        state = self._states[gateway]
+        with self._lock:
+            state.in_flight += 1
+            state.requests += 1
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except self.failover_errors:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                state.in_flight -= 1
+                if failed:
+                    state.failures += 1
+                    state.healthy = False
+                else:
+                    # The first sample replaces the initial estimate.
+                    weight = self.weight if state.latency else 1.0
+                    state.latency = (
+                        weight * elapsed + (1 - weight) * state.latency
+                    )
+                    state.healthy = True
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Get the state of each gateway.
+
+        Returns:
+            Dictionary mapping each gateway to if it is `healthy`, its
+            moving average `latency` in seconds, and its number of requests
+            `in_flight`, `requests` and `failures`.
+        """
+        with self._lock:
+            return {
+                gateway: {
+                    'healthy': state.healthy,
+                    'latency': state.latency,
+                    'in_flight': state.in_flight,
+                    'requests': state.requests,
+                    'failures': state.failures,
+                }
+                for gateway, state in self._states.items()
+            }
@@ -0,0 +1,104 @@
+"""`proxystore-cdn` command-line interface.
+
+See the CLI Reference for the
+[`proxystore-cdn`](../cli.md#proxystore-cdn) usage instructions.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+
+import click
+import requests
+
+from proxystore.cdn.client import Client
+
+logger = logging.getLogger(__name__)
+
+
+@click.group()
+@click.option(
+    '--log-level',
+    default='INFO',
+    type=click.Choice(
+        ['ERROR', 'WARNING', 'INFO', 'DEBUG'],
+        case_sensitive=False,
+    ),
+    help='Minimum logging level.',
+)
+def cli(log_level: str) -> None:
+    """Manage objects stored in a CDN."""
+    logging.basicConfig(
+        level=log_level,
+        format='%(levelname)s: %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
+
+@cli.command()
+@click.argument('keys', metavar='KEY...', nargs=-1, required=True)
+@click.option(
+    '--gateway',
+    required=True,
+    metavar='ADDR',
+    help='Address (host:port) of the CDN gateway.',
+)
+@click.option(
+    '--token',
+    required=True,
+    metavar='TOKEN',
+    help='User token the objects belong to.',
+)
+@click.option(
+    '--index',
+    'indices',
+    required=True,
+    multiple=True,
+    type=int,
+    metavar='INDEX',
+    help='Fragment index to rebuild. May be given multiple times.',
+)
+@click.option(
+    '--workers',
+    default=1,
+    type=int,
+    metavar='N',
+    help='Threads used to compute each fragment.',
+)
+def repair(
+    keys: tuple[str, ...],
+    gateway: str,
+    token: str,
+    indices: tuple[int, ...],
+    workers: int,
+) -> None:
+    """Rebuild lost fragments of client-side dispersed objects.
+
+    Each fragment is computed from the surviving fragments of its object
+    and uploaded to its storage node without restoring the object.
+    """
+    client = Client(gateway)
+    failed = 0
+    try:
+        for key in keys:
+            try:
+                client.repair_chunks(
+                    key,
+                    list(indices),
+                    token,
+                    max_workers=workers,
+                )
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint='--index') from e
+            except requests.exceptions.RequestException as e:
+                failed += 1
+                logger.error(f'Failed to repair {key}: {e}')
+            else:
+                logger.info(
+                    f'Repaired fragments {list(indices)} of {key}.',
+                )
+    finally:
+        client.close()
+    if failed:
+        logger.error(f'Failed to repair {failed} of {len(keys)} objects.')
+        sys.exit(1)
@@ -1,20 +1,200 @@
 import requests
+import threading
 import uuid
 from proxystore.utils.data import chunk_bytes
+from proxystore.utils.hedging import HedgePolicy
+from proxystore.cdn.constants import CONTENT_INDEX_SIZE
+from proxystore.cdn.constants import DEFAULT_BATCH_WORKERS
+from proxystore.cdn.constants import DEFAULT_POOL_CONNECTIONS
+from proxystore.cdn.constants import DEFAULT_POOL_MAXSIZE
+from proxystore.cdn.constants import DEFAULT_RANGE_SIZE
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DOWNLOAD_BLOCK_SIZE
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.constants import DISPERSE_IDA_SYSTEMATIC
+from proxystore.cdn.constants import FAILED_NODE_PENALTY
+from proxystore.cdn.constants import LATENCY_EWMA_WEIGHT
 from proxystore.cdn.constants import MAX_CHUNK_LENGTH
-from proxystore.cdn.reliability.ida import split_bytes
+from proxystore.cdn.constants import METADATA_CACHE_NEGATIVE_TTL
+from proxystore.cdn.constants import METADATA_CACHE_SIZE
+from proxystore.cdn.constants import METADATA_CACHE_TTL
+from proxystore.cdn.constants import UPLOAD_BLOCK_SIZE
+from proxystore.cdn.constants import UPLOAD_PART_RETRIES
+from proxystore.cdn.constants import UPLOAD_PART_SIZE
+from proxystore.cdn.constants import UPLOAD_RETRY_BACKOFF
+from proxystore.cdn.download import OffsetWriter
+from proxystore.cdn.download import content_length
+from proxystore.cdn.download import parse_content_range
+from proxystore.cdn.download import read_body
+from proxystore.cdn.download import read_body_into
+from proxystore.cdn.metadata_cache import ContentIndex
+from proxystore.cdn.metadata_cache import MetadataCache
+from proxystore.cdn.pool import create_session
+from proxystore.cdn.pool import map_bounded
+from proxystore.cdn.pool import pool_stats
+from proxystore.cdn.reliability import gf256
+from proxystore.cdn.reliability.fragment_handler import FRAGMENT_HEADER
+from proxystore.cdn.reliability.fragment_handler import ContentError
+from proxystore.cdn.reliability.fragment_handler import Fragment
+from proxystore.cdn.reliability.fragment_handler import dumps_fragment
+from proxystore.cdn.reliability.fragment_handler import loads_fragment
+from proxystore.cdn.reliability.fragment_handler import symbol_itemsize
+from proxystore.cdn.reliability.ida import data_fragment_ranges
+from proxystore.cdn.reliability.ida import field_prime
+from proxystore.cdn.reliability.ida import iter_fragments
+from proxystore.cdn.reliability.ida import restore_bytes
+from proxystore.cdn.reliability.ida import restore_range
+from proxystore.cdn.reliability.ida import stripe_range
+from proxystore.cdn.reliability.repair import repair_fragment
+from proxystore.cdn.upload import MultipartFileBody
+from proxystore.cdn.upload import PART_CHECKSUM_HEADER
+from proxystore.cdn.upload import file_digest
+from proxystore.cdn.upload import part_checksum
+from proxystore.cdn.upload import part_ranges
+from concurrent.futures import FIRST_COMPLETED
 from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import ProcessPoolExecutor
-import pickle
+from concurrent.futures import wait
 import time
 import hashlib
 import io
 import json
+import os
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import numpy as np
+
+
+class ObjectNotFoundError(requests.exceptions.RequestException):
+    """The gateway has no object associated with the key."""
+
+
+class ResumableUploadError(requests.exceptions.RequestException):
+    """A resumable upload failed before it was committed.
+
+    Passing `upload_id` to
+    [`put_resumable()`][proxystore.cdn.client.Client.put_resumable] resumes
+    the upload from the parts the gateway acknowledged.
+
+    Attributes:
+        upload_id: ID of the upload.
+    """
+
+    def __init__(
+        self,
+        *args,
+        upload_id: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.upload_id = upload_id
+
 
 class Client(object):
     
-    def __init__(self, metadata_server):
+    def __init__(
+        self,
+        metadata_server,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        metadata_cache_size: int = METADATA_CACHE_SIZE,
+        metadata_cache_ttl: float = METADATA_CACHE_TTL,
+        metadata_cache_negative_ttl: float = METADATA_CACHE_NEGATIVE_TTL,
+        content_index_size: int = CONTENT_INDEX_SIZE,
+        hedge: Optional[HedgePolicy] = None,
+        session: Optional[requests.Session] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        content_index: Optional[ContentIndex] = None,
+        node_latency: Optional[dict] = None,
+        latency_lock: Optional[threading.Lock] = None,
+    ):
+        """Client of a CDN gateway and its storage nodes.
+
+        All requests go through a keep-alive connection pool (see
+        [`create_session()`][proxystore.cdn.pool.create_session]) unless a
+        `session` is passed to a method. Clients of gateways that serve the
+        same objects can share their session, caches and storage node
+        latencies by passing them to the constructor.
+
+        Args:
+            metadata_server: Address (`host:port`) of the gateway.
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of keep-alive connections per host.
+            pool_block: Block when all connections of a host are in use.
+            metadata_cache_size: Maximum number of objects whose existence
+                and dispersal metadata are cached (`0` disables the cache).
+            metadata_cache_ttl: Seconds the existence and metadata of an
+                object are cached.
+            metadata_cache_negative_ttl: Seconds a missing object is
+                remembered as missing.
+            content_index_size: Maximum number of content hashes of put
+                objects remembered for
+                [`put_dedup()`][proxystore.cdn.client.Client.put_dedup]
+                (`0` disables deduplication).
+            hedge: Policy to hedge and retry
+                [`get()`][proxystore.cdn.client.Client.get] with (see
+                [`HedgePolicy`][proxystore.utils.hedging.HedgePolicy]).
+            session: Session to pool connections in instead of creating
+                one from the `pool_*` arguments.
+            metadata_cache: Metadata cache to use instead of creating one
+                from the `metadata_cache_*` arguments.
+            content_index: Content index to use instead of creating one of
+                `content_index_size` entries.
+            node_latency: Storage node latencies to update.
+            latency_lock: Lock guarding `node_latency`. Must be given with
+                `node_latency` if the latencies are shared with other
+                clients.
+        """
         self.metadata_server = metadata_server
+        self.session = (
+            create_session(pool_connections, pool_maxsize, pool_block)
+            if session is None
+            else session
+        )
+        # Avoids a gateway round trip for objects looked up recently. See
+        # MetadataCache for the invalidation rules.
+        self.metadata_cache = (
+            MetadataCache(
+                metadata_cache_size,
+                metadata_cache_ttl,
+                metadata_cache_negative_ttl,
+            )
+            if metadata_cache is None
+            else metadata_cache
+        )
+        # Maps the hash of recently put content to its key for put_dedup().
+        self.content_index = (
+            ContentIndex(content_index_size)
+            if content_index is None
+            else content_index
+        )
+        self.hedge = hedge
+        # Moving average of fragment download latency (seconds) per storage
+        # node used to prefer fast nodes in get_chunks().
+        self.node_latency = {} if node_latency is None else node_latency
+        self._latency_lock = (
+            threading.Lock() if latency_lock is None else latency_lock
+        )
+
+    def _http(
+        self,
+        session: Optional[requests.Session] = None,
+    ) -> requests.Session:
+        return self.session if session is None else session
+
+    def pool_stats(self) -> dict:
+        """Get connection reuse statistics of the client's pool.
+
+        See [`pool_stats()`][proxystore.cdn.pool.pool_stats].
+        """
+        return pool_stats(self.session)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
 
     def evict(
         self,
@@ -22,10 +202,12 @@ class Client(object):
         token_user: str = None,
         session: requests.Session = None
     ) -> None:
-        delete_ = requests.delete if session is None else session.delete
+        delete_ = self._http(session).delete
         response = delete_(
             f'http://{self.metadata_server}/storage/{token_user}/{key}'
         )
+        self.metadata_cache.invalidate(token_user, key)
+        self.content_index.discard(token_user, key)
         
         if not response.ok:
             raise requests.exceptions.RequestException(
@@ -40,8 +222,16 @@ class Client(object):
         token_user: str = None,
         session: requests.Session = None
     ) -> bool:
-        
-        get_ = requests.get if session is None else session.get
+        """Check if an object exists.
+
+        Recent answers are served from the
+        [`metadata_cache`][proxystore.cdn.metadata_cache.MetadataCache].
+        """
+        cached = self.metadata_cache.exists(token_user, key)
+        if cached is not None:
+            return cached
+
+        get_ = self._http(session).get
         response = get_(
             f'http://{self.metadata_server}/storage/{token_user}/{key}/exists'
         )
@@ -52,71 +242,580 @@ class Client(object):
                 response=response,
             )
 
-        return response.json()["exists"]
+        exists = response.json()['exists']
+        self.metadata_cache.set_exists(token_user, key, exists)
+        return exists
 
 
-    def get(
+    def _batch(
+        self,
+        op: str,
+        keys: list,
+        token_user: Optional[str],
+        session: Optional[requests.Session] = None,
+    ) -> dict:
+        # Sends one metadata request for all keys.
+        post = self._http(session).post
+        response = post(
+            f'http://{self.metadata_server}/storage/{token_user}/batch',
+            json={'op': op, 'keys': keys},
+        )
+        if not response.ok:
+            raise requests.exceptions.RequestException(
+                f'Server returned HTTP error code {response.status_code}. '
+                f'{response.text}',
+                response=response,
+            )
+        return response.json()
+
+    def exists_batch(
+        self,
+        keys: Iterable[str],
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ) -> list:
+        """Check if a batch of objects exist with one request.
+
+        Keys in the
+        [`metadata_cache`][proxystore.cdn.metadata_cache.MetadataCache]
+        are answered without a request and the others are checked with a
+        single batch request to the gateway.
+
+        Args:
+            keys: Keys of the objects.
+            token_user: User token the objects belong to.
+            session: Session to use instead of the client's pool.
+
+        Returns:
+            List with the same order as `keys`.
+        """
+        keys = list(keys)
+        cached = [self.metadata_cache.exists(token_user, key) for key in keys]
+        unknown = list(
+            dict.fromkeys(
+                key for key, exists in zip(keys, cached) if exists is None
+            ),
+        )
+        if len(unknown) == 0:
+            return cached
+
+        answers = dict(
+            zip(
+                unknown,
+                self._batch('exists', unknown, token_user, session)['exists'],
+            ),
+        )
+        for key, exists in answers.items():
+            self.metadata_cache.set_exists(token_user, key, exists)
+        return [
+            answers[key] if exists is None else exists
+            for key, exists in zip(keys, cached)
+        ]
+
+    def metadata_batch(
+        self,
+        keys: Iterable[str],
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ) -> list:
+        """Get the metadata of a batch of objects with one request.
+
+        Keys recently found missing, or whose dispersal metadata is in the
+        [`metadata_cache`][proxystore.cdn.metadata_cache.MetadataCache],
+        are answered without a request and the others are looked up with a
+        single batch request to the gateway. The answers are recorded in
+        the cache so that getting the objects afterwards does not look up
+        their metadata again.
+
+        Args:
+            keys: Keys of the objects.
+            token_user: User token the objects belong to.
+            session: Session to use instead of the client's pool.
+
+        Returns:
+            List with the same order as `keys` with the dispersal metadata
+            of objects put with `put_chunks` (see
+            [`pull_from_metadata()`][proxystore.cdn.client.Client.pull_from_metadata]),
+            a dictionary with the `"key"` and `"size"` of other objects, or
+            `None` for keys without an object.
+        """
+        keys = list(keys)
+        known = {}
+        for key in keys:
+            if self.metadata_cache.exists(token_user, key) is False:
+                known[key] = None
+            else:
+                metadata = self.metadata_cache.metadata(token_user, key)
+                if metadata is not None:
+                    known[key] = metadata
+        unknown = list(dict.fromkeys(key for key in keys if key not in known))
+        if len(unknown) > 0:
+            entries = self._batch('get', unknown, token_user, session)
+            for key, entry in zip(unknown, entries['objects']):
+                if entry is None:
+                    self.metadata_cache.set_exists(token_user, key, False)
+                elif 'nodes' in entry:
+                    self.metadata_cache.set_metadata(token_user, key, entry)
+                else:
+                    self.metadata_cache.set_exists(token_user, key, True)
+                known[key] = entry
+        return [known[key] for key in keys]
+
+    def evict_batch(
+        self,
+        keys: Iterable[str],
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """Evict a batch of objects with one request.
+
+        Args:
+            keys: Keys of the objects.
+            token_user: User token the objects belong to.
+            session: Session to use instead of the client's pool.
+        """
+        keys = list(dict.fromkeys(keys))
+        if len(keys) == 0:
+            return
+        try:
+            self._batch('evict', keys, token_user, session)
+        finally:
+            for key in keys:
+                self.metadata_cache.invalidate(token_user, key)
+                self.content_index.discard(token_user, key)
+
+    def get_batch(
+        self,
+        keys: Iterable[str],
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+    ) -> list:
+        """Get a batch of objects stored without client-side dispersal.
+
+        The objects are looked up with one metadata request (see
+        [`metadata_batch()`][proxystore.cdn.client.Client.metadata_batch])
+        and only the objects that exist are downloaded, concurrently over
+        the pooled connections.
+
+        Args:
+            keys: Keys of the objects.
+            token_user: User token the objects belong to.
+            session: Session to use instead of the client's pool.
+            max_workers: Maximum number of concurrent downloads.
+
+        Returns:
+            List with the same order as `keys` with the objects or `None`
+            for keys without an object.
+        """
+        keys = list(keys)
+        entries = self.metadata_batch(keys, token_user, session)
+
+        def _get(key: str) -> Optional[bytes]:
+            try:
+                return self.get(key, token_user, session)
+            except ObjectNotFoundError:
+                return None
+
+        present = [
+            key for key, entry in zip(keys, entries) if entry is not None
+        ]
+        objects = iter(map_bounded(_get, present, max_workers))
+        return [None if entry is None else next(objects) for entry in entries]
+
+    def put_batch(
+        self,
+        objs: Iterable[bytes],
+        token_user: str,
+        catalog: str,
+        keys: Optional[Sequence[str]] = None,
+        session: Optional[requests.Session] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+        **kwargs,
+    ) -> list:
+        """Put a batch of objects concurrently.
+
+        Args:
+            objs: Objects to put.
+            token_user: User token.
+            catalog: Catalog to put the objects in.
+            keys: Keys of the objects. New UUIDs if `None`.
+            session: Session to use instead of the client's pool.
+            max_workers: Maximum number of concurrent requests.
+            kwargs: Keyword arguments passed to each
+                [`put()`][proxystore.cdn.client.Client.put].
+
+        Returns:
+            List of timing metrics with the same order as `objs`.
+
+        Raises:
+            ValueError: If `keys` and `objs` have different lengths.
+        """
+        objs = list(objs)
+        if keys is None:
+            keys = [str(uuid.uuid4()) for _ in objs]
+        elif len(keys) != len(objs):
+            raise ValueError(f'Got {len(objs)} objects but {len(keys)} keys.')
+        return map_bounded(
+            lambda item: self.put(
+                item[1],
+                token_user,
+                catalog,
+                key=item[0],
+                session=session,
+                **kwargs,
+            ),
+            zip(keys, objs),
+            max_workers,
+        )
+
+    def _get_response(
         self,
         key: str,
-        token_user: str = None,
-        session: requests.Session = None
-    ) -> bytes:
-        get = requests.get if session is None else session.get
-        #print(key, type(key), sep=" - ")
-        response = get(
-            f'http://{self.metadata_server}/storage/{token_user}/{key}'
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+    ) -> requests.Response:
+        self._check_missing(key, token_user)
+        response = self._http(session).get(
+            f'http://{self.metadata_server}/storage/{token_user}/{key}',
+            stream=True,
+            timeout=timeout,
         )
-        
-        print(response.text)
-        
+        self._record_status(key, token_user, response)
         if response.status_code == 404:
-            raise requests.exceptions.RequestException(
+            raise ObjectNotFoundError(
                     f'DynoStore returned HTTP error code {response.status_code}. '
                     f'{response.text}',
                     response=response,
                 )
-        #print(response.status_code, flush=True)
-        #print(response.text)
-        
-        if response.status_code == 200:
-            #print(response.json(), flush=True)
-            #databytes = bytes(response.json()["data"][0], 'utf-8')
-            
-            data = bytearray()
-            for chunk in response.iter_content(chunk_size=None):
-                data += chunk
-            #print(data)
-            return bytes(data)
-    
-            #data = response.json["data"]
-            #return data    
-        
-        #     route = response.json()["data"]["routes"][0]["route"]
-        #     get_ = requests.get if session is None else session.get
-        #     response = get_(
-        #         f'http://{route}',
-        #         stream=True,
-        #     )
-            
-            
+        return response
+
+    def _check_missing(self, key: str, token_user: str) -> None:
+        # Fails without a request if the object was missing recently.
+        if self.metadata_cache.exists(token_user, key) is False:
+            raise ObjectNotFoundError(f'Object {key} does not exist (cached).')
+
+    def _record_status(
+        self,
+        key: str,
+        token_user: str,
+        response: requests.Response,
+    ) -> None:
+        if response.status_code == 404:
+            self.metadata_cache.set_exists(token_user, key, False)
+        elif (
+            response.ok and self.metadata_cache.exists(token_user, key) is None
+        ):
+            self.metadata_cache.set_exists(token_user, key, True)
+
+    def _get_ranges(
+        self,
+        key: str,
+        token_user: str,
+        session: requests.Session,
+        allocate,
+        range_size: int,
+        connections: int,
+    ) -> int:
+        # Downloads an object as concurrent byte ranges. allocate(size) is
+        # called once the size is known and returns a function mapping a
+        # range [start, end) to a target for read_body_into().
+        if range_size < 1 or connections < 1:
+            raise ValueError(
+                'range_size and connections must be at least 1. '
+                f'Got {range_size} and {connections}.',
+            )
+        self._check_missing(key, token_user)
+        http = self._http(session)
+        url = f'http://{self.metadata_server}/storage/{token_user}/{key}'
+
+        def _fetch(target_for, start: int, end: int) -> None:
+            with http.get(
+                url,
+                headers={'Range': f'bytes={start}-{end - 1}'},
+                stream=True,
+            ) as response:
+                content_range = response.headers.get('Content-Range', '')
+                valid = response.status_code == 206 and (
+                    parse_content_range(content_range)[:2] == (start, end)
+                )
+                if not valid:
+                    raise requests.exceptions.RequestException(
+                        f'Range {start}-{end - 1} of {key} returned HTTP '
+                        f'code {response.status_code}. {content_range}',
+                        response=response,
+                    )
+                read_body_into(response, target_for(start, end))
+
+        with http.get(
+            url,
+            headers={'Range': f'bytes=0-{range_size - 1}'},
+            stream=True,
+        ) as response:
+            self._record_status(key, token_user, response)
+            if response.status_code == 416:
+                # Empty objects have no satisfiable range.
+                allocate(0)
+                return 0
+            if response.status_code == 200:
+                # The gateway ignored the range and sent the whole object.
+                length = content_length(response)
+                if length is None:
+                    data = read_body(response)
+                    target = allocate(len(data))(0, len(data))
+                    if hasattr(target, 'write'):
+                        target.write(data)
+                    else:
+                        target[:] = data
+                    return len(data)
+                return read_body_into(response, allocate(length)(0, length))
+            if response.status_code != 206:
+                error = (
+                    ObjectNotFoundError
+                    if response.status_code == 404
+                    else requests.exceptions.RequestException
+                )
+                raise error(
+                    'DynoStore returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+
+            _, first_end, size = parse_content_range(
+                response.headers['Content-Range'],
+            )
+            target_for = allocate(size)
+            # Request the other ranges before reading the body of the first.
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                futures = [
+                    executor.submit(
+                        _fetch,
+                        target_for,
+                        start,
+                        min(start + range_size, size),
+                    )
+                    for start in range(first_end, size, range_size)
+                ]
+                try:
+                    read_body_into(response, target_for(0, first_end))
+                    for future in futures:
+                        future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+        return size
+
+    def get(
+        self,
+        key: str,
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        connections: int = 1,
+        range_size: int = DEFAULT_RANGE_SIZE,
+    ) -> Optional[Union[bytes, bytearray]]:
+        """Get an object stored without client-side dispersal.
+
+        The body is read without being decoded and, if the gateway sends
+        its `Content-Length`, is allocated once (see
+        [`read_body()`][proxystore.cdn.download.read_body]).
+
+        With more than one connection, the object is downloaded as byte
+        ranges of `range_size` bytes over up to `connections` concurrent
+        pooled connections into one preallocated buffer. The first request
+        learns the size of the object from its `Content-Range`, and the
+        other ranges are requested as soon as its headers arrive. This uses
+        more of the bandwidth of high-latency links for large objects. The
+        buffer, a `bytearray`, is returned without another copy.
+
+        Args:
+            key: Key of the object.
+            token_user: User token the object belongs to.
+            session: Session to use instead of the client's pool.
+            connections: Maximum number of concurrent range requests. `1`
+                downloads the object in a single request.
+            range_size: Bytes per range request.
+
+        If the client has a `hedge` policy, single request downloads are
+        hedged and retried (see
+        [`HedgePolicy.run()`][proxystore.utils.hedging.HedgePolicy.run]),
+        and server errors raise an error instead of returning `None`.
+        """
+        if connections > 1:
+            buffers = []
+
+            def _allocate(size):
+                buffers.append(bytearray(size))
+                view = memoryview(buffers[0])
+                return lambda start, end: view[start:end]
+
+            self._get_ranges(
+                key,
+                token_user,
+                session,
+                _allocate,
+                range_size,
+                connections,
+            )
+            return buffers[0]
+
+        hedge = self.hedge
+        if hedge is not None:
+            return hedge.run(
+                lambda attempt: self.get_once(
+                    key,
+                    token_user,
+                    session,
+                    hedge.timeout,
+                ),
+            )
+        with self._get_response(key, token_user, session) as response:
+            if response.status_code == 200:
+                return read_body(response)
+        return None
+
+    def get_once(
+        self,
+        key: str,
+        token_user: str,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """Get an object stored without client-side dispersal once.
+
+        Unlike [`get()`][proxystore.cdn.client.Client.get], the request is
+        never hedged and server errors are raised instead of returning
+        `None`, so callers can hedge or retry attempts themselves.
+
+        Args:
+            key: Key of the object.
+            token_user: User token the object belongs to.
+            session: Session to use instead of the client's pool.
+            timeout: Seconds to wait for the gateway, or `None` to wait
+                forever.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+            RequestException: If the gateway returns an error.
+        """
+        with self._get_response(key, token_user, session, timeout) as response:
+            if response.status_code == 200:
+                return read_body(response)
+            raise requests.exceptions.RequestException(
+                f'DynoStore returned HTTP error code {response.status_code}. '
+                f'{response.text}',
+                response=response,
+            )
+
+    def get_into(
+        self,
+        key: str,
+        target,
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        block_size: int = DOWNLOAD_BLOCK_SIZE,
+        connections: int = 1,
+        range_size: int = DEFAULT_RANGE_SIZE,
+    ) -> int:
+        """Get an object into a caller-supplied target.
+
+        Args:
+            key: Key of the object.
+            target: Writable buffer (e.g., `bytearray`, `memoryview` or
+                `mmap`) filled from its start, or a binary file object.
+            token_user: User token the object belongs to.
+            session: Session to use instead of the client's pool.
+            block_size: Maximum bytes received per read.
+            connections: Maximum number of concurrent range requests (see
+                [`get()`][proxystore.cdn.client.Client.get]). Only used
+                for buffer targets.
+            range_size: Bytes per range request.
+
+        Returns:
+            Number of bytes written to the target.
+
+        Raises:
+            ValueError: If `target` is a buffer smaller than the object.
+        """
+        if connections > 1 and not hasattr(target, 'write'):
+            view = memoryview(target).cast('B')
+
+            def _allocate(size):
+                if size > len(view):
+                    raise ValueError(
+                        f'Target of {len(view)} bytes is too small for the '
+                        f'object of {size} bytes.',
+                    )
+                return lambda start, end: view[start:end]
+
+            return self._get_ranges(
+                key,
+                token_user,
+                session,
+                _allocate,
+                range_size,
+                connections,
+            )
+
+        with self._get_response(key, token_user, session) as response:
+            if not response.ok:
+                raise requests.exceptions.RequestException(
+                    'DynoStore returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+            return read_body_into(response, target, block_size)
+
+    def get_to_file(
+        self,
+        key: str,
+        path: str,
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        block_size: int = DOWNLOAD_BLOCK_SIZE,
+        connections: int = 1,
+        range_size: int = DEFAULT_RANGE_SIZE,
+    ) -> int:
+        """Get an object into a file.
+
+        The object is streamed to the file block by block so memory use does
+        not depend on the size of the object. With more than one
+        connection, byte ranges are downloaded concurrently (see
+        [`get()`][proxystore.cdn.client.Client.get]) and each is written
+        at its offset of the file. The file is removed if the download
+        fails.
+
+        Returns:
+            Number of bytes written to the file.
+        """
+        try:
+            with open(path, 'wb') as f:
+                if connections <= 1:
+                    return self.get_into(
+                        key,
+                        f,
+                        token_user,
+                        session,
+                        block_size,
+                    )
+
+                def _allocate(size):
+                    f.truncate(size)
+                    return lambda start, end: OffsetWriter(f.fileno(), start)
+
+                return self._get_ranges(
+                    key,
+                    token_user,
+                    session,
+                    _allocate,
+                    range_size,
+                    connections,
+                )
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
 
-            # Status code 404 is only returned if there's no data associated with the
-            # provided key.
-            # if response.status_code == 404:
-            #     return None
-
-            # if not response.ok:
-            #     raise requests.exceptions.RequestException(
-            #         f'Endpoint returned HTTP error code {response.status_code}. '
-            #         f'{response.text}',
-            #         response=response,
-            #     )
-
-            # data = bytearray()
-            # for chunk in response.iter_content(chunk_size=None):
-            #     data += chunk
-            # return bytes(data)
-            
     def put_drex(
         self,
         data: bytes,
@@ -136,18 +835,29 @@ class Client(object):
         data_hash = hashlib.sha3_256(data).hexdigest()
         name = data_hash if name is None else name
 
-        put = requests.put if session is None else session.put
+        put = self._http(session).put
         fake_file = io.BytesIO(data)
-        
-        payload = {"name": name, "size": len(data), "hash": data_hash, "key": key,
-                        "is_encrypted": int(is_encrypted), "resiliency": resiliency, 
-                        "chunks": number_of_chunks, "required_chunks": required_chunks, 
-                        "nodes": nodes}
-        files   = [
-                    ('json', ('payload.json', json.dumps(payload), 'application/json')),
-                    ('data', ('data.bin', fake_file, 'application/octet-stream'))
-                ]
-        response       = requests.put(f'http://{self.metadata_server}/drex/storage/{token_user}/{catalog}/{key}', files=files)
+
+        payload = {
+            'name': name,
+            'size': len(data),
+            'hash': data_hash,
+            'key': key,
+            'is_encrypted': int(is_encrypted),
+            'resiliency': resiliency,
+            'chunks': number_of_chunks,
+            'required_chunks': required_chunks,
+            'nodes': nodes,
+        }
+        files = [
+            (
+                'json',
+                ('payload.json', json.dumps(payload), 'application/json'),
+            ),
+            ('data', ('data.bin', fake_file, 'application/octet-stream')),
+        ]
+        url = f'http://{self.metadata_server}/drex/storage/{token_user}/{catalog}'
+        response = put(f'{url}/{key}', files=files)
 
         if response.status_code == 201:
             res = response.json()
@@ -157,6 +867,8 @@ class Client(object):
                 f'{response.text}',
                 response=response,
             )
+        self.metadata_cache.set_exists(token_user, key, True)
+        self.content_index.discard(token_user, key)
         end = time.perf_counter_ns()
         return {"total_time": (end - start_time) / 1e6, "metadata_time": res["total_time"] / 1e6, "upload_time": res["time_upload"] / 1e6, "chunking_time": res["chunking_time"] / 1e6}
 
@@ -175,24 +887,37 @@ class Client(object):
         resiliency: int = 0, 
         number_of_chunks=1, 
         required_chunks=1, 
-        nodes=None
+        nodes=None,
+        data_hash: Optional[str] = None,
     ) -> None:
         start_time = time.perf_counter_ns()
-        data_hash = hashlib.sha3_256(data).hexdigest()
+        if data_hash is None:
+            data_hash = hashlib.sha3_256(data).hexdigest()
         name = data_hash if name is None else name
 
-        put = requests.put if session is None else session.put
+        put = self._http(session).put
         fake_file = io.BytesIO(data)
-        
-        payload = {"name": name, "size": len(data), "hash": data_hash, "key": key,
-                        "is_encrypted": int(is_encrypted), "resiliency": resiliency, 
-                        "chunks": number_of_chunks, "required_chunks": required_chunks, 
-                        "nodes": nodes}
-        files   = [
-                    ('json', ('payload.json', json.dumps(payload), 'application/json')),
-                    ('data', ('data.bin', fake_file, 'application/octet-stream'))
-                ]
-        response       = requests.put(f'http://{self.metadata_server}/storage/{token_user}/{catalog}/{key}', files=files)
+
+        payload = {
+            'name': name,
+            'size': len(data),
+            'hash': data_hash,
+            'key': key,
+            'is_encrypted': int(is_encrypted),
+            'resiliency': resiliency,
+            'chunks': number_of_chunks,
+            'required_chunks': required_chunks,
+            'nodes': nodes,
+        }
+        files = [
+            (
+                'json',
+                ('payload.json', json.dumps(payload), 'application/json'),
+            ),
+            ('data', ('data.bin', fake_file, 'application/octet-stream')),
+        ]
+        url = f'http://{self.metadata_server}/storage/{token_user}/{catalog}'
+        response = put(f'{url}/{key}', files=files)
 
         if response.status_code == 201:
             res = response.json()
@@ -202,81 +927,614 @@ class Client(object):
                 f'{response.text}',
                 response=response,
             )
+        self.metadata_cache.set_exists(token_user, key, True)
+        self.content_index.add(token_user, catalog, data_hash, key)
         end = time.perf_counter_ns()
         return {"total_time": (end - start_time) / 1e6, "metadata_time": res["total_time"] / 1e6, "upload_time": res["time_upload"] / 1e6}
 
-    def put_chunks(
+    def lookup_hash(
+        self,
+        data_hash: str,
+        token_user: str,
+        catalog: str,
+        session: Optional[requests.Session] = None,
+    ) -> Optional[str]:
+        """Find an object stored with the content of the hash.
+
+        Args:
+            data_hash: SHA3-256 hash of the content.
+            token_user: User token.
+            catalog: Catalog the object must be stored in.
+            session: Session to use instead of the client's pool.
+
+        Returns:
+            The key of an object stored in the catalog with the content or
+            `None` if there is no such object.
+        """
+        get_ = self._http(session).get
+        response = get_(
+            f'http://{self.metadata_server}/storage/{token_user}/{catalog}/'
+            f'hash/{data_hash}',
+        )
+        if response.status_code == 404:
+            return None
+        if not response.ok:
+            raise requests.exceptions.RequestException(
+                f'Server returned HTTP error code {response.status_code}. '
+                f'{response.text}',
+                response=response,
+            )
+        return response.json()['key']
+
+    def put_alias(
         self,
         key: str,
+        target: str,
+        token_user: str,
+        catalog: str,
+        session: Optional[requests.Session] = None,
+    ) -> dict:
+        """Store an object as a reference to the content of another object.
+
+        The gateway counts the references to the content. Evicting either
+        key drops only that reference, and the content is kept until no
+        key references it.
+
+        Args:
+            key: Key of the new object.
+            target: Key of the stored object with the content.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            session: Session to use instead of the client's pool.
+
+        Returns:
+            Response of the gateway with the number of keys (`"refs"`)
+            referencing the content.
+
+        Raises:
+            ObjectNotFoundError: If `target` does not exist.
+        """
+        post = self._http(session).post
+        response = post(
+            f'http://{self.metadata_server}/storage/{token_user}/{catalog}/'
+            f'{key}/alias',
+            json={'target': target},
+        )
+        if response.status_code == 404:
+            self.metadata_cache.set_exists(token_user, target, False)
+            raise ObjectNotFoundError(
+                f'Object {target} does not exist. {response.text}',
+                response=response,
+            )
+        if not response.ok:
+            raise requests.exceptions.RequestException(
+                f'Server returned HTTP error code {response.status_code}. '
+                f'{response.text}',
+                response=response,
+            )
+        self.content_index.discard(token_user, key)
+        self.metadata_cache.set_exists(token_user, key, True)
+        return response.json()
+
+    def put_reference(
+        self,
         data_hash: str,
-        name: str,
+        token_user: str,
+        catalog: str,
+        key: str,
+        session: Optional[requests.Session] = None,
+    ) -> Optional[dict]:
+        """Store an object as a reference to stored content with its hash.
+
+        The key of an object with the content is taken from the client's
+        [`content_index`][proxystore.cdn.metadata_cache.ContentIndex],
+        which caches the answers of the gateway, or else looked up with
+        [`lookup_hash()`][proxystore.cdn.client.Client.lookup_hash]. The
+        object is then registered as a reference to that content with
+        [`put_alias()`][proxystore.cdn.client.Client.put_alias].
+
+        Args:
+            data_hash: SHA3-256 hash of the object.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            key: Key of the object.
+            session: Session to use instead of the client's pool.
+
+        Returns:
+            Timing metrics in milliseconds with `deduplicated` set to
+            `True`, or `None` if no object with the content is stored and
+            the object must be uploaded.
+        """
+        start_time = time.perf_counter_ns()
+        target = self.content_index.get(token_user, catalog, data_hash)
+        if target is not None:
+            try:
+                self.put_alias(key, target, token_user, catalog, session)
+            except ObjectNotFoundError:
+                # Evicted since it was indexed. Another key may still
+                # reference the content.
+                self.content_index.discard(token_user, target)
+                target = None
+        if target is None:
+            target = self.lookup_hash(data_hash, token_user, catalog, session)
+            if target is None:
+                return None
+            try:
+                self.put_alias(key, target, token_user, catalog, session)
+            except ObjectNotFoundError:
+                return None
+            self.content_index.add(token_user, catalog, data_hash, target)
+        end = time.perf_counter_ns()
+        return {
+            'total_time': (end - start_time) / 1e6,
+            'metadata_time': (end - start_time) / 1e6,
+            'upload_time': 0.0,
+            'deduplicated': True,
+        }
+
+    def put_dedup(
+        self,
         data: bytes,
         token_user: str,
         catalog: str,
-        session: requests.Session = None,
+        key: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        **kwargs,
+    ) -> tuple:
+        """Put an object, uploading its content only if not stored yet.
+
+        If an object with the same SHA3-256 hash is stored in the catalog,
+        the object is stored as a reference to that content (see
+        [`put_reference()`][proxystore.cdn.client.Client.put_reference])
+        and nothing is uploaded. Otherwise the object is put. Either way,
+        the object has its own key: evicting it drops only its reference
+        and leaves other keys with the same content intact.
+
+        Args:
+            data: Object to put.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            key: Key of the object. A new UUID if `None`.
+            session: Session to use for requests.
+            kwargs: Keyword arguments passed to
+                [`put()`][proxystore.cdn.client.Client.put].
+
+        Returns:
+            Tuple of the key of the object and a dictionary of timing
+            metrics in milliseconds. `deduplicated` in the metrics is
+            `True` if nothing was uploaded.
+        """
+        data_hash = hashlib.sha3_256(data).hexdigest()
+        key = str(uuid.uuid4()) if key is None else key
+        metrics = self.put_reference(
+            data_hash,
+            token_user,
+            catalog,
+            key,
+            session,
+        )
+        if metrics is None:
+            metrics = self.put(
+                data,
+                token_user,
+                catalog,
+                key=key,
+                session=session,
+                data_hash=data_hash,
+                **kwargs,
+            )
+            metrics['deduplicated'] = False
+        return key, metrics
+
+    def put_file(
+        self,
+        path: str,
+        token_user: str,
+        catalog: str,
+        key: Optional[str] = None,
+        name: Optional[str] = None,
+        session: Optional[requests.Session] = None,
         is_encrypted: bool = False,
-        chunks: int = 1,
-        required_chunks: int = 1,
-        max_workers: int = 1, 
-        disperse: str = "IDA"
+        resiliency: int = 0,
+        block_size: int = UPLOAD_BLOCK_SIZE,
+    ) -> dict:
+        """Put a file without reading it into memory.
+
+        The file is hashed block by block and then streamed to the gateway
+        as the same multipart body [`put()`][proxystore.cdn.client.Client.put]
+        sends, so memory use does not depend on the size of the file. The
+        hash is sent in the metadata part that precedes the data, so the
+        file is read twice (the second read is usually served from the page
+        cache).
+
+        Args:
+            path: Path of the file.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            key: Key of the object. A new UUID if `None`.
+            name: Name of the object. Defaults to the hash of the file.
+            session: Session to use for requests.
+            is_encrypted: If the file is encrypted.
+            resiliency: Resiliency level of gateway side dispersal.
+            block_size: Bytes read from the file per block.
+
+        Returns:
+            Dictionary of timing metrics in milliseconds.
+        """
+        start_time = time.perf_counter_ns()
+        key = str(uuid.uuid4()) if key is None else key
+        data_hash = file_digest(path, 'sha3_256', block_size)
+        name = data_hash if name is None else name
+        size = os.path.getsize(path)
+        hash_time = (time.perf_counter_ns() - start_time) / 1e6
+
+        payload = {
+            'name': name,
+            'size': size,
+            'hash': data_hash,
+            'key': key,
+            'is_encrypted': int(is_encrypted),
+            'resiliency': resiliency,
+            'chunks': 1,
+            'required_chunks': 1,
+            'nodes': None,
+        }
+        url = f'http://{self.metadata_server}/storage/{token_user}'
+        with MultipartFileBody(payload, path, block_size) as body:
+            response = self._http(session).put(
+                f'{url}/{catalog}/{key}',
+                data=body,
+                headers={'Content-Type': body.content_type},
+            )
+
+        if response.status_code != 201:
+            raise requests.exceptions.RequestException(
+                'Metadata server returned HTTP error code '
+                f'{response.status_code}. {response.text}',
+                response=response,
+            )
+        res = response.json()
+        self.metadata_cache.set_exists(token_user, key, True)
+        self.content_index.add(token_user, catalog, data_hash, key)
+        end = time.perf_counter_ns()
+        return {
+            'total_time': (end - start_time) / 1e6,
+            'hash_time': hash_time,
+            'metadata_time': res['total_time'] / 1e6,
+            'upload_time': res['time_upload'] / 1e6,
+        }
+
+    def put_resumable(
+        self,
+        data: bytes,
+        token_user: str,
+        catalog: str,
+        key: Optional[str] = None,
+        name: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        is_encrypted: bool = False,
+        resiliency: int = 0,
+        part_size: int = UPLOAD_PART_SIZE,
+        max_workers: int = 1,
+        retries: int = UPLOAD_PART_RETRIES,
+        upload_id: Optional[str] = None,
+    ) -> dict:
+        """Put an object in parts that are retried and resumed individually.
+
+        The upload is started on the gateway, then each part of `part_size`
+        bytes is sent with its CRC32 checksum and acknowledged by the
+        gateway once the checksum matches. A part that fails is retried up
+        to `retries` times with exponential backoff, so a transient failure
+        costs one part instead of the whole object. Parts are uploaded by
+        `max_workers` threads. Finally the upload is committed, and the
+        gateway stores the parts as one object.
+
+        If the upload still fails, a
+        [`ResumableUploadError`][proxystore.cdn.client.ResumableUploadError]
+        is raised with the `upload_id`. Calling this method again with the
+        same `data` and the `upload_id` only sends the parts the gateway has
+        not acknowledged (or whose checksum differs).
+
+        Args:
+            data: Bytes-like object to put.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            key: Key of the object. A new UUID if `None`. Ignored when
+                resuming an upload.
+            name: Name of the object. Defaults to the hash of the object.
+            session: Session to use for requests.
+            is_encrypted: If the object is encrypted.
+            resiliency: Resiliency level of gateway side dispersal.
+            part_size: Bytes per part. Ignored when resuming an upload.
+            max_workers: Maximum number of parts uploaded concurrently.
+            retries: Number of times a failed part is retried.
+            upload_id: ID of a failed upload to resume.
+
+        Returns:
+            Dictionary of timing metrics in milliseconds, the number of
+            `parts`, the number of `resumed_parts` that did not need to be
+            sent, and the number of part `retries`.
+
+        Raises:
+            ResumableUploadError: If the upload fails.
+        """
+        start_time = time.perf_counter_ns()
+        http = self._http(session)
+        view = memoryview(data).cast('B')
+
+        if upload_id is None:
+            key = str(uuid.uuid4()) if key is None else key
+            data_hash = hashlib.sha3_256(view).hexdigest()
+            ranges = list(part_ranges(len(view), part_size))
+            payload = {
+                'name': data_hash if name is None else name,
+                'size': len(view),
+                'hash': data_hash,
+                'key': key,
+                'is_encrypted': int(is_encrypted),
+                'resiliency': resiliency,
+                'part_size': part_size,
+                'parts': len(ranges),
+            }
+            url = f'http://{self.metadata_server}/uploads/{token_user}'
+            response = http.post(f'{url}/{catalog}/{key}', json=payload)
+            if response.status_code != 201:
+                raise requests.exceptions.RequestException(
+                    'Metadata server returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+            upload_id = response.json()['upload_id']
+            acknowledged = {}
+        else:
+            status = self.upload_status(upload_id, token_user, session)
+            key, data_hash = status['key'], status['hash']
+            if status['size'] != len(view):
+                raise ValueError(
+                    f'Upload {upload_id} is of {status["size"]} bytes but '
+                    f'got {len(view)} bytes.',
+                )
+            ranges = list(part_ranges(len(view), status['part_size']))
+            acknowledged = status['parts']
+        base = f'http://{self.metadata_server}/uploads/{token_user}/{upload_id}'
+        start_upload = time.perf_counter_ns()
+
+        pending = []
+        for index, (start, end) in enumerate(ranges):
+            checksum = part_checksum(view[start:end])
+            if acknowledged.get(str(index)) != checksum:
+                pending.append((index, start, end, checksum))
+        retried = [0] * len(ranges)
+
+        def _upload(part):
+            index, start, end, checksum = part
+            for attempt in range(retries + 1):
+                if attempt > 0:
+                    retried[index] += 1
+                    time.sleep(UPLOAD_RETRY_BACKOFF * 2 ** (attempt - 1))
+                try:
+                    response = http.put(
+                        f'{base}/{index}',
+                        data=view[start:end],
+                        headers={PART_CHECKSUM_HEADER: checksum},
+                    )
+                except requests.exceptions.ConnectionError as e:
+                    error = e
+                    continue
+                if response.status_code == 200:
+                    return
+                error = requests.exceptions.RequestException(
+                    f'Upload of part {index} returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+                # Checksum mismatches (400) are retried, but missing uploads
+                # and other client errors are not transient.
+                if 400 < response.status_code < 500:
+                    break
+            raise error
+
+        try:
+            map_bounded(_upload, pending, max_workers)
+            end_upload = time.perf_counter_ns()
+            response = http.post(f'{base}/commit')
+            if response.status_code != 201:
+                raise requests.exceptions.RequestException(
+                    'Metadata server returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+        except requests.exceptions.RequestException as e:
+            raise ResumableUploadError(
+                f'Resumable upload {upload_id} of {key} failed: {e}',
+                upload_id=upload_id,
+                response=e.response,
+            ) from e
+        self.metadata_cache.set_exists(token_user, key, True)
+        self.content_index.add(token_user, catalog, data_hash, key)
+        end = time.perf_counter_ns()
+        return {
+            'total_time': (end - start_time) / 1e6,
+            'upload_time': (end_upload - start_upload) / 1e6,
+            'commit_time': (end - end_upload) / 1e6,
+            'parts': len(ranges),
+            'resumed_parts': len(ranges) - len(pending),
+            'retries': sum(retried),
+        }
+
+    def upload_status(
+        self,
+        upload_id: str,
+        token_user: str,
+        session: Optional[requests.Session] = None,
+    ) -> dict:
+        """Get the state of a resumable upload.
+
+        Returns:
+            Metadata of the upload (`key`, `size`, `hash`, `part_size`,
+            ...) and the checksums of the acknowledged `parts` keyed by
+            part index.
+
+        Raises:
+            RequestException: If the upload does not exist.
+        """
+        response = self._http(session).get(
+            f'http://{self.metadata_server}/uploads/{token_user}/{upload_id}',
+        )
+        if response.status_code != 200:
+            raise requests.exceptions.RequestException(
+                'Metadata server returned HTTP error code '
+                f'{response.status_code}. {response.text}',
+                response=response,
+            )
+        return response.json()
+
+    def abort_upload(
+        self,
+        upload_id: str,
+        token_user: str,
+        session: Optional[requests.Session] = None,
     ) -> None:
-        
-        start = time.perf_counter_ns()
-        response = regist_on_metadata(
-            name, data, token_user, data_hash, key, catalog, 
-            session, is_encrypted, chunks, required_chunks, disperse
+        """Abort a resumable upload and discard its parts."""
+        response = self._http(session).delete(
+            f'http://{self.metadata_server}/uploads/{token_user}/{upload_id}',
         )
-        
-        if response.status_code == 201:
-            servers_urls = response.json()["nodes"]
-            end = time.perf_counter_ns()
-            metadata_time = (end - start)  / 1e6
-            
-            
-            start = time.perf_counter_ns()
-            data_chunks = split_bytes(data, chunks, required_chunks)
-            end = time.perf_counter_ns()
-            dispersal_time = (end - start)  / 1e6
-                
-            start = time.perf_counter_ns()
-            if max_workers > 1:
-                #with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                with ProcessPoolExecutor(max_workers=max_workers) as executor:
-                    results = [
-                        executor.submit(
-                            upload_to_storage_node,
-                            servers_urls[i]["route"],
-                            pickle.dumps(data_chunks[i]),
-                            token_user,
-                            session
-                        )
-                        for i in range(chunks)
-                    ]
-                    
-                    for result in results:
-                        if not result.result():
-                            raise requests.exceptions.RequestException(
-                                f'Failed to upload chunk to storage node {result.result()}.'
-                            )
-            else:
-                results = [
-                    upload_to_storage_node(
-                        servers_urls[i]["route"], 
-                        pickle.dumps(data_chunks[i]), 
-                        token_user, session) 
-                    for i in range(chunks)]
-        else:
+        if not response.ok:
             raise requests.exceptions.RequestException(
-                f'Metadata server returned HTTP error code {response.status_code}. '
+                f'Server returned HTTP error code {response.status_code}. '
                 f'{response.text}',
                 response=response,
             )
-            
+
+    def put_chunks(
+        self,
+        key: str,
+        data_hash: str,
+        name: str,
+        data: bytes,
+        token_user: str,
+        catalog: str,
+        session: Optional[requests.Session] = None,
+        is_encrypted: bool = False,
+        chunks: int = 1,
+        required_chunks: int = 1,
+        max_workers: int = 1,
+        disperse: str = DISPERSE_IDA,
+    ) -> dict:
+        """Disperse an object on the client and upload its fragments.
+
+        The steps run as a pipeline: the object is registered with the
+        gateway while the first fragment is encoded, and each fragment is
+        uploaded to its storage node (over the pooled connections) as soon
+        as it is encoded, while the next fragment is encoded. The put takes
+        about the longer of encoding and uploading instead of their sum.
+
+        Args:
+            key: Key of the object.
+            data_hash: Hash of the object registered with the gateway.
+            name: Name of the object.
+            data: Object to disperse.
+            token_user: User token.
+            catalog: Catalog to put the object in.
+            session: Session to use instead of the client's pool.
+            is_encrypted: If the object is encrypted.
+            chunks: Number of fragments (n).
+            required_chunks: Number of fragments required to restore (m).
+            max_workers: Number of threads encoding each fragment and of
+                concurrent fragment uploads.
+            disperse: Dispersal mode.
+
+        Returns:
+            Dictionary with the time (ms) until the gateway answered the
+            registration (`metadata_time`), spent encoding
+            (`dispersal_time`), from the first upload to the last upload
+            completing (`data_upload_time`) and of the whole put
+            (`total_time`).
+
+        Raises:
+            RequestException: If the registration or an upload fails.
+        """
+        start = time.perf_counter_ns()
+        times = {}
+        self.metadata_cache.invalidate(token_user, key)
+        self.content_index.discard(token_user, key)
+
+        def _register() -> list:
+            response = self.regist_on_metadata(
+                name,
+                data,
+                token_user,
+                data_hash,
+                key,
+                catalog,
+                session,
+                is_encrypted,
+                chunks,
+                required_chunks,
+                disperse,
+            )
+            times['metadata'] = time.perf_counter_ns()
+            if response.status_code != 201:
+                raise requests.exceptions.RequestException(
+                    'Metadata server returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+            return response.json()['nodes']
+
+        def _upload(fragment: Fragment) -> None:
+            route = registration.result()[fragment.idx]['route']
+            self.upload_to_storage_node(
+                route,
+                dumps_fragment(fragment),
+                token_user,
+                session,
+            )
+
+        dispersal_time = 0
+        # Reset when the first fragment is submitted so the upload time
+        # excludes encoding it, and defined even if nothing is uploaded.
+        upload_start = time.perf_counter_ns()
+        # One thread registers the object, the others upload fragments.
+        with ThreadPoolExecutor(max_workers=max_workers + 1) as executor:
+            registration = executor.submit(_register)
+            uploads = []
+            fragments = iter_fragments(
+                data,
+                chunks,
+                required_chunks,
+                disperse,
+                workers=max_workers,
+            )
+            while True:
+                encode_start = time.perf_counter_ns()
+                fragment = next(fragments, None)
+                dispersal_time += time.perf_counter_ns() - encode_start
+                if fragment is None:
+                    break
+                # Stop encoding early if the object could not be registered.
+                if registration.done() and registration.exception():
+                    break
+                if len(uploads) == 0:
+                    upload_start = time.perf_counter_ns()
+                uploads.append(executor.submit(_upload, fragment))
+
+            try:
+                registration.result()
+                for upload in uploads:
+                    upload.result()
+            finally:
+                for upload in uploads:
+                    upload.cancel()
+        self.metadata_cache.set_exists(token_user, key, True)
         end = time.perf_counter_ns()
-        
-        data_upload_time = (end - start)  / 1e6 
-        
-        return {"metadata_time": metadata_time, "dispersal_time": dispersal_time, "data_upload_time": data_upload_time}
+
+        return {
+            'metadata_time': (times['metadata'] - start) / 1e6,
+            'dispersal_time': dispersal_time / 1e6,
+            'data_upload_time': (end - upload_start) / 1e6,
+            'total_time': (end - start) / 1e6,
+        }
 
     def regist_on_metadata(
         self,
@@ -293,7 +1551,7 @@ class Client(object):
         disperse: str = "SINGLE"
     ) -> requests.Response:
         
-        post = requests.post if session is None else session.post
+        post = self._http(session).post
         response = post(
             f'http://{self.metadata_server}/api/files/push',
             params={"name": name, "size": len(data), "hash": data_hash, "key": key,
@@ -312,13 +1570,12 @@ class Client(object):
         session: requests.Session = None,
     ) -> bool:
         
-        post = requests.post if session is None else session.post
+        post = self._http(session).post
         response = post(
             f'http://{url}',
             headers={'Content-Type': 'application/octet-stream'},
             params={'tokenuser': token_user},
             data=data,
-            stream=True,
         )
         
         
@@ -330,4 +1587,432 @@ class Client(object):
             )
             
         else:
-            return True
\ No newline at end of file
+            return True
+
+    def pull_from_metadata(
+        self,
+        key: str,
+        token_user: str,
+        session: Optional[requests.Session] = None,
+    ) -> dict:
+        """Get the dispersal metadata of an object put with `put_chunks`.
+
+        Recently pulled metadata is served from the
+        [`metadata_cache`][proxystore.cdn.metadata_cache.MetadataCache].
+
+        Returns:
+            The metadata registered by `regist_on_metadata`, including the
+            storage node `"nodes"` (in fragment index order), `"chunks"`,
+            `"required_chunks"` and `"disperse"`.
+        """
+        metadata = self.metadata_cache.metadata(token_user, key)
+        if metadata is not None:
+            return metadata
+        self._check_missing(key, token_user)
+
+        get_ = self._http(session).get
+        response = get_(
+            f'http://{self.metadata_server}/api/files/pull',
+            params={'key': key, 'tokenuser': token_user},
+        )
+        self._record_status(key, token_user, response)
+        if not response.ok:
+            error = (
+                ObjectNotFoundError
+                if response.status_code == 404
+                else requests.exceptions.RequestException
+            )
+            raise error(
+                'Metadata server returned HTTP error code '
+                f'{response.status_code}. {response.text}',
+                response=response,
+            )
+        metadata = response.json()
+        self.metadata_cache.set_metadata(token_user, key, metadata)
+        return metadata
+
+    def download_from_storage_node(
+        self,
+        url: str,
+        token_user: str,
+        session: Optional[requests.Session] = None,
+    ) -> bytes:
+        """Download one fragment from a storage node."""
+        get_ = self._http(session).get
+        with get_(
+            f'http://{url}',
+            params={'tokenuser': token_user},
+            stream=True,
+        ) as response:
+            if not response.ok:
+                raise requests.exceptions.RequestException(
+                    f'Storage node {url} returned HTTP error code '
+                    f'{response.status_code}. {response.text}',
+                    response=response,
+                )
+            return read_body(response)
+
+    def record_latency(self, node: str, seconds: float) -> None:
+        """Add a latency sample of a storage node to its moving average."""
+        with self._latency_lock:
+            previous = self.node_latency.get(node)
+            if previous is None:
+                self.node_latency[node] = seconds
+            else:
+                self.node_latency[node] = (
+                    LATENCY_EWMA_WEIGHT * seconds
+                    + (1 - LATENCY_EWMA_WEIGHT) * previous
+                )
+
+    def _node_id(self, route: str, key: str) -> str:
+        # Storage node routes end with the object key; the rest of the route
+        # identifies the node.
+        if route.endswith(key):
+            return route[: -len(key)].rstrip('/')
+        return route.split('/', 1)[0]
+
+    def _download_fragment(
+        self,
+        route: str,
+        node: str,
+        token_user: str,
+        session: requests.Session,
+        cancel: threading.Event,
+        byte_range: Optional[tuple] = None,
+    ) -> Optional[bytes]:
+        # Downloads one fragment, or the bytes [start, end) of it, and records
+        # the node latency. Returns None if the download was cancelled;
+        # cancelled downloads still record the time waited as a lower bound
+        # of the node latency.
+        start = time.perf_counter()
+        get_ = self._http(session).get
+        headers = None
+        if byte_range is not None:
+            headers = {'Range': f'bytes={byte_range[0]}-{byte_range[1] - 1}'}
+        try:
+            response = get_(
+                f'http://{route}',
+                params={'tokenuser': token_user},
+                headers=headers,
+                stream=True,
+            )
+            try:
+                if not response.ok:
+                    raise requests.exceptions.RequestException(
+                        f'Storage node {route} returned HTTP error code '
+                        f'{response.status_code}. {response.text}',
+                        response=response,
+                    )
+                # The body is read in one call into a buffer of its length
+                # unless the download was already cancelled.
+                data = None if cancel.is_set() else read_body(response)
+            finally:
+                response.close()
+        except requests.exceptions.RequestException:
+            self.record_latency(
+                node,
+                time.perf_counter() - start + FAILED_NODE_PENALTY,
+            )
+            raise
+        self.record_latency(node, time.perf_counter() - start)
+        if data is None or cancel.is_set():
+            return None
+        if byte_range is not None and response.status_code == 200:
+            # The node ignored the Range header and sent the whole fragment.
+            return data[byte_range[0] : byte_range[1]]
+        return data
+
+    def _fetch_fragments(
+        self,
+        key: str,
+        metadata: dict,
+        token_user: str,
+        session: requests.Session,
+        extra_requests: Optional[int] = None,
+        exclude: tuple = (),
+        byte_ranges: Optional[dict] = None,
+        required: Optional[int] = None,
+    ) -> tuple:
+        # Downloads fragments concurrently until `required` (defaults to
+        # required_chunks) distinct fragments arrived and cancels the rest.
+        # Returns the fragments keyed by index and the errors of failed
+        # downloads. If byte_ranges maps fragment indices to [start, end)
+        # byte ranges, only those fragments are candidates and the raw bytes
+        # of the ranges are returned instead of parsed fragments.
+        if required is None:
+            required = metadata['required_chunks']
+        routes = [node['route'] for node in metadata['nodes']]
+        nodes = [self._node_id(route, key) for route in routes]
+        candidates = range(len(routes)) if byte_ranges is None else byte_ranges
+        with self._latency_lock:
+            pending = sorted(
+                (i for i in candidates if i not in exclude),
+                key=lambda i: (self.node_latency.get(nodes[i], 0.0), i),
+            )
+        in_flight = len(pending)
+        if extra_requests is not None:
+            in_flight = min(in_flight, required + extra_requests)
+
+        fragments = {}
+        errors = []
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max(in_flight, 1))
+        futures = {}
+
+        def _submit():
+            i = pending.pop(0)
+            byte_range = None if byte_ranges is None else byte_ranges[i]
+            future = executor.submit(
+                self._download_fragment,
+                routes[i],
+                nodes[i],
+                token_user,
+                session,
+                cancel,
+                byte_range,
+            )
+            futures[future] = i
+
+        try:
+            while pending and len(futures) < in_flight:
+                _submit()
+            while futures and len(fragments) < required:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures.pop(future)
+                    try:
+                        data = future.result()
+                        if byte_ranges is None:
+                            fragment = loads_fragment(data)
+                            i = fragment.idx
+                        else:
+                            fragment = data
+                    except (
+                        requests.exceptions.RequestException,
+                        ContentError,
+                        ValueError,
+                    ) as e:
+                        errors.append(e)
+                        if pending:
+                            _submit()
+                        continue
+                    fragments.setdefault(i, fragment)
+        finally:
+            # Cancel the stragglers without waiting for them.
+            cancel.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return fragments, errors
+
+    def get_chunks(
+        self,
+        key: str,
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 1,
+        extra_requests: Optional[int] = None,
+    ) -> bytes:
+        """Get an object dispersed on the client with `put_chunks`.
+
+        Fragments are downloaded concurrently and the object is restored as
+        soon as the first `required_chunks` distinct fragments arrive. The
+        remaining downloads are cancelled. Nodes are requested in order of
+        their recorded latency (see `node_latency`) so later reads prefer
+        fast nodes; nodes without samples come first in index order, so for
+        systematic dispersal the data fragments are preferred until nodes
+        are known to be slow.
+
+        Args:
+            key: Key of the object.
+            token_user: User token.
+            session: Session to use for requests.
+            max_workers: Number of threads used to decode the object.
+            extra_requests: Number of fragments requested beyond the
+                `required_chunks` needed (m + k in flight). `None` requests
+                all fragments at once. A new request is started each time a
+                download fails.
+
+        Raises:
+            RequestException: If fewer than `required_chunks` fragments can
+                be downloaded.
+        """
+        metadata = self.pull_from_metadata(key, token_user, session)
+        required = metadata['required_chunks']
+        fragments, errors = self._fetch_fragments(
+            key,
+            metadata,
+            token_user,
+            session,
+            extra_requests,
+        )
+        if len(fragments) < required:
+            raise requests.exceptions.RequestException(
+                f'Only {len(fragments)} of the {required} fragments required '
+                f'to restore {key} could be downloaded. Errors: {errors}',
+            )
+        return restore_bytes(
+            list(fragments.values()),
+            workers=max_workers,
+        ).tobytes()
+
+    def get_range(
+        self,
+        key: str,
+        offset: int,
+        length: int,
+        token_user: Optional[str] = None,
+        session: requests.Session = None,
+        extra_requests: Optional[int] = None,
+    ) -> bytes:
+        """Get a byte range of an object dispersed with `put_chunks`.
+
+        Only the symbols covering the range are downloaded, using HTTP
+        `Range` requests on the fragments, and only those stripes are
+        decoded. For systematic dispersal the range is read directly from
+        the data fragments that hold it when their nodes are up. The range
+        is located from the size recorded in the object metadata; partial
+        reads are not checked against the digest of the whole object.
+
+        Args:
+            key: Key of the object.
+            offset: First byte of the range.
+            length: Number of bytes to read. Truncated at the end of the
+                object.
+            token_user: User token.
+            session: Session to use for requests.
+            extra_requests: Number of fragments requested beyond the
+                `required_chunks` needed. `None` requests all fragments.
+
+        Raises:
+            ValueError: If `offset` is outside of the object.
+            RequestException: If the fragments covering the range cannot be
+                downloaded.
+        """
+        metadata = self.pull_from_metadata(key, token_user, session)
+        size = metadata['size']
+        m, n = metadata['required_chunks'], metadata['chunks']
+        disperse = metadata.get('disperse') or DISPERSE_IDA
+        if not 0 <= offset <= size:
+            raise ValueError(
+                f'Offset {offset} is outside of the object of {size} bytes.',
+            )
+        length = max(0, min(length, size - offset))
+        if length == 0:
+            return b''
+
+        systematic = disperse == DISPERSE_IDA_SYSTEMATIC
+        p = gf256.FIELD_ORDER if disperse == DISPERSE_GF256 else field_prime(n)
+        itemsize = symbol_itemsize(p)
+        dtype = f'<u{itemsize}'
+        header = FRAGMENT_HEADER.size
+
+        if systematic:
+            ranges = data_fragment_ranges(size, m, offset, length)
+            data, _ = self._fetch_fragments(
+                key,
+                metadata,
+                token_user,
+                session,
+                extra_requests=0,
+                byte_ranges={
+                    row: (header + start * itemsize, header + end * itemsize)
+                    for row, start, end in ranges
+                },
+                required=len(ranges),
+            )
+            if len(data) == len(ranges):
+                return b''.join(
+                    np.frombuffer(data[row], dtype=dtype)
+                    .astype(np.uint8)
+                    .tobytes()
+                    for row, _, _ in ranges
+                )
+
+        start, end = stripe_range(size, m, offset, length, systematic)
+        byte_range = (header + start * itemsize, header + end * itemsize)
+        data, errors = self._fetch_fragments(
+            key,
+            metadata,
+            token_user,
+            session,
+            extra_requests,
+            byte_ranges={i: byte_range for i in range(n)},
+        )
+        if len(data) < m:
+            raise requests.exceptions.RequestException(
+                f'Only {len(data)} of the {m} fragments required to restore '
+                f'the range of {key} could be downloaded. Errors: {errors}',
+            )
+        indices = list(data)
+        symbols = [np.frombuffer(data[i], dtype=dtype) for i in indices]
+        return restore_range(
+            indices,
+            symbols,
+            m,
+            p,
+            size,
+            offset,
+            length,
+            systematic,
+        ).tobytes()
+
+    def repair_chunks(
+        self,
+        key: str,
+        indices: list,
+        token_user: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 1,
+    ) -> list:
+        """Rebuild lost fragments of an object put with `put_chunks`.
+
+        Any `required_chunks` of the other fragments are downloaded, each
+        fragment in `indices` is computed from them with
+        [`repair_fragment()`][proxystore.cdn.reliability.repair.repair_fragment]
+        and uploaded to its storage node route. The object is never
+        restored, so repairing one fragment costs `required_chunks` reads
+        and one write.
+
+        Args:
+            key: Key of the object.
+            indices: Zero-based indices of the fragments to rebuild.
+            token_user: User token.
+            session: Session to use for requests.
+            max_workers: Number of threads used to compute each fragment.
+
+        Returns:
+            The indices of the rebuilt fragments.
+
+        Raises:
+            RequestException: If fewer than `required_chunks` fragments can
+                be downloaded or an upload fails.
+            ValueError: If an index is not a fragment of the object.
+        """
+        metadata = self.pull_from_metadata(key, token_user, session)
+        required = metadata['required_chunks']
+        indices = sorted(set(indices))
+        fragments, errors = self._fetch_fragments(
+            key,
+            metadata,
+            token_user,
+            session,
+            extra_requests=0,
+            exclude=tuple(indices),
+        )
+        if len(fragments) < required:
+            raise requests.exceptions.RequestException(
+                f'Only {len(fragments)} of the {required} fragments required '
+                f'to repair {key} could be downloaded. Errors: {errors}',
+            )
+
+        surviving = list(fragments.values())
+        for index in indices:
+            fragment = repair_fragment(surviving, index, workers=max_workers)
+            self.upload_to_storage_node(
+                metadata['nodes'][index]['route'],
+                dumps_fragment(fragment),
+                token_user,
+                session,
+            )
+        return indices
@@ -0,0 +1,207 @@
+"""Adaptive compression of objects put in a CDN.
+
+Compressing an object costs CPU time on both ends, which only pays off if
+the object shrinks. [`compress()`][proxystore.cdn.compression.compress]
+compresses a sample of the object with each candidate codec and compresses
+the whole object with the codec that shrinks the sample the most, or
+leaves the object as is if no codec reaches the minimum ratio.
+
+The name of the codec must be kept with the key of the object (see
+[`CDNKey`][proxystore.connectors.cdn.CDNKey]) to
+[`decompress()`][proxystore.cdn.compression.decompress] it.
+
+Codecs are registered with
+[`register_codec()`][proxystore.cdn.compression.register_codec]. `zlib` is
+always available, and `zstd` and `lz4` are available if
+[`zstandard`](https://pypi.org/project/zstandard/) and
+[`lz4`](https://pypi.org/project/lz4/) are installed.
+"""
+from __future__ import annotations
+
+import time
+import zlib
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Sequence
+
+from proxystore.cdn.constants import COMPRESSION_MIN_RATIO
+from proxystore.cdn.constants import COMPRESSION_SAMPLE_SIZE
+
+_SAMPLE_SLICES = 4
+
+
+class Codec(NamedTuple):
+    """Compression codec.
+
+    Attributes:
+        name: Name the codec is registered and recorded under.
+        compress: Compress a bytes-like object.
+        decompress: Decompress the output of `compress`.
+    """
+
+    name: str
+    compress: Callable[[Any], bytes]
+    decompress: Callable[[Any], bytes]
+
+
+_codecs: dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Register a codec, replacing any codec with the same name."""
+    _codecs[codec.name] = codec
+
+
+def available_codecs() -> list[str]:
+    """Get the names of the registered codecs."""
+    return list(_codecs)
+
+
+def get_codec(name: str) -> Codec:
+    """Get a registered codec.
+
+    Raises:
+        ValueError: If no codec is registered under the name.
+    """
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(
+            f'Unknown compression codec {name!r}. Available codecs: '
+            f'{", ".join(_codecs)}.',
+        ) from None
+
+
+register_codec(
+    Codec(
+        'zlib',
+        lambda data: zlib.compress(data, 1),
+        zlib.decompress,
+    ),
+)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    pass
+else:
+    register_codec(
+        Codec(
+            'zstd',
+            # Compressors and decompressors are not thread-safe, so create
+            # one per call.
+            lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompress(data),
+        ),
+    )
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover
+    pass
+else:
+    register_codec(Codec('lz4', lz4.frame.compress, lz4.frame.decompress))
+
+
+def sample(data: Any, size: int = COMPRESSION_SAMPLE_SIZE) -> bytes:
+    """Take a sample of an object spread over the object.
+
+    Objects up to `size` bytes are returned whole. Larger objects are
+    sampled with slices evenly spaced from the start to the end of the
+    object so a header does not decide the codec of the whole object.
+    """
+    view = memoryview(data).cast('B')
+    if len(view) <= size:
+        return bytes(view)
+    length = size // _SAMPLE_SLICES
+    stride = (len(view) - length) // (_SAMPLE_SLICES - 1)
+    return b''.join(
+        view[i * stride : i * stride + length] for i in range(_SAMPLE_SLICES)
+    )
+
+
+def choose_codec(
+    data: Any,
+    codecs: Sequence[str],
+    sample_size: int = COMPRESSION_SAMPLE_SIZE,
+    min_ratio: float = COMPRESSION_MIN_RATIO,
+) -> str | None:
+    """Choose the codec that compresses a sample of an object the most.
+
+    Args:
+        data: Bytes-like object.
+        codecs: Names of the candidate codecs.
+        sample_size: Bytes of the object to sample.
+        min_ratio: Minimum ratio of the sample size to the compressed sample
+            size.
+
+    Returns:
+        Name of the codec or `None` if no codec reaches `min_ratio`.
+
+    Raises:
+        ValueError: If a codec is not registered.
+    """
+    candidates = [get_codec(name) for name in codecs]
+    data_sample = sample(data, sample_size)
+    if len(data_sample) == 0:
+        return None
+    best, best_size = None, len(data_sample) / min_ratio
+    for codec in candidates:
+        size = len(codec.compress(data_sample))
+        if size < best_size:
+            best, best_size = codec.name, size
+    return best
+
+
+def compress(
+    data: Any,
+    codecs: Sequence[str],
+    sample_size: int = COMPRESSION_SAMPLE_SIZE,
+    min_ratio: float = COMPRESSION_MIN_RATIO,
+) -> tuple[str | None, Any, dict[str, Any]]:
+    """Compress an object with the codec chosen for it.
+
+    See [`choose_codec()`][proxystore.cdn.compression.choose_codec] for the
+    arguments. The object is returned as is if no codec is chosen or if the
+    object does not shrink as much as its sample did.
+
+    Returns:
+        Tuple of the codec name (`None` if the object is not compressed),
+        the object to store, and a dictionary with the `codec`, the
+        `original_size` and `stored_size` in bytes, the `saved_bytes`, and
+        the `compression_time` (CPU time of the calling thread in ms).
+    """
+    start = time.thread_time_ns()
+    codec = choose_codec(data, codecs, sample_size, min_ratio)
+    stored = data
+    if codec is not None:
+        compressed = get_codec(codec).compress(data)
+        if len(compressed) * min_ratio <= len(data):
+            stored = compressed
+        else:
+            codec = None
+    original_size = memoryview(data).nbytes
+    metrics = {
+        'codec': codec,
+        'original_size': original_size,
+        'stored_size': memoryview(stored).nbytes,
+        'saved_bytes': original_size - memoryview(stored).nbytes,
+        'compression_time': (time.thread_time_ns() - start) / 1e6,
+    }
+    return codec, stored, metrics
+
+
+def decompress(data: Any, codec: str | None) -> bytes:
+    """Decompress an object stored with a codec.
+
+    Args:
+        data: Stored object.
+        codec: Name of the codec or `None` if the object is not compressed.
+
+    Raises:
+        ValueError: If the codec is not registered.
+    """
+    if codec is None:
+        return data
+    return get_codec(codec).decompress(data)
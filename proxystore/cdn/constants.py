@@ -6,3 +6,79 @@ MAX_CHUNK_LENGTH = 1000_000
 
 MAX_OBJECT_SIZE_DEFAULT = 100_000_000
 """Default maximum endpoint object size in bytes."""
+
+DISPERSE_SINGLE = 'SINGLE'
+"""Store an object as a single fragment without dispersal."""
+
+DISPERSE_IDA = 'IDA'
+"""Disperse an object with the prime field (p=257) IDA."""
+
+DISPERSE_GF256 = 'GF256'
+"""Disperse an object with Reed-Solomon coding over GF(2^8)."""
+
+DISPERSE_IDA_SYSTEMATIC = 'IDA_SYSTEMATIC'
+"""Disperse an object with the systematic prime field IDA.
+
+The first m fragments hold the object itself so reads with all data
+fragments available do not need to decode.
+"""
+
+LATENCY_EWMA_WEIGHT = 0.3
+"""Weight of the newest sample in the per-node latency moving average."""
+
+FAILED_NODE_PENALTY = 1.0
+"""Seconds added to the latency sample of a failed storage node request."""
+
+DEFAULT_POOL_CONNECTIONS = 16
+"""Default number of per-host connection pools cached by a client."""
+
+DEFAULT_POOL_MAXSIZE = 32
+"""Default maximum number of keep-alive connections per host."""
+
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+"""Bytes read per block when streaming a file to the gateway."""
+
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+"""Bytes received per block when streaming an object into a target."""
+
+DEFAULT_ASYNC_LIMIT = 100
+"""Default maximum number of concurrent connections of an async client."""
+
+DEFAULT_RANGE_SIZE = 8 * 1024 * 1024
+"""Default bytes per request of parallel range downloads."""
+
+METADATA_CACHE_SIZE = 1024
+"""Default maximum number of objects in a client's metadata cache."""
+
+METADATA_CACHE_TTL = 30.0
+"""Default seconds a client caches the metadata and existence of an object."""
+
+METADATA_CACHE_NEGATIVE_TTL = 1.0
+"""Default seconds a client remembers that an object does not exist."""
+
+DEFAULT_BATCH_WORKERS = 16
+"""Default maximum number of concurrent transfers of a batch operation."""
+
+CONTENT_INDEX_SIZE = 1024
+"""Default maximum number of content hashes a client maps to stored keys."""
+
+COMPRESSION_SAMPLE_SIZE = 64 * 1024
+"""Bytes of an object compressed to choose its codec."""
+
+COMPRESSION_MIN_RATIO = 1.1
+"""Minimum compression ratio of the sample for an object to be compressed."""
+
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+"""Default bytes per part of a resumable upload."""
+
+UPLOAD_PART_RETRIES = 3
+"""Default number of times the upload of a part is retried."""
+
+UPLOAD_RETRY_BACKOFF = 0.1
+"""Seconds before the first retry of a part, doubled on each retry."""
+
+GATEWAY_HEALTH_INTERVAL = 5.0
+"""Default seconds between health checks of the gateways of a connector."""
+
+GATEWAY_HEALTH_TIMEOUT = 1.0
+"""Default seconds a gateway health check waits for a response."""
@@ -0,0 +1,196 @@
+"""Copy-free reads of response bodies from a CDN gateway.
+
+`requests` assembles a body from chunks (`response.content`) and decodes it
+again for `response.text`. The helpers here read a streamed response
+(`stream=True`) of known `Content-Length` directly: either as a single
+`bytes` object allocated once, or into a caller-supplied target (a writable
+buffer such as a `bytearray`, `memoryview` or `mmap`, or a binary file)
+block by block.
+
+Large objects can also be read as concurrent byte ranges (see
+[`Client.get()`][proxystore.cdn.client.Client.get]);
+[`parse_content_range()`][proxystore.cdn.download.parse_content_range] and
+[`OffsetWriter`][proxystore.cdn.download.OffsetWriter] support filling one
+buffer or file from several responses.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import requests
+
+from proxystore.cdn.constants import DOWNLOAD_BLOCK_SIZE
+
+
+def content_length(response: requests.Response) -> int | None:
+    """Get the length of the body of a response as sent on the wire.
+
+    Returns:
+        The `Content-Length` of the response or `None` if the length is
+        unknown or the body is encoded (e.g., gzip) so the decoded length
+        differs.
+    """
+    encoding = response.headers.get('Content-Encoding', 'identity')
+    length = response.headers.get('Content-Length')
+    if length is None or encoding.lower() != 'identity':
+        return None
+    return int(length)
+
+
+def parse_content_range(header: str) -> tuple[int, int, int]:
+    """Parse a `Content-Range` header of a single byte range.
+
+    Args:
+        header: Header value (e.g., `bytes 0-99/1000` or `bytes */1000`).
+
+    Returns:
+        Tuple of the first byte, the byte after the last byte, and the size
+        of the whole object. For unsatisfied ranges (`bytes */size`) the
+        range is empty.
+
+    Raises:
+        ValueError: If the header is malformed or the size is unknown.
+    """
+    unit, _, value = header.strip().partition(' ')
+    span, _, total = value.partition('/')
+    if unit != 'bytes' or not total or total == '*':
+        raise ValueError(f'Unsupported Content-Range: {header!r}.')
+    if span == '*':
+        return 0, 0, int(total)
+    first, _, last = span.partition('-')
+    return int(first), int(last) + 1, int(total)
+
+
+def _incomplete(
+    response: requests.Response,
+    expected: int,
+    received: int,
+) -> requests.exceptions.ChunkedEncodingError:
+    return requests.exceptions.ChunkedEncodingError(
+        f'Response body ended after {received} of {expected} bytes.',
+        response=response,
+    )
+
+
+def read_body(response: requests.Response) -> bytes:
+    """Read the body of a streamed response.
+
+    If the length of the body is known, the body is read in a single call
+    so the bytes are allocated once and never copied or decoded.
+
+    Raises:
+        ChunkedEncodingError: If the body is shorter than `Content-Length`.
+    """
+    length = content_length(response)
+    if length is None:
+        return response.content
+    data = response.raw.read(length)
+    if len(data) != length:
+        raise _incomplete(response, length, len(data))
+    return data
+
+
+def read_body_into(
+    response: requests.Response,
+    target: Any,
+    block_size: int = DOWNLOAD_BLOCK_SIZE,
+) -> int:
+    """Read the body of a streamed response into a target.
+
+    Args:
+        response: Response sent with `stream=True`.
+        target: Writable buffer (e.g., `bytearray`, `memoryview` or
+            `mmap`) filled from its start, or a binary file object written
+            at its current position.
+        block_size: Maximum bytes received per read.
+
+    Returns:
+        Number of bytes read.
+
+    Raises:
+        ValueError: If `target` is a buffer smaller than the body.
+        ChunkedEncodingError: If the body is shorter than `Content-Length`.
+    """
+    length = content_length(response)
+    if hasattr(target, 'write'):
+        return _read_into_file(response, target, length, block_size)
+
+    view = memoryview(target).cast('B')
+    if length is None:
+        # Unknown length so the body may only be checked after reading it.
+        received = 0
+        for chunk in response.iter_content(chunk_size=block_size):
+            if received + len(chunk) > len(view):
+                raise ValueError(
+                    f'Target of {len(view)} bytes is too small for the '
+                    'response body.',
+                )
+            view[received : received + len(chunk)] = chunk
+            received += len(chunk)
+        return received
+
+    if length > len(view):
+        raise ValueError(
+            f'Target of {len(view)} bytes is too small for the response '
+            f'body of {length} bytes.',
+        )
+    received = 0
+    while received < length:
+        end = min(received + block_size, length)
+        count = response.raw.readinto(view[received:end])
+        if not count:
+            raise _incomplete(response, length, received)
+        received += count
+    return received
+
+
+def _read_into_file(
+    response: requests.Response,
+    file: Any,
+    length: int | None,
+    block_size: int,
+) -> int:
+    if length is None:
+        received = 0
+        for chunk in response.iter_content(chunk_size=block_size):
+            file.write(chunk)
+            received += len(chunk)
+        return received
+
+    # A single block is reused for the whole body.
+    block = memoryview(bytearray(min(block_size, length)))
+    received = 0
+    while received < length:
+        count = response.raw.readinto(block[: length - received])
+        if not count:
+            raise _incomplete(response, length, received)
+        file.write(block[:count])
+        received += count
+    return received
+
+
+class OffsetWriter:
+    """Binary file-like writer at an offset of an open file.
+
+    Writes use `os.pwrite` so several writers can fill disjoint ranges of
+    the same file concurrently without sharing a file position.
+
+    Args:
+        fd: File descriptor opened for writing.
+        offset: Offset of the first byte written.
+    """
+
+    def __init__(self, fd: int, offset: int = 0) -> None:
+        self.fd = fd
+        self.offset = offset
+
+    def write(self, data: Any) -> int:
+        """Write all of `data` at the current offset and advance it."""
+        view = memoryview(data).cast('B')
+        written = 0
+        while written < len(view):
+            offset = self.offset + written
+            written += os.pwrite(self.fd, view[written:], offset)
+        self.offset += written
+        return written
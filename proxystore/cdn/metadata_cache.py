@@ -0,0 +1,246 @@
+"""Client-side cache of object metadata.
+
+[`Client`][proxystore.cdn.client.Client] looks up whether an object exists
+and where its fragments are stored on every `exists()` and `get()`.
+[`MetadataCache`][proxystore.cdn.metadata_cache.MetadataCache] remembers
+the answers per `(token_user, key)` for a short time so repeated lookups of
+recently written or read objects (e.g., by polling factories) do not cost a
+round trip to the gateway each time.
+
+Entries expire after a time-to-live, and the least recently used entries
+are dropped beyond the size bound. Lookups and updates take constant time
+regardless of the size of the cache. Objects that were missing are remembered
+as negative entries with a shorter time-to-live so that an object written
+by another client is seen soon after.
+
+[`ContentIndex`][proxystore.cdn.metadata_cache.ContentIndex] maps the hash
+of recently uploaded or looked up content to a key it is stored under so
+that a deduplicated put can reference the content without asking the
+gateway for a key with the hash first.
+"""
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+
+from proxystore.cdn.constants import CONTENT_INDEX_SIZE
+from proxystore.cdn.constants import METADATA_CACHE_NEGATIVE_TTL
+from proxystore.cdn.constants import METADATA_CACHE_SIZE
+from proxystore.cdn.constants import METADATA_CACHE_TTL
+
+
+class MetadataEntry(NamedTuple):
+    """Cached knowledge about an object.
+
+    Attributes:
+        exists: If the object exists.
+        metadata: Dispersal metadata of the object if known.
+        expires: Clock time after which the entry is stale.
+    """
+
+    exists: bool
+    metadata: dict[str, Any] | None
+    expires: float
+
+
+class MetadataCache:
+    """Thread-safe TTL cache of object existence and metadata.
+
+    Args:
+        maxsize: Maximum number of objects cached. `0` disables the cache.
+        ttl: Seconds positive entries (objects that exist) are valid.
+        negative_ttl: Seconds negative entries (missing objects) are valid.
+            `0` disables negative entries.
+        clock: Monotonic clock in seconds.
+
+    Raises:
+        ValueError: If `maxsize` or a time-to-live is negative.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = METADATA_CACHE_SIZE,
+        ttl: float = METADATA_CACHE_TTL,
+        negative_ttl: float = METADATA_CACHE_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError('Cache size must be >= 0.')
+        if ttl < 0 or negative_ttl < 0:
+            raise ValueError('Cache time-to-live must be >= 0.')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        # Ordered from least to most recently used.
+        self._entries: collections.OrderedDict[
+            tuple[str, str],
+            MetadataEntry,
+        ] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, token_user: str, key: str) -> MetadataEntry | None:
+        """Get the valid entry of an object.
+
+        Returns:
+            The entry or `None` if the object is not cached or its entry
+            expired.
+        """
+        with self._lock:
+            entry = self._entries.get((token_user, key))
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires <= self._clock():
+                del self._entries[(token_user, key)]
+                self._misses += 1
+                return None
+            self._entries.move_to_end((token_user, key))
+            self._hits += 1
+            return entry
+
+    def exists(self, token_user: str, key: str) -> bool | None:
+        """Check if an object is known to exist.
+
+        Returns:
+            If the object exists, or `None` if unknown.
+        """
+        entry = self.lookup(token_user, key)
+        return None if entry is None else entry.exists
+
+    def metadata(self, token_user: str, key: str) -> dict[str, Any] | None:
+        """Get the cached dispersal metadata of an object."""
+        entry = self.lookup(token_user, key)
+        return None if entry is None else entry.metadata
+
+    def _set(
+        self,
+        token_user: str,
+        key: str,
+        exists: bool,
+        metadata: dict[str, Any] | None,
+    ) -> None:
+        ttl = self.ttl if exists else self.negative_ttl
+        with self._lock:
+            self._entries.pop((token_user, key), None)
+            if ttl > 0 and self.maxsize > 0:
+                self._entries[(token_user, key)] = MetadataEntry(
+                    exists,
+                    metadata,
+                    self._clock() + ttl,
+                )
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def set_exists(self, token_user: str, key: str, exists: bool) -> None:
+        """Record if an object exists.
+
+        Any cached metadata of the object is dropped because the object
+        may have been replaced.
+        """
+        self._set(token_user, key, exists, None)
+
+    def set_metadata(
+        self,
+        token_user: str,
+        key: str,
+        metadata: dict[str, Any],
+    ) -> None:
+        """Record the dispersal metadata of an existing object."""
+        self._set(token_user, key, True, metadata)
+
+    def invalidate(self, token_user: str, key: str) -> None:
+        """Drop the entry of an object."""
+        with self._lock:
+            self._entries.pop((token_user, key), None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of `hits`, `misses` and cached entries (`size`)."""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'size': len(self._entries),
+            }
+
+
+class ContentIndex:
+    """Thread-safe LRU map from content hashes to stored keys.
+
+    The index is only a cache of the gateway's hash lookups (see
+    [`Client.lookup_hash()`][proxystore.cdn.client.Client.lookup_hash]):
+    an indexed key may have been evicted by another client since. Hashes
+    are scoped by `(token_user, catalog)` like on the gateway.
+
+    Args:
+        maxsize: Maximum number of hashes indexed. `0` disables the index.
+
+    Raises:
+        ValueError: If `maxsize` is negative.
+    """
+
+    def __init__(self, maxsize: int = CONTENT_INDEX_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError('Index size must be >= 0.')
+        self.maxsize = maxsize
+        # Ordered from least to most recently used.
+        self._keys: collections.OrderedDict[
+            tuple[str, str, str],
+            str,
+        ] = collections.OrderedDict()
+        # Reverse map used to drop the hashes of evicted keys.
+        self._hashes: dict[tuple[str, str], tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token_user: str, catalog: str, digest: str) -> str | None:
+        """Get the key content with the hash was stored under."""
+        entry = (token_user, catalog, digest)
+        with self._lock:
+            key = self._keys.get(entry)
+            if key is not None:
+                self._keys.move_to_end(entry)
+            return key
+
+    def add(
+        self,
+        token_user: str,
+        catalog: str,
+        digest: str,
+        key: str,
+    ) -> None:
+        """Record that content with the hash is stored under the key."""
+        entry = (token_user, catalog, digest)
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            # The key may have held other content, and the content may have
+            # been indexed under another key.
+            stale = self._hashes.pop((token_user, key), None)
+            if stale is not None:
+                self._keys.pop(stale, None)
+            previous = self._keys.pop(entry, None)
+            if previous is not None:
+                self._hashes.pop((token_user, previous), None)
+            self._keys[entry] = key
+            self._hashes[(token_user, key)] = entry
+            if len(self._keys) > self.maxsize:
+                dropped, dropped_key = self._keys.popitem(last=False)
+                self._hashes.pop((dropped[0], dropped_key), None)
+
+    def discard(self, token_user: str, key: str) -> None:
+        """Drop the hash of content stored under the key."""
+        with self._lock:
+            entry = self._hashes.pop((token_user, key), None)
+            if entry is not None:
+                self._keys.pop(entry, None)
@@ -0,0 +1,2 @@
+"""Information dispersal for erasure-coded CDN objects."""
+from __future__ import annotations
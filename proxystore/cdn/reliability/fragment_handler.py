@@ -1,92 +1,218 @@
+"""Fragment container and serialization.
+
+Fragments are exchanged with storage nodes and written to files in a
+compact binary container: a fixed size header followed by the raw symbol
+buffer of the fragment.
+
+| Field       | Type      | Description                                   |
+| ----------- | --------- | --------------------------------------------- |
+| magic       | 4 bytes   | `b'PSFR'`                                     |
+| version     | uint8     | Container format version (1).                 |
+| flags       | uint8     | Bit 0 is set for systematic dispersal.        |
+| itemsize    | uint8     | Bytes per symbol (1, 2 or 8).                 |
+| idx         | uint32    | Zero-based index of the fragment.             |
+| m           | uint32    | Fragments required to restore the payload.    |
+| n           | uint32    | Total number of fragments.                    |
+| p           | uint64    | Field order (a prime p, or 256 for GF(2^8)).  |
+| length      | uint64    | Length in bytes of the original payload.      |
+| digest      | 28 bytes  | SHA-224 digest of the original payload.       |
+| checksum    | uint32    | CRC-32 of the symbol buffer.                  |
+
+All integers are little-endian. Symbols are stored as little-endian
+unsigned integers of `itemsize` bytes.
+"""
+from __future__ import annotations
+
 import hashlib
+import struct
+import zlib
 
-class ContentError(Exception): 
-    pass
-    
-def fragment_writer(filename, n, m, p, original_file, fragments):
+import numpy as np
 
-    # hash value of the original_file is used to check 
-    # if the input "fragments_filenames" to the function "assemble" 
-    # are derived from the same file
-    original_file_hash = hashlib.sha224(original_file).digest()
-    
-    # write fragments to files  
-    # fragment i is written to the file <original_filename><original_file_hash>_i
+
+class ContentError(Exception):
+    """Fragment or restored content does not match its checksum."""
+
+
+class Fragment:
+    """Fragment of a dispersed payload.
+
+    Args:
+        idx: Zero-based index of the fragment.
+        content: Symbols of the fragment.
+        p: Field order used to encode the fragment.
+        n: Total number of fragments.
+        m: Minimum number of fragments required to restore the payload.
+        systematic: If the payload was dispersed with the systematic IDA.
+        length: Length in bytes of the original payload.
+        digest: Digest of the original payload.
+    """
+
+    def __init__(
+        self,
+        idx,
+        content,
+        p,
+        n,
+        m,
+        systematic=False,
+        length=None,
+        digest=None,
+    ):
+        self.idx = idx
+        self.content = content
+        self.p = p
+        self.n = n
+        self.m = m
+        self.systematic = systematic
+        self.length = length
+        self.digest = digest
+
+
+FRAGMENT_MAGIC = b'PSFR'
+FRAGMENT_VERSION = 1
+FRAGMENT_HEADER = struct.Struct('<4sBBBxIIIQQ28sI')
+"""Layout of the fixed size fragment header."""
+
+_FLAG_SYSTEMATIC = 1
+
+
+def payload_digest(data) -> bytes:
+    """Digest of an original payload stored in fragment headers."""
+    return hashlib.sha224(data).digest()
+
+
+def symbol_itemsize(p: int) -> int:
+    """Bytes per symbol needed to store values modulo `p`."""
+    if p <= (1 << 8):
+        return 1
+    elif p <= (1 << 16):
+        return 2
+    return 8
+
+
+def dumps_fragment(fragment: Fragment) -> bytes:
+    """Serialize a fragment into the binary container format.
+
+    Args:
+        fragment: Fragment with `length` and `digest` set.
+
+    Returns:
+        The header followed by the symbols of the fragment.
+
+    Raises:
+        ValueError: If the fragment is missing its `length` or `digest`.
+    """
+    if fragment.length is None or fragment.digest is None:
+        raise ValueError(
+            'Fragment must have the length and digest of the original '
+            'payload to be serialized.',
+        )
+    itemsize = symbol_itemsize(fragment.p)
+    symbols = np.asarray(fragment.content).astype(f'<u{itemsize}', copy=False)
+    buffer = memoryview(np.ascontiguousarray(symbols)).cast('B')
+    header = FRAGMENT_HEADER.pack(
+        FRAGMENT_MAGIC,
+        FRAGMENT_VERSION,
+        _FLAG_SYSTEMATIC if fragment.systematic else 0,
+        itemsize,
+        fragment.idx,
+        fragment.m,
+        fragment.n,
+        fragment.p,
+        fragment.length,
+        fragment.digest,
+        zlib.crc32(buffer),
+    )
+    return b''.join((header, buffer))
+
+
+def loads_fragment(data, verify: bool = True) -> Fragment:
+    """Deserialize a fragment from the binary container format.
+
+    The content of the returned fragment is a read-only array viewing
+    `data` (e.g., `bytes`, a `memoryview` or an `mmap`) so no copy of the
+    symbols is made.
+
+    Args:
+        data: Buffer containing one serialized fragment.
+        verify: Check the CRC-32 of the symbol buffer.
+
+    Raises:
+        ValueError: If `data` is not a fragment container.
+        ContentError: If `verify` is set and the checksum does not match.
+    """
+    view = memoryview(data).cast('B')
+    if len(view) < FRAGMENT_HEADER.size:
+        raise ValueError('Buffer is too small to contain a fragment.')
+    (
+        magic,
+        version,
+        flags,
+        itemsize,
+        idx,
+        m,
+        n,
+        p,
+        length,
+        digest,
+        checksum,
+    ) = FRAGMENT_HEADER.unpack_from(view)
+    if magic != FRAGMENT_MAGIC or version != FRAGMENT_VERSION:
+        raise ValueError('Buffer does not contain a version 1 fragment.')
+    buffer = view[FRAGMENT_HEADER.size :]
+    if len(buffer) % itemsize:
+        raise ValueError('Fragment symbol buffer is truncated.')
+    if verify and zlib.crc32(buffer) != checksum:
+        raise ContentError(f'The content of fragment {idx} is corrupted.')
+    content = np.frombuffer(buffer, dtype=f'<u{itemsize}')
+    return Fragment(
+        idx,
+        content,
+        p,
+        n,
+        m,
+        systematic=bool(flags & _FLAG_SYSTEMATIC),
+        length=length,
+        digest=digest,
+    )
+
+
+def fragment_writer(filename, fragments):
+    """Write fragments to files next to the original file.
+
+    Fragment `i` is written to `<original_filename>_fragment<i>`.
+
+    Args:
+        filename: Name of the original file.
+        fragments: List of fragments.
+
+    Returns:
+        List of the names of the files the fragments were written to.
+    """
     original_filename = filename.split(".")[0]
-    fragment_filehandles={}    
     fragment_filenames=[]
-    for idx in range(n): 
-        fragment_filename = "{}_fragment{}".format(original_filename,idx )
+    for fragment in fragments:
+        fragment_filename = f'{original_filename}_fragment{fragment.idx}'
         fragment_filenames.append(fragment_filename)
-        fragment_filehandle = open(fragment_filename,'w')
-        fragment_filehandles[idx]=fragment_filehandle
-        fragment_content = str(fragments[idx])
-        # compute the hash of fragment_content for error detection
-        fragment_hash =  hashlib.sha224(bytes(fragment_content,encoding='utf8')).digest()
-        # write identifiers for each file (idx,m,n,p,original_file_hash)
-        fragment_filehandle.write("{} {} {} {}\n".format(idx, m, n, p))
-        fragment_filehandle.write("{}\n".format(original_file_hash))
-        fragment_filehandle.write("{}\n".format(fragment_hash))
-        fragment_filehandle.write(fragment_content)
-        fragment_filehandle.close()
+        with open(fragment_filename, 'wb') as fh:
+            fh.write(dumps_fragment(fragment))
     return fragment_filenames
 
-def fragment_reader(filenames): 
+
+def fragment_reader(filenames):
     """
     Inputs: 
     filenames: a list of strings correspond to filenames of fragments
     Output:
-    (m_, n_, p_, fragments): (int, int, int, [(idx, [int])]
+    a list of fragments (as Fragment objects)
     """
-    fragments=[] 
-    
-    if not filenames: 
-        return fragments
-    
-    # take the parameters m, n, p, original_file_hash of the first fragment
-    # the rest of the fragments should have the same values for these parameters
-    filename=filenames[0]
-    with open(filename,'r') as fh:
-        idx, m_, n_, p_= map(eval,fh.readline().split(" "))
-        original_file_hash_=eval(fh.readline())
-
-    # there should be at least m_ fragments
-    if len(filenames)<m_:
-        raise ValueError("Number of fragments is below the minimum number of fragments required to assemble the file.")
-    
-    # take the first m_ different fragments
-    indices=set() # store the indices of the fragments
-    count=0
+    fragments = []
     for filename in filenames:
-        if count<m_:
-            with open(filename,'r') as fh:
-                
-                idx, m, n, p=map(eval,fh.readline().split(" "))
-                original_file_hash=eval(fh.readline())
-                fragment_hash =eval(fh.readline())
-                # if idx is already in indices, skip this file
-                if idx in indices: 
-                    continue
-                else: 
-                    indices.add(idx)
-                
-                # check if the fragments have the same values of the parameters m, n, p, original_file_hash
-                if (m,n,p,original_file_hash)!=(m_, n_,p_, original_file_hash_):
-                    raise ValueError("These fragments are not derived from the same file.")
-                fragment_content = fh.read()
-                # check if the file content is corrupted
-                if hashlib.sha224(bytes(fragment_content,encoding='utf8')).digest()!=fragment_hash:
-                    raise ContentError("The content of {} has been compromised.".format(filename))
-
-            fragments.append((idx+1,eval(fragment_content)))
-            count+=1
-        else: 
-            break
-    if count<m: 
-        raise ValueError("There are duplicate fragments. The total number of different fragments are insufficient to assemble the file.")
-    
-    return (m_, n_, p_, fragments)
-    
+        with open(filename, 'rb') as fh:
+            fragments.append(loads_fragment(fh.read()))
+    return fragments
+
 
 def fragment_reader_bytes(fragments): 
     """
@@ -0,0 +1,299 @@
+"""Reed-Solomon dispersal over GF(2^8).
+
+The prime field IDA in [`ida`][proxystore.cdn.reliability.ida] works
+modulo p=257 so fragment symbols need more than 8 bits. Working in
+GF(2^8) instead keeps every symbol in one byte: each of the `n` fragments
+of a payload of `size` bytes is exactly `ceil(size / m)` bytes, so the
+storage and network overhead is exactly `n / m`.
+
+Field multiplication uses log/antilog tables over the primitive
+polynomial `x^8 + x^4 + x^3 + x^2 + 1` (0x11d) with generator 2.
+"""
+from __future__ import annotations
+
+import functools
+from typing import Sequence
+
+import numpy as np
+
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.reliability.matrices import decoding_matrix
+from proxystore.cdn.reliability.matrices import encoding_matrix
+from proxystore.cdn.reliability.utils import for_each_block
+from proxystore.cdn.reliability.utils import segment_matrix
+
+FIELD_ORDER = 256
+"""Order of the field.
+
+Stored as the `p` attribute of fragments produced by this codec so readers
+can tell them apart from prime field fragments (where `p` is a prime).
+"""
+
+PRIMITIVE_POLYNOMIAL = 0x11D
+
+
+def _build_tables() -> tuple[np.ndarray, np.ndarray]:
+    exp = np.zeros(2 * FIELD_ORDER, dtype=np.uint8)
+    log = np.zeros(FIELD_ORDER, dtype=np.int64)
+    x = 1
+    for i in range(FIELD_ORDER - 1):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & FIELD_ORDER:
+            x ^= PRIMITIVE_POLYNOMIAL
+    # Duplicate the cycle so exp[log[a] + log[b]] never needs a modulo.
+    exp[FIELD_ORDER - 1 : 2 * (FIELD_ORDER - 1)] = exp[: FIELD_ORDER - 1]
+    return exp, log
+
+
+EXP_TABLE, LOG_TABLE = _build_tables()
+"""Antilog and log tables of the field."""
+
+
+def _build_mul_table() -> np.ndarray:
+    a = np.arange(FIELD_ORDER)
+    table = EXP_TABLE[LOG_TABLE[a][:, None] + LOG_TABLE[a][None, :]]
+    table[0, :] = 0
+    table[:, 0] = 0
+    return table
+
+
+MUL_TABLE = _build_mul_table()
+"""`MUL_TABLE[a, b]` is the product of `a` and `b` in the field."""
+
+
+def mul(a: int, b: int) -> int:
+    """Multiply two field elements."""
+    if a == 0 or b == 0:
+        return 0
+    return int(EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]])
+
+
+def inverse(a: int) -> int:
+    """Get the multiplicative inverse of a non-zero field element."""
+    if a == 0:
+        raise ZeroDivisionError('0 has no inverse in GF(2^8).')
+    return int(EXP_TABLE[(FIELD_ORDER - 1) - LOG_TABLE[a]])
+
+
+def power(a: int, e: int) -> int:
+    """Raise a field element to a non-negative integer power."""
+    if e == 0:
+        return 1
+    if a == 0:
+        return 0
+    return int(EXP_TABLE[(LOG_TABLE[a] * e) % (FIELD_ORDER - 1)])
+
+
+def build_building_blocks(m: int, n: int) -> list[list[int]]:
+    """Build the `(n, m)` Vandermonde coding matrix.
+
+    Row `i` is `(1, i, i^2, ..., i^(m-1))` evaluated in the field. The
+    evaluation points are distinct so any `m` rows are invertible.
+
+    Raises:
+        ValueError: If `n` exceeds the number of field elements.
+    """
+    if n > FIELD_ORDER:
+        raise ValueError(
+            f'GF(2^8) supports at most {FIELD_ORDER} fragments. Got {n}.',
+        )
+    return [[power(a, j) for j in range(m)] for a in range(n)]
+
+
+def matrix_inverse(matrix: Sequence[Sequence[int]]) -> list[list[int]]:
+    """Invert a square matrix over the field with Gauss-Jordan elimination.
+
+    Raises:
+        ValueError: If the matrix is singular.
+    """
+    size = len(matrix)
+    rows = [
+        list(row) + [int(i == j) for j in range(size)]
+        for i, row in enumerate(matrix)
+    ]
+    for col in range(size):
+        pivot = next(
+            (r for r in range(col, size) if rows[r][col] != 0),
+            None,
+        )
+        if pivot is None:
+            raise ValueError('Matrix is not invertible over GF(2^8).')
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        scale = inverse(rows[col][col])
+        rows[col] = [mul(scale, x) for x in rows[col]]
+        for r in range(size):
+            factor = rows[r][col]
+            if r != col and factor != 0:
+                rows[r] = [
+                    x ^ mul(factor, y) for x, y in zip(rows[r], rows[col])
+                ]
+    return [row[size:] for row in rows]
+
+
+@functools.lru_cache(maxsize=64)
+def _wide_table(coefficient: int) -> np.ndarray:
+    # Multiplies both bytes of a little-endian uint16 word by coefficient so
+    # one lookup handles two symbols.
+    row = MUL_TABLE[coefficient].astype(np.uint16)
+    words = np.arange(1 << 16, dtype=np.uint32)
+    return row[words & 0xFF] | (row[words >> 8] << 8)
+
+
+def _multiply(
+    matrix: Sequence[Sequence[int]],
+    columns: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    # out[i] = XOR_j matrix[i][j] * columns[j]. Rows are processed as uint16
+    # words so each table lookup multiplies two symbols at once.
+    width = columns.shape[1]
+    if width % 2:
+        columns = np.pad(columns, ((0, 0), (0, 1)))
+    words = columns.view('<u2')
+    acc = np.empty(words.shape[1], dtype='<u2')
+    for i, row in enumerate(matrix):
+        acc.fill(0)
+        for j, coefficient in enumerate(row):
+            if coefficient == 1:
+                acc ^= words[j]
+            elif coefficient != 0:
+                acc ^= _wide_table(coefficient)[words[j]]
+        out[i] = acc.view(np.uint8)[:width]
+
+
+def encode(
+    data: bytes | bytearray | memoryview,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    """Disperse a payload into `n` byte-sized fragments.
+
+    Args:
+        data: Bytes-like payload to disperse.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        workers: Number of threads encoding ranges of stripes in parallel.
+        rows: Indices of the fragments to compute. Defaults to all `n`.
+
+    Returns:
+        Array of dtype uint8 and shape `(len(rows), ceil(len(data) / m))`
+        where row `i` is the content of fragment `rows[i]`.
+
+    Raises:
+        ValueError: If the parameters are invalid.
+    """
+    if n <= 0 or m <= 0:
+        raise ValueError('n and m must be positive.')
+    if m > n:
+        raise ValueError('m must be less than or equal to n.')
+    return encode_segments(segment_matrix(data, m), n, m, workers, rows)
+
+
+def encode_segments(
+    segments: np.ndarray,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    """Disperse a payload arranged into stripes into byte-sized fragments.
+
+    Same as [`encode()`][proxystore.cdn.reliability.gf256.encode] for the
+    `segments` returned by
+    [`segment_matrix()`][proxystore.cdn.reliability.utils.segment_matrix],
+    so a payload encoded one fragment at a time is arranged only once.
+    The parameters are not validated.
+    """
+    matrix = encoding_matrix(DISPERSE_GF256, m, n, FIELD_ORDER)
+    if rows is not None:
+        matrix = [matrix[i] for i in rows]
+
+    stripes = segments.shape[0]
+    fragments = np.empty((len(matrix), stripes), dtype=np.uint8)
+
+    def _encode_block(start: int, end: int) -> None:
+        columns = np.ascontiguousarray(segments[start:end].T)
+        _multiply(matrix, columns, fragments[:, start:end])
+
+    for_each_block(_encode_block, stripes, workers)
+    return fragments
+
+
+def decode(
+    indices: Sequence[int],
+    fragments: Sequence[Sequence[int]] | Sequence[np.ndarray] | np.ndarray,
+    m: int,
+    size: int | None = None,
+    out: bytearray | memoryview | np.ndarray | None = None,
+    workers: int = 1,
+) -> np.ndarray:
+    """Restore a payload from any `m` fragments.
+
+    Args:
+        indices: Zero-based indices of the `m` fragments.
+        fragments: Contents of the `m` fragments in the same order as
+            `indices`.
+        m: Minimum number of fragments required to restore the payload.
+        size: Number of bytes to restore. Defaults to `stripes * m`.
+        out: Optional writable buffer of `size` bytes to write into.
+        workers: Number of threads decoding ranges of stripes in parallel.
+
+    Returns:
+        Array of dtype uint8 viewing the restored payload (backed by `out`
+        if provided).
+
+    Raises:
+        ValueError: If fewer than `m` fragments are given, the fragments
+            have different lengths, or `out` has the wrong size.
+    """
+    if len(indices) < m or len(fragments) < m:
+        raise ValueError(
+            'Number of fragments is below the minimum number of fragments '
+            'required to assemble the file.',
+        )
+    indices = list(indices)[:m]
+    rows = [
+        np.asarray(fragment, dtype=np.uint8)
+        for fragment in list(fragments)[:m]
+    ]
+    stripes = len(rows[0])
+    if any(len(row) != stripes for row in rows):
+        raise ValueError('Fragments must all have the same length.')
+
+    size = stripes * m if size is None else size
+    if size > stripes * m:
+        raise ValueError(
+            f'Cannot restore {size} bytes from {stripes} stripes of '
+            f'{m} bytes.',
+        )
+    if out is None:
+        output = np.empty(size, dtype=np.uint8)
+    else:
+        output = np.frombuffer(out, dtype=np.uint8)
+        if len(output) != size:
+            raise ValueError(
+                f'Output buffer has {len(output)} bytes but expected {size}.',
+            )
+
+    decoding = decoding_matrix(DISPERSE_GF256, FIELD_ORDER, indices)
+
+    full_stripes, tail = divmod(size, m)
+    needed = full_stripes + (tail > 0)
+    full = output[: full_stripes * m].reshape(full_stripes, m)
+
+    def _decode_block(start: int, end: int) -> None:
+        columns = np.stack([row[start:end] for row in rows])
+        segments = np.empty((m, end - start), dtype=np.uint8)
+        _multiply(decoding, columns, segments)
+        full[start : min(end, full_stripes)] = segments.T[
+            : full_stripes - start
+        ]
+        if end > full_stripes:
+            output[full_stripes * m :] = segments[:tail, full_stripes - start]
+
+    for_each_block(_decode_block, needed, workers)
+    return output
@@ -1,67 +1,338 @@
-from proxystore.cdn.reliability.utils import build_building_blocks, inner_product, nextPrime, vandermonde_inverse, matrix_product
-from proxystore.cdn.reliability.fragment_handler import fragment_writer, fragment_reader, fragment_reader_bytes
+"""Information dispersal of payloads into fragments and their restoration."""
+from __future__ import annotations
+
 import pickle
+from typing import Callable
+from typing import Generator
+from typing import Sequence
+
 import numpy as np
 
-class Fragment:
-    def __init__(self, idx, content, p, n, m): 
-        self.idx = idx
-        self.content = content
-        self.p = p
-        self.n = n
-        self.m = m
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.constants import DISPERSE_IDA_SYSTEMATIC
+from proxystore.cdn.reliability import gf256
+from proxystore.cdn.reliability.fragment_handler import ContentError
+from proxystore.cdn.reliability.fragment_handler import Fragment
+from proxystore.cdn.reliability.fragment_handler import fragment_reader
+from proxystore.cdn.reliability.fragment_handler import fragment_reader_bytes
+from proxystore.cdn.reliability.fragment_handler import fragment_writer
+from proxystore.cdn.reliability.fragment_handler import payload_digest
+from proxystore.cdn.reliability.matrices import decoding_matrix
+from proxystore.cdn.reliability.matrices import encoding_matrix
+from proxystore.cdn.reliability.utils import for_each_block
+from proxystore.cdn.reliability.utils import mod_matmul
+from proxystore.cdn.reliability.utils import nextPrime
+from proxystore.cdn.reliability.utils import segment_matrix
+
+
+def field_prime(n: int) -> int:
+    """Get the prime modulus used to disperse data into `n` fragments."""
+    return 257 if n < 257 else nextPrime(n)
+
+
+def _check_parameters(n: int, m: int) -> None:
+    if n < 0 or m < 0:
+        raise ValueError('numFragments ad numToAssemble must be positive.')
+
+    if m > n:
+        raise ValueError('numToAssemble must be less than numFragments')
+
+
+def encode(
+    data: bytes | bytearray | memoryview,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    """Disperse a payload into `n` fragments with one matrix product.
+
+    The payload is viewed as an `(m, stripes)` matrix (one column per
+    stripe) and multiplied by the `(n, m)` matrix from
+    [`build_building_blocks()`][proxystore.cdn.reliability.utils.build_building_blocks]
+    modulo p. The matrix is memoized by
+    [`encoding_matrix()`][proxystore.cdn.reliability.matrices.encoding_matrix].
+    The product is computed in blocks of
+    [`ENCODE_BLOCK_STRIPES`][proxystore.cdn.reliability.utils.ENCODE_BLOCK_STRIPES]
+    columns so temporary memory does not grow with the payload.
+
+    Args:
+        data: Bytes-like payload to disperse.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        workers: Number of threads encoding ranges of stripes in parallel.
+        rows: Indices of the fragments to compute. Defaults to all `n`.
+
+    Returns:
+        Array of shape `(len(rows), stripes)` where row `i` is the content
+        of fragment `rows[i]`. The dtype is uint16 when the symbols fit,
+        else int64.
+    """
+    _check_parameters(n, m)
+    return _encode_segments(segment_matrix(data, m), n, m, workers, rows)
+
+
+def _encode_segments(
+    segments: np.ndarray,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    # Same as encode() for a payload already arranged by segment_matrix().
+    p = field_prime(n)
+    rows = range(n) if rows is None else rows
+    stripes = segments.shape[0]
+    building_blocks = encoding_matrix(DISPERSE_IDA, m, n, p)[list(rows)]
+
+    dtype = np.uint16 if p <= (1 << 16) else np.int64
+    fragments = np.empty((len(rows), stripes), dtype=dtype)
+
+    def _encode_block(start: int, end: int) -> None:
+        fragments[:, start:end] = mod_matmul(
+            building_blocks,
+            segments[start:end].T,
+            p,
+            bound=max(p, 256),
+        )
+
+    for_each_block(_encode_block, stripes, workers)
+    return fragments
+
+
+def _systematic_rows(
+    data: bytes | bytearray | memoryview,
+    m: int,
+) -> np.ndarray:
+    # Row i is the i-th contiguous chunk of the (zero padded) payload.
+    view = np.frombuffer(data, dtype=np.uint8)
+    length = -(-len(view) // m)
+    if length * m != len(view):
+        padded = np.zeros(length * m, dtype=np.uint8)
+        padded[: len(view)] = view
+        view = padded
+    return view.reshape(m, length)
+
+
+def encode_systematic(
+    data: bytes | bytearray | memoryview,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    """Disperse a payload into `m` data and `n - m` parity fragments.
+
+    The payload is split into `m` contiguous chunks of `ceil(len / m)`
+    bytes which are stored as-is in fragments `0` to `m - 1`. The remaining
+    fragments are computed with the parity rows of
+    [`build_systematic_blocks()`][proxystore.cdn.reliability.utils.build_systematic_blocks].
+    Concatenating the data fragments restores the payload.
 
-def split_bytes(data, n, m):
+    Args:
+        data: Bytes-like payload to disperse.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        workers: Number of threads encoding ranges of parity symbols in
+            parallel.
+        rows: Indices of the fragments to compute. Defaults to all `n`.
+            Data fragments are copied from the payload without arithmetic.
+
+    Returns:
+        Array of shape `(len(rows), ceil(len(data) / m))` where row `i` is
+        the content of fragment `rows[i]`. The dtype is uint16 when the
+        symbols fit, else int64.
+    """
+    _check_parameters(n, m)
+    chunks = _systematic_rows(data, m)
+    return _encode_systematic_rows(chunks, n, m, workers, rows)
+
+
+def _encode_systematic_rows(
+    chunks: np.ndarray,
+    n: int,
+    m: int,
+    workers: int = 1,
+    rows: Sequence[int] | None = None,
+) -> np.ndarray:
+    # Same as encode_systematic() for a payload already arranged by
+    # _systematic_rows().
+    p = field_prime(n)
+    rows = list(range(n) if rows is None else rows)
+    length = chunks.shape[1]
+    data_rows = [i for i, row in enumerate(rows) if row < m]
+    parity_rows = [i for i, row in enumerate(rows) if row >= m]
+
+    dtype = np.uint16 if p <= (1 << 16) else np.int64
+    fragments = np.empty((len(rows), length), dtype=dtype)
+    for i in data_rows:
+        fragments[i] = chunks[rows[i]]
+    if parity_rows:
+        parity = encoding_matrix(DISPERSE_IDA_SYSTEMATIC, m, n, p)[
+            [rows[i] for i in parity_rows]
+        ]
+
+        def _encode_block(start: int, end: int) -> None:
+            fragments[parity_rows, start:end] = mod_matmul(
+                parity,
+                chunks[:, start:end],
+                p,
+                bound=max(p, 256),
+            )
+
+        for_each_block(_encode_block, length, workers)
+    return fragments
+
+
+def split_bytes(data, n, m, disperse=DISPERSE_IDA):
     """
     Inputs: 
     data: bytes to split
     n   : number of fragments after splitting the file
     m   : minimum number of fragments required to restore the file
+    disperse: "IDA" for the prime field IDA, "IDA_SYSTEMATIC" for the
+              systematic prime field IDA, or "GF256" for Reed-Solomon
+              coding over GF(2^8) with byte-sized fragments
     Output:
     a list of n fragments (as Fragment objects)
     """
     
     data = pickle.dumps(data)
     
-    if n<0 or m<0: 
-        raise ValueError("numFragments ad numToAssemble must be positive.")
-    
-    if m>n: 
-        raise ValueError("numToAssemble must be less than numFragments")
+    _check_parameters(n, m)
+
+    if disperse == DISPERSE_GF256:
+        encoded = gf256.encode(data, n, m)
+        return [
+            Fragment(i, encoded[i], gf256.FIELD_ORDER, n, m)
+            for i in range(n)
+        ]
+    elif disperse == DISPERSE_IDA_SYSTEMATIC:
+        encoded = encode_systematic(data, n, m)
+        return [
+            Fragment(
+                i,
+                encoded[i].astype(np.int64),
+                field_prime(n),
+                n,
+                m,
+                True,
+            )
+            for i in range(n)
+        ]
+    elif disperse != DISPERSE_IDA:
+        raise ValueError(f'Unknown dispersal mode: {disperse}.')
     
     # find the prime number greater than n
     # all computations are done modulo p
-    p = 257 if n<257 else nextPrime(n)
-    
+    p = field_prime(n)
 
-    original_segments=[list(data[i:i+m]) for i in range(0,len(data),m)]
-    
-    # for the last subfile, if the length is less than m, pad the subfile with zeros 
-    # to achieve final length of m
-    residue = len(data)%m
-    if residue:
-        
-        last_subfile=original_segments[-1]
-        last_subfile.extend([0]*(m-residue))
-    
-    original_segments_array = np.array(original_segments)
-    
-    
-    building_blocks=build_building_blocks(m,n,p)
-    fragments=[]
-    for i in range(n): 
-        fragment_arr = np.array([inner_product(building_blocks[i], original_segments[k],p) for k in range(len(original_segments))] )
-        #print(fragment_arr)
-        #print(sys.getsizeof(fragment_arr))
-        #fragment = []       
-        #for k in range(len(original_segments)): 
-        #    fragment.append(inner_product(building_blocks[i], original_segments[k],p))
-        #print(fragment)
-        #print(sys.getsizeof(fragment))
-        frag = Fragment(i, fragment_arr, p, n, m)
-        fragments.append(frag)
-    
-    return fragments
+    encoded = encode(data, n, m)
+
+    # Fragment contents keep the int64 arrays produced by the original
+    # per-stripe encoder for compatibility with stored fragments.
+    return [
+        Fragment(i, encoded[i].astype(np.int64), p, n, m) for i in range(n)
+    ]
+
+
+def disperse_bytes(
+    data: bytes | bytearray | memoryview,
+    n: int,
+    m: int,
+    disperse: str = DISPERSE_IDA,
+    workers: int = 1,
+) -> list[Fragment]:
+    """Disperse a payload into `n` fragments without pickling it.
+
+    Unlike [`split_bytes()`][proxystore.cdn.reliability.ida.split_bytes],
+    the fragments record the length and digest of the payload so they can
+    be serialized with
+    [`dumps_fragment()`][proxystore.cdn.reliability.fragment_handler.dumps_fragment]
+    and restored exactly with
+    [`restore_bytes()`][proxystore.cdn.reliability.ida.restore_bytes].
+
+    Args:
+        data: Bytes-like payload to disperse.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        disperse: Dispersal mode (`"IDA"`, `"IDA_SYSTEMATIC"` or `"GF256"`).
+        workers: Number of threads encoding ranges of stripes in parallel.
+
+    Returns:
+        List of `n` fragments.
+    """
+    _check_parameters(n, m)
+    systematic = disperse == DISPERSE_IDA_SYSTEMATIC
+    if disperse == DISPERSE_GF256:
+        encoded = gf256.encode(data, n, m, workers)
+        p = gf256.FIELD_ORDER
+    elif systematic:
+        encoded = encode_systematic(data, n, m, workers)
+        p = field_prime(n)
+    elif disperse == DISPERSE_IDA:
+        encoded = encode(data, n, m, workers)
+        p = field_prime(n)
+    else:
+        raise ValueError(f'Unknown dispersal mode: {disperse}.')
+
+    length = len(memoryview(data).cast('B'))
+    digest = payload_digest(data)
+    return [
+        Fragment(i, encoded[i], p, n, m, systematic, length, digest)
+        for i in range(n)
+    ]
+
+
+def iter_fragments(
+    data: bytes | bytearray | memoryview,
+    n: int,
+    m: int,
+    disperse: str = DISPERSE_IDA,
+    workers: int = 1,
+) -> Generator[Fragment, None, None]:
+    """Disperse a payload into `n` fragments one fragment at a time.
+
+    Yields the same fragments as
+    [`disperse_bytes()`][proxystore.cdn.reliability.ida.disperse_bytes]
+    but computes each from its own row of the coding matrix, so a caller
+    can transfer a fragment while the next one is encoded. For the
+    systematic mode, the data fragments are yielded first and need no
+    arithmetic.
+
+    Args:
+        data: Bytes-like payload to disperse.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        disperse: Dispersal mode (`"IDA"`, `"IDA_SYSTEMATIC"` or `"GF256"`).
+        workers: Number of threads encoding ranges of stripes in parallel.
+
+    Yields:
+        Fragments `0` to `n - 1` in order.
+    """
+    _check_parameters(n, m)
+    systematic = disperse == DISPERSE_IDA_SYSTEMATIC
+    # The payload is arranged into a matrix once and each fragment is
+    # computed from its own row of the coding matrix.
+    encoder: Callable[..., np.ndarray]
+    if disperse == DISPERSE_GF256:
+        segments = segment_matrix(data, m)
+        encoder, p = gf256.encode_segments, gf256.FIELD_ORDER
+    elif systematic:
+        segments = _systematic_rows(data, m)
+        encoder, p = _encode_systematic_rows, field_prime(n)
+    elif disperse == DISPERSE_IDA:
+        segments = segment_matrix(data, m)
+        encoder, p = _encode_segments, field_prime(n)
+    else:
+        raise ValueError(f'Unknown dispersal mode: {disperse}.')
+
+    length = len(memoryview(data).cast('B'))
+    digest = payload_digest(data)
+    for i in range(n):
+        content = encoder(segments, n, m, workers, rows=[i])[0]
+        yield Fragment(i, content, p, n, m, systematic, length, digest)
 
 def split(filename, n, m): 
     """
@@ -70,43 +341,459 @@ def split(filename, n, m):
     n   : number of fragments after splitting the file
     m   : minimum number of fragments required to restore the file
     Output:
-    a list of n fragments (as Fragment objects)
+    a list of the names of the n fragment files
     """
-    if n<0 or m<0: 
-        raise ValueError("numFragments ad numToAssemble must be positive.")
-    
-    if m>n: 
-        raise ValueError("numToAssemble must be less than numFragments")
-    
-    # find the prime number greater than n
-    # all computations are done modulo p
-    p = 257 if n<257 else nextPrime(n)
-    
     # convert file to byte strings
     original_file=open(filename, "rb").read()  
     
-    # split original_file into chunks (subfiles) of length m 
-    original_segments=[list(original_file[i:i+m]) for i in range(0,len(original_file),m)]
-    
-    # for the last subfile, if the length is less than m, pad the subfile with zeros 
-    # to achieve final length of m
-    residue = len(original_file)%m
-    if residue:
-        
-        last_subfile=original_segments[-1]
-        last_subfile.extend([0]*(m-residue))
-    
-    
-    building_blocks=build_building_blocks(m,n,p)
-    
-    fragments=[]
-    for i in range(n): 
-        fragment = []
-        for k in range(len(original_segments)): 
-            fragment.append(inner_product(building_blocks[i], original_segments[k],p))
-        fragments.append(fragment)
-    
-    return fragment_writer(filename, n, m, p, original_file, fragments)
+    return fragment_writer(filename, disperse_bytes(original_file, n, m))
+
+
+def decode(
+    indices: Sequence[int],
+    fragments: Sequence[Sequence[int]] | Sequence[np.ndarray] | np.ndarray,
+    m: int,
+    p: int,
+    size: int | None = None,
+    out: bytearray | memoryview | np.ndarray | None = None,
+    workers: int = 1,
+) -> np.ndarray:
+    """Restore a payload from `m` fragments with one matrix product.
+
+    The inverse of the Vandermonde matrix formed by the fragment indices
+    (memoized by
+    [`decoding_matrix()`][proxystore.cdn.reliability.matrices.decoding_matrix])
+    is multiplied with the `(m, stripes)` matrix of fragment contents
+    modulo p. The product is computed in blocks of
+    [`ENCODE_BLOCK_STRIPES`][proxystore.cdn.reliability.utils.ENCODE_BLOCK_STRIPES]
+    stripes and each block is written directly into the output buffer.
+
+    Args:
+        indices: Zero-based indices of the `m` fragments.
+        fragments: Contents of the `m` fragments in the same order as
+            `indices`, each a sequence of `stripes` symbols.
+        m: Minimum number of fragments required to restore the payload.
+        p: Modulus used when the fragments were encoded.
+        size: Number of bytes to restore. Defaults to `stripes * m`, i.e.,
+            the payload including the zero padding of the last stripe.
+        out: Optional writable buffer of `size` bytes (e.g., a `bytearray`
+            or uint8 array) to write the payload into.
+        workers: Number of threads decoding ranges of stripes in parallel.
+
+    Returns:
+        Array of dtype uint8 viewing the restored payload (backed by `out`
+        if provided).
+
+    Raises:
+        ValueError: If fewer than `m` fragments are given, the fragments
+            have different lengths, or `out` has the wrong size.
+    """
+    if len(indices) < m or len(fragments) < m:
+        raise ValueError(
+            'Number of fragments is below the minimum number of fragments '
+            'required to assemble the file.',
+        )
+    indices = list(indices)[:m]
+    rows = [np.asarray(fragment) for fragment in list(fragments)[:m]]
+    stripes = len(rows[0])
+    if any(len(row) != stripes for row in rows):
+        raise ValueError('Fragments must all have the same length.')
+
+    size = stripes * m if size is None else size
+    if size > stripes * m:
+        raise ValueError(
+            f'Cannot restore {size} bytes from {stripes} stripes of '
+            f'{m} bytes.',
+        )
+    if out is None:
+        output = np.empty(size, dtype=np.uint8)
+    else:
+        output = np.frombuffer(out, dtype=np.uint8)
+        if len(output) != size:
+            raise ValueError(
+                f'Output buffer has {len(output)} bytes but expected {size}.',
+            )
+
+    inverse = decoding_matrix(DISPERSE_IDA, p, indices)
+
+    full_stripes, tail = divmod(size, m)
+    needed = full_stripes + (tail > 0)
+    full = output[: full_stripes * m].reshape(full_stripes, m)
+
+    def _decode_block(start: int, end: int) -> None:
+        block = np.stack(
+            [row[start:end] for row in rows],
+            axis=1,
+        )
+        segments = mod_matmul(block, inverse, p)
+        full[start : min(end, full_stripes)] = segments[: full_stripes - start]
+        if end > full_stripes:
+            # Only the leading bytes of the last stripe are payload.
+            last = segments[full_stripes - start]
+            output[full_stripes * m :] = last[:tail]
+
+    for_each_block(_decode_block, needed, workers)
+    return output
+
+
+def decode_systematic(
+    indices: Sequence[int],
+    fragments: Sequence[Sequence[int]] | Sequence[np.ndarray] | np.ndarray,
+    m: int,
+    p: int,
+    size: int | None = None,
+    out: bytearray | memoryview | np.ndarray | None = None,
+    workers: int = 1,
+) -> np.ndarray:
+    """Restore a payload from `m` fragments of a systematic dispersal.
+
+    If `indices` are exactly the data fragments `0` to `m - 1`, the
+    fragments are copied into the output in index order without any
+    arithmetic. Otherwise the inverse of the coding matrix rows of the
+    given fragments is applied block by block (degraded mode).
+
+    Args:
+        indices: Zero-based indices of the `m` fragments.
+        fragments: Contents of the `m` fragments in the same order as
+            `indices`.
+        m: Minimum number of fragments required to restore the payload.
+        p: Modulus used when the fragments were encoded.
+        size: Number of bytes to restore. Defaults to `length * m`.
+        out: Optional writable buffer of `size` bytes to write into.
+        workers: Number of threads decoding ranges of symbols in parallel
+            in degraded mode.
+
+    Returns:
+        Array of dtype uint8 viewing the restored payload (backed by `out`
+        if provided).
+
+    Raises:
+        ValueError: If fewer than `m` fragments are given, the fragments
+            have different lengths, or `out` has the wrong size.
+    """
+    if len(indices) < m or len(fragments) < m:
+        raise ValueError(
+            'Number of fragments is below the minimum number of fragments '
+            'required to assemble the file.',
+        )
+    indices = list(indices)[:m]
+    contents = [np.asarray(fragment) for fragment in list(fragments)[:m]]
+    length = len(contents[0])
+    if any(len(content) != length for content in contents):
+        raise ValueError('Fragments must all have the same length.')
+
+    size = length * m if size is None else size
+    if size > length * m:
+        raise ValueError(
+            f'Cannot restore {size} bytes from {m} fragments of '
+            f'{length} symbols.',
+        )
+    if out is None:
+        output = np.empty(size, dtype=np.uint8)
+    else:
+        output = np.frombuffer(out, dtype=np.uint8)
+        if len(output) != size:
+            raise ValueError(
+                f'Output buffer has {len(output)} bytes but expected {size}.',
+            )
+
+    def _write(row: int, start: int, values: np.ndarray) -> None:
+        begin = row * length + start
+        end = min(begin + len(values), size)
+        if end > begin:
+            output[begin:end] = values[: end - begin]
+
+    if sorted(indices) == list(range(m)):
+        # Fast path: all data fragments are available.
+        for idx, content in zip(indices, contents):
+            _write(idx, 0, content)
+        return output
+
+    inverse = decoding_matrix(DISPERSE_IDA_SYSTEMATIC, p, indices)
+
+    def _decode_block(start: int, end: int) -> None:
+        block = np.stack([content[start:end] for content in contents])
+        rows = mod_matmul(inverse, block, p)
+        for row in range(m):
+            _write(row, start, rows[row])
+
+    for_each_block(_decode_block, length, workers)
+    return output
+
+
+def _check_range(size: int, offset: int, length: int) -> None:
+    if offset < 0 or length < 0 or offset + length > size:
+        raise ValueError(
+            f'Byte range [{offset}, {offset + length}) is outside of the '
+            f'payload of {size} bytes.',
+        )
+
+
+def stripe_range(
+    size: int,
+    m: int,
+    offset: int,
+    length: int,
+    systematic: bool = False,
+) -> tuple[int, int]:
+    """Get the symbols of each fragment covering a byte range.
+
+    With the striped layout of the IDA and GF(2^8) modes, byte `b` of the
+    payload is in stripe `b // m` and each fragment holds one symbol per
+    stripe. With the systematic layout, byte `b` is symbol `b % L` of data
+    fragment `b // L` where `L = ceil(size / m)`, and restoring it from
+    other fragments needs symbol `b % L` of each of them.
+
+    Args:
+        size: Length of the payload in bytes.
+        m: Minimum number of fragments required to restore the payload.
+        offset: First byte of the range.
+        length: Number of bytes in the range.
+        systematic: If the payload was dispersed with the systematic IDA.
+
+    Returns:
+        Tuple `(start, end)` such that symbols `[start, end)` of any `m`
+        fragments restore the range with
+        [`restore_range()`][proxystore.cdn.reliability.ida.restore_range].
+
+    Raises:
+        ValueError: If the range is outside of the payload.
+    """
+    _check_range(size, offset, length)
+    if length == 0:
+        return 0, 0
+    if not systematic:
+        return offset // m, -(-(offset + length) // m)
+    row_length = -(-size // m)
+    first, last = offset // row_length, (offset + length - 1) // row_length
+    if first != last:
+        # The range wraps around the fragment length.
+        return 0, row_length
+    return offset - first * row_length, offset + length - first * row_length
+
+
+def data_fragment_ranges(
+    size: int,
+    m: int,
+    offset: int,
+    length: int,
+) -> list[tuple[int, int, int]]:
+    """Get the data fragment symbols holding a byte range (systematic IDA).
+
+    Args:
+        size: Length of the payload in bytes.
+        m: Minimum number of fragments required to restore the payload.
+        offset: First byte of the range.
+        length: Number of bytes in the range.
+
+    Returns:
+        List of `(index, start, end)` tuples in payload order where symbols
+        `[start, end)` of data fragment `index` are the next bytes of the
+        range.
+
+    Raises:
+        ValueError: If the range is outside of the payload.
+    """
+    _check_range(size, offset, length)
+    row_length = -(-size // m)
+    ranges = []
+    position, end = offset, offset + length
+    while position < end:
+        row = position // row_length
+        stop = min(end, (row + 1) * row_length)
+        ranges.append(
+            (row, position - row * row_length, stop - row * row_length),
+        )
+        position = stop
+    return ranges
+
+
+def restore_range(
+    indices: Sequence[int],
+    fragments: Sequence[Sequence[int]] | Sequence[np.ndarray] | np.ndarray,
+    m: int,
+    p: int,
+    size: int,
+    offset: int,
+    length: int,
+    systematic: bool = False,
+    out: bytearray | memoryview | np.ndarray | None = None,
+) -> np.ndarray:
+    """Restore a byte range of a payload from partial fragments.
+
+    Args:
+        indices: Zero-based indices of the `m` fragments.
+        fragments: Symbols `[start, end)` of each fragment, as given by
+            [`stripe_range()`][proxystore.cdn.reliability.ida.stripe_range],
+            in the same order as `indices`.
+        m: Minimum number of fragments required to restore the payload.
+        p: Field order used when the fragments were encoded (256 for
+            GF(2^8)).
+        size: Length of the payload in bytes.
+        offset: First byte of the range.
+        length: Number of bytes in the range.
+        systematic: If the payload was dispersed with the systematic IDA.
+        out: Optional writable buffer of `length` bytes to write into.
+
+    Returns:
+        Array of dtype uint8 viewing the bytes of the range (backed by
+        `out` if provided).
+
+    Raises:
+        ValueError: If the range is outside of the payload, fewer than `m`
+            fragments are given, or the fragments do not have the symbols
+            of the range.
+    """
+    start, end = stripe_range(size, m, offset, length, systematic)
+    if len(indices) < m or len(fragments) < m:
+        raise ValueError(
+            'Number of fragments is below the minimum number of fragments '
+            'required to assemble the file.',
+        )
+    indices = [int(idx) for idx in list(indices)[:m]]
+    contents = [np.asarray(fragment) for fragment in list(fragments)[:m]]
+    if any(len(content) != end - start for content in contents):
+        raise ValueError(
+            f'Fragments must have the {end - start} symbols of the range.',
+        )
+    output = (
+        np.empty(length, dtype=np.uint8)
+        if out is None
+        else np.frombuffer(out, dtype=np.uint8)
+    )
+    if len(output) != length:
+        raise ValueError(
+            f'Output buffer has {len(output)} bytes but expected {length}.',
+        )
+    if length == 0:
+        return output
+
+    if not systematic:
+        if p == gf256.FIELD_ORDER:
+            stripes = gf256.decode(indices, contents, m)
+        else:
+            stripes = decode(indices, contents, m, p)
+        skip = offset - start * m
+        output[:] = stripes[skip : skip + length]
+        return output
+
+    rows: Sequence[np.ndarray] | np.ndarray
+    if sorted(indices) == list(range(m)):
+        rows = [contents[indices.index(row)] for row in range(m)]
+    else:
+        inverse = decoding_matrix(DISPERSE_IDA_SYSTEMATIC, p, indices)
+        rows = mod_matmul(inverse, np.stack(contents), p)
+    written = 0
+    for row, first, last in data_fragment_ranges(size, m, offset, length):
+        count = last - first
+        output[written : written + count] = rows[row][
+            first - start : last - start
+        ]
+        written += count
+    return output
+
+
+def _strip_padding(data: np.ndarray, m: int) -> int:
+    # The original decoder removed the trailing zeros of the last segment to
+    # drop the zero padding. Keep that behavior for stored fragments.
+    last = len(data) - m
+    nonzero = np.flatnonzero(data[last:])
+    return last + (int(nonzero[-1]) + 1 if len(nonzero) else 0)
+
+
+def _parameters(fragment: Fragment) -> tuple:
+    # Fragments of the same payload agree on all of these.
+    return (
+        fragment.m,
+        fragment.n,
+        fragment.p,
+        fragment.systematic,
+        fragment.length,
+        fragment.digest,
+    )
+
+
+def restore_bytes(fragments, out=None, verify=True, workers=1):
+    """Restore a payload from fragments created by `disperse_bytes()`.
+
+    The first `m` fragments with distinct indices are used. For systematic
+    dispersal the data fragments are preferred so healthy reads do not
+    decode. The exact payload length is taken from the fragments, so
+    payloads ending in zero bytes are restored correctly.
+
+    Args:
+        fragments: At least `m` fragments of the same payload.
+        out: Optional writable buffer of the payload length to restore into.
+        verify: Check the digest of the restored payload.
+        workers: Number of threads decoding ranges of stripes in parallel.
+
+    Returns:
+        Array of dtype uint8 viewing the restored payload (backed by `out`
+        if provided).
+
+    Raises:
+        ValueError: If there are not enough distinct fragments or the
+            fragments come from different payloads.
+        ContentError: If `verify` is set and the restored payload does not
+            match the digest recorded in the fragments.
+    """
+    if len(fragments) == 0:
+        raise ValueError('No fragments to restore.')
+    first = fragments[0]
+    if first.systematic:
+        fragments = sorted(fragments, key=lambda fragment: fragment.idx)
+
+    selected = {}
+    for fragment in fragments:
+        if _parameters(fragment) != _parameters(first):
+            raise ValueError(
+                'These fragments are not derived from the same file.',
+            )
+        selected.setdefault(fragment.idx, fragment.content)
+        if len(selected) == first.m:
+            break
+    if len(selected) < first.m:
+        raise ValueError(
+            'The total number of different fragments are insufficient to '
+            'assemble the file.',
+        )
+
+    indices = list(selected)
+    contents = list(selected.values())
+    if first.p == gf256.FIELD_ORDER:
+        data = gf256.decode(
+            indices,
+            contents,
+            first.m,
+            first.length,
+            out,
+            workers,
+        )
+    elif first.systematic:
+        data = decode_systematic(
+            indices,
+            contents,
+            first.m,
+            first.p,
+            first.length,
+            out,
+            workers,
+        )
+    else:
+        data = decode(
+            indices,
+            contents,
+            first.m,
+            first.p,
+            first.length,
+            out,
+            workers,
+        )
+
+    if verify and payload_digest(data) != first.digest:
+        raise ContentError('The restored content does not match its digest.')
+    return data
+
 
 def assemble_bytes(fragments, output_filename=None):
     '''
@@ -117,39 +804,33 @@ def assemble_bytes(fragments, output_filename=None):
     String represents the content of the original file
     If filename is given, the content is written to the file
     '''
-    
+
+    systematic = getattr(fragments[0], 'systematic', False)
+    if systematic:
+        # Prefer the data fragments so healthy reads skip decoding.
+        fragments = sorted(fragments, key=lambda fragment: fragment.idx)
     (m, n, p, fragments) = fragment_reader_bytes(fragments)
     building_basis=[]
     fragments_matrix=[]
     for (idx,fragment) in fragments:
-        building_basis.append(idx)
+        building_basis.append(idx - 1)
         fragments_matrix.append(fragment)
     
-    inverse_building_matrix =  vandermonde_inverse(building_basis,p)
-    
-    output_matrix = matrix_product(inverse_building_matrix, fragments_matrix,p)
-    
-    # each column of output matrix is a chunk of the original matrix
-    original_segments=[]
-    ncol = len(output_matrix[0])
-    nrow = len(output_matrix)
-    for c in range(ncol): 
-        col = [output_matrix[r][c] for r in range(nrow)]
-        original_segments.append(col)
-    
-    # remove tailing zeros of the last segment
-    last_segment=original_segments[-1]
-    while last_segment[-1]==0: 
-        last_segment.pop()
-    
-    # combine the original_segment into original_file
-    original_file=[]
-    for segment in original_segments: 
-        original_file.extend(segment)
+    if p == gf256.FIELD_ORDER:
+        original_file = gf256.decode(building_basis, fragments_matrix, m)
+    elif systematic:
+        original_file = decode_systematic(
+            building_basis,
+            fragments_matrix,
+            m,
+            p,
+        )
+    else:
+        original_file = decode(building_basis, fragments_matrix, m, p)
+    length = _strip_padding(original_file, m)
 
     # convert original_file to its content
-    original_file_content = bytes(original_file)
-    data = pickle.loads(original_file_content)
+    data = pickle.loads(memoryview(original_file)[:length])
     
     return data
     
@@ -163,43 +844,15 @@ def assemble(fragments_filenames, output_filename=None):
     If filename is given, the content is written to the file
     '''
     
-    (m, n, p, fragments) = fragment_reader(fragments_filenames)
-    building_basis=[]
-    fragments_matrix=[]
-    for (idx,fragment) in fragments:
-        building_basis.append(idx)
-        fragments_matrix.append(fragment)
-    
-    inverse_building_matrix =  vandermonde_inverse(building_basis,p)
-    
-    output_matrix = matrix_product(inverse_building_matrix, fragments_matrix,p)
-    
-    # each column of output matrix is a chunk of the original matrix
-    original_segments=[]
-    ncol = len(output_matrix[0])
-    nrow = len(output_matrix)
-    for c in range(ncol): 
-        col = [output_matrix[r][c] for r in range(nrow)]
-        original_segments.append(col)
-    
-    # remove tailing zeros of the last segment
-    last_segment=original_segments[-1]
-    while last_segment[-1]==0: 
-        last_segment.pop()
-    
-    # combine the original_segment into original_file
-    original_file=[]
-    for segment in original_segments: 
-        original_file.extend(segment)
+    original_file = restore_bytes(fragment_reader(fragments_filenames))
 
     # convert original_file to its content
-    original_file_content = "".join(list(map(chr, original_file)))
-    
-    if output_filename:# write the output to file
-        with open(output_filename,'wb') as fh:
-            fh.write(bytes(original_file))
+    original_file_content = ''.join(list(map(chr, original_file.tolist())))
+
+    if output_filename:  # write the output to file
+        with open(output_filename, 'wb') as fh:
+            fh.write(original_file)
     
-        print("Generated file {}".format(output_filename))
         return 
     else: 
         return original_file_content
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Memoized coding and decoding matrices.
+
+Building the `(n, m)` coding matrix, and inverting the coding rows of the
+surviving fragments, costs `O(m^2)` to `O(m^3)` Python-level operations per
+object. Deployments reuse a handful of `(n, m)` configurations and
+surviving fragment index sets, so the matrices are kept in bounded LRU
+caches shared by all codecs.
+
+Encoding matrices are keyed by `(mode, m, n)` and decoding matrices by
+`(mode, field order, surviving indices)`, where `mode` is the dispersal
+mode (e.g., `"IDA"`). Matrices returned by this module are shared and
+must not be modified.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Sequence
+
+import numpy as np
+
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.constants import DISPERSE_IDA_SYSTEMATIC
+from proxystore.cdn.reliability.utils import build_building_blocks
+from proxystore.cdn.reliability.utils import build_systematic_blocks
+from proxystore.cdn.reliability.utils import matrix_inverse
+from proxystore.cdn.reliability.utils import vandermonde_inverse
+from proxystore.store.cache import LRUCache
+
+ENCODING_CACHE_SIZE = 32
+"""Maximum number of cached encoding matrices."""
+
+DECODING_CACHE_SIZE = 256
+"""Maximum number of cached decoding matrices."""
+
+_encoding_cache: LRUCache[Hashable, Any] = LRUCache(ENCODING_CACHE_SIZE)
+_decoding_cache: LRUCache[Hashable, Any] = LRUCache(DECODING_CACHE_SIZE)
+_lock = threading.Lock()
+
+
+def _cached(
+    cache: LRUCache[Hashable, Any],
+    key: Hashable,
+    build: Callable[[], Any],
+) -> Any:
+    with _lock:
+        if cache.exists(key):
+            return cache.get(key)
+        # Count the miss here; building happens outside of the lock.
+        cache.misses += 1
+    value = build()
+    with _lock:
+        if not cache.exists(key):
+            cache.set(key, value)
+    return value
+
+
+def _readonly(matrix: Sequence[Sequence[int]]) -> np.ndarray:
+    array = np.array(matrix, dtype=np.int64)
+    array.setflags(write=False)
+    return array
+
+
+def _frozen(matrix: Sequence[Sequence[int]]) -> tuple[tuple[int, ...], ...]:
+    return tuple(tuple(row) for row in matrix)
+
+
+def encoding_matrix(mode: str, m: int, n: int, p: int) -> Any:
+    """Get the `(n, m)` coding matrix of a dispersal mode.
+
+    Args:
+        mode: Dispersal mode.
+        m: Minimum number of fragments required to restore a payload.
+        n: Number of fragments.
+        p: Field order.
+
+    Returns:
+        A read-only int64 array for the prime field modes or a tuple of
+        rows for GF(2^8).
+    """
+    if mode not in (DISPERSE_IDA, DISPERSE_IDA_SYSTEMATIC, DISPERSE_GF256):
+        raise ValueError(f'Unknown dispersal mode: {mode}.')
+    return _cached(
+        _encoding_cache,
+        (mode, m, n, p),
+        lambda: _build_encoding(mode, m, n, p),
+    )
+
+
+def _build_encoding(mode: str, m: int, n: int, p: int) -> Any:
+    if mode == DISPERSE_GF256:
+        # Imported here because gf256 looks up its matrices in this module.
+        from proxystore.cdn.reliability import gf256
+
+        return _frozen(gf256.build_building_blocks(m, n))
+    elif mode == DISPERSE_IDA_SYSTEMATIC:
+        return _readonly(build_systematic_blocks(m, n, p))
+    return _readonly(build_building_blocks(m, n, p))
+
+
+def decoding_matrix(mode: str, p: int, indices: Sequence[int]) -> Any:
+    """Get the matrix restoring data from the fragments at `indices`.
+
+    Args:
+        mode: Dispersal mode.
+        p: Field order.
+        indices: Zero-based indices of the `m` surviving fragments.
+
+    Returns:
+        For `"IDA"`, the transposed inverse Vandermonde matrix (as used by
+        [`decode()`][proxystore.cdn.reliability.ida.decode]); for
+        `"IDA_SYSTEMATIC"`, the inverse of the coding rows, both as
+        read-only int64 arrays; for `"GF256"`, the inverse of the coding
+        rows as a tuple of rows.
+    """
+    indices = tuple(int(i) for i in indices)
+    m = len(indices)
+
+    if mode not in (DISPERSE_IDA, DISPERSE_IDA_SYSTEMATIC, DISPERSE_GF256):
+        raise ValueError(f'Unknown dispersal mode: {mode}.')
+
+    def build() -> Any:
+        if mode == DISPERSE_IDA:
+            inverse = vandermonde_inverse([i + 1 for i in indices], p)
+            return _readonly(inverse).T
+        # Rows of the coding matrix do not depend on n so only build the
+        # rows up to the largest index.
+        coding = _build_encoding(mode, m, max(max(indices) + 1, m), p)
+        rows = [[int(x) for x in coding[i]] for i in indices]
+        if mode == DISPERSE_GF256:
+            from proxystore.cdn.reliability import gf256
+
+            return _frozen(gf256.matrix_inverse(rows))
+        return _readonly(matrix_inverse(rows, p))
+
+    return _cached(_decoding_cache, (mode, p, indices), build)
+
+
+def cache_info() -> dict[str, dict[str, int]]:
+    """Get hit/miss counters and sizes of the matrix caches."""
+    with _lock:
+        return {
+            name: {
+                'hits': cache.hits,
+                'misses': cache.misses,
+                'size': len(cache.data),
+                'maxsize': cache.maxsize,
+            }
+            for name, cache in (
+                ('encoding', _encoding_cache),
+                ('decoding', _decoding_cache),
+            )
+        }
+
+
+def clear_cache() -> None:
+    """Remove all cached matrices and reset the counters."""
+    with _lock:
+        for cache in (_encoding_cache, _decoding_cache):
+            cache.data.clear()
+            cache.lru.clear()
+            cache.hits = 0
+            cache.misses = 0
@@ -0,0 +1,201 @@
+"""Rebuild single fragments without restoring the object.
+
+A fragment `t` of a dispersed object is row `t` of the coding matrix `G`
+times the data. Given any `m` surviving fragments `F` at indices `S`, the
+data is `D_S · F` where `D_S` is the decoding matrix of `S`, so
+
+```
+fragment_t = G[t] · D_S · F
+```
+
+The `m` coefficients `G[t] · D_S` are computed once (the matrices are
+memoized by [`matrices`][proxystore.cdn.reliability.matrices]) and one
+linear combination of the surviving fragments rebuilds fragment `t`. This
+reads `m` fragments and produces exactly one, instead of restoring the
+whole object and encoding all `n` fragments again.
+
+Example:
+    ```python
+    from proxystore.cdn.reliability.ida import disperse_bytes
+    from proxystore.cdn.reliability.repair import repair_fragment
+
+    fragments = disperse_bytes(data, 5, 3)
+    lost = fragments.pop(1)
+    rebuilt = repair_fragment(fragments[:3], 1)
+    ```
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.constants import DISPERSE_IDA_SYSTEMATIC
+from proxystore.cdn.reliability import gf256
+from proxystore.cdn.reliability.fragment_handler import Fragment
+from proxystore.cdn.reliability.matrices import decoding_matrix
+from proxystore.cdn.reliability.matrices import encoding_matrix
+from proxystore.cdn.reliability.utils import for_each_block
+from proxystore.cdn.reliability.utils import mod_matmul
+
+
+def fragment_mode(fragment: Fragment) -> str:
+    """Get the dispersal mode that produced a fragment."""
+    if fragment.p == gf256.FIELD_ORDER:
+        return DISPERSE_GF256
+    elif fragment.systematic:
+        return DISPERSE_IDA_SYSTEMATIC
+    return DISPERSE_IDA
+
+
+def repair_coefficients(
+    mode: str,
+    p: int,
+    indices: Sequence[int],
+    target: int,
+) -> list[int]:
+    """Get the coefficients rebuilding fragment `target` from `indices`.
+
+    Args:
+        mode: Dispersal mode of the fragments.
+        p: Field order.
+        indices: Zero-based indices of the `m` surviving fragments.
+        target: Zero-based index of the fragment to rebuild.
+
+    Returns:
+        List of `m` field elements where fragment `target` is the sum of
+        the surviving fragments weighted by the coefficients.
+    """
+    indices = [int(i) for i in indices]
+    m = len(indices)
+    row = encoding_matrix(mode, m, max(*indices, target) + 1, p)[target]
+    decoding = decoding_matrix(mode, p, indices)
+    if mode == DISPERSE_GF256:
+        coefficients = []
+        for j in range(m):
+            value = 0
+            for k in range(m):
+                value ^= gf256.mul(row[k], decoding[k][j])
+            coefficients.append(value)
+        return coefficients
+    elif mode == DISPERSE_IDA:
+        # The IDA decoding matrix is stored transposed for decode().
+        decoding = decoding.T
+    row = [int(x) for x in row]
+    return [
+        sum(row[k] * int(decoding[k][j]) for k in range(m)) % p
+        for j in range(m)
+    ]
+
+
+def repair_fragment(
+    fragments: Sequence[Fragment],
+    index: int,
+    workers: int = 1,
+) -> Fragment:
+    """Rebuild one fragment from any `m` fragments of the same object.
+
+    Args:
+        fragments: At least `m` fragments with distinct indices produced by
+            [`disperse_bytes()`][proxystore.cdn.reliability.ida.disperse_bytes].
+            Only the first `m` distinct fragments are read.
+        index: Zero-based index of the fragment to rebuild.
+        workers: Number of threads combining ranges of symbols in parallel.
+
+    Returns:
+        The fragment at `index`, identical to the one produced when the
+        object was dispersed.
+
+    Raises:
+        ValueError: If `index` is out of range, there are fewer than `m`
+            distinct fragments, or the fragments come from different
+            objects.
+    """
+    if len(fragments) == 0:
+        raise ValueError('No fragments to repair from.')
+    first = fragments[0]
+    if not 0 <= index < first.n:
+        raise ValueError(
+            f'Fragment index {index} is out of range for {first.n} fragments.',
+        )
+
+    selected: dict[int, np.ndarray] = {}
+    for fragment in fragments:
+        if (
+            fragment.m,
+            fragment.n,
+            fragment.p,
+            fragment.systematic,
+            fragment.length,
+            fragment.digest,
+        ) != (
+            first.m,
+            first.n,
+            first.p,
+            first.systematic,
+            first.length,
+            first.digest,
+        ):
+            raise ValueError(
+                'These fragments are not derived from the same file.',
+            )
+        selected.setdefault(fragment.idx, np.asarray(fragment.content))
+        if len(selected) == first.m:
+            break
+    if len(selected) < first.m:
+        raise ValueError(
+            'The total number of different fragments are insufficient to '
+            'repair the fragment.',
+        )
+
+    def _rebuilt(content: np.ndarray) -> Fragment:
+        return Fragment(
+            index,
+            content,
+            first.p,
+            first.n,
+            first.m,
+            first.systematic,
+            first.length,
+            first.digest,
+        )
+
+    if index in selected:
+        return _rebuilt(selected[index].copy())
+
+    mode = fragment_mode(first)
+    indices = list(selected)
+    rows = list(selected.values())
+    length = len(rows[0])
+    if any(len(row) != length for row in rows):
+        raise ValueError('Fragments must all have the same length.')
+    coefficients = repair_coefficients(mode, first.p, indices, index)
+
+    if mode == DISPERSE_GF256:
+        content = np.empty(length, dtype=np.uint8)
+        columns = np.stack([row.astype(np.uint8, copy=False) for row in rows])
+
+        def _combine(start: int, end: int) -> None:
+            gf256._multiply(
+                [coefficients],
+                np.ascontiguousarray(columns[:, start:end]),
+                content[None, start:end],
+            )
+
+    else:
+        content = np.empty(length, dtype=rows[0].dtype)
+        weights = np.array([coefficients], dtype=np.int64)
+
+        def _combine(start: int, end: int) -> None:
+            block = np.stack([row[start:end] for row in rows])
+            content[start:end] = mod_matmul(
+                weights,
+                block,
+                first.p,
+                bound=max(first.p, 256),
+            )[0]
+
+    for_each_block(_combine, length, workers)
+    return _rebuilt(content)
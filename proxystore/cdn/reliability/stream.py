@@ -0,0 +1,245 @@
+"""Streaming dispersal of large objects.
+
+[`split_bytes()`][proxystore.cdn.reliability.ida.split_bytes] and
+[`assemble_bytes()`][proxystore.cdn.reliability.ida.assemble_bytes] hold
+the whole object, and all of its fragments, in memory. The functions here
+instead process the object one block of stripes at a time so peak memory
+is bounded by the block size rather than by the size of the object.
+
+Each input block of `block_size` bytes (rounded down to a multiple of `m`)
+is encoded into `n` fragment blocks of `block_size / m` symbols. Symbols
+are stored as little-endian uint16 for the prime field IDA and as bytes
+for GF(2^8), so fragment blocks have a fixed size in bytes and a fragment
+stream is the concatenation of its blocks.
+
+Example:
+    ```python
+    from proxystore.cdn.reliability.stream import decode_stream
+    from proxystore.cdn.reliability.stream import encode_stream
+
+    outputs = [open(f'fragment{i}', 'wb') for i in range(5)]
+    for blocks in encode_stream('large.bin', 5, 3, 'GF256'):
+        for output, block in zip(outputs, blocks):
+            output.write(block)
+    ...
+    streams = [open(f'fragment{i}', 'rb') for i in (0, 2, 4)]
+    with open('restored.bin', 'wb') as f:
+        for block in decode_stream([0, 2, 4], streams, 5, 3, 'GF256', size):
+            f.write(block)
+    ```
+"""
+from __future__ import annotations
+
+import os
+from typing import BinaryIO
+from typing import Generator
+from typing import Iterable
+from typing import Sequence
+from typing import Union
+
+import numpy as np
+
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.reliability import gf256
+from proxystore.cdn.reliability import ida
+
+DEFAULT_STREAM_BLOCK_SIZE = 4 * 1024 * 1024
+"""Default number of payload bytes encoded per block."""
+
+Source = Union[str, 'os.PathLike[str]', BinaryIO, Iterable[bytes]]
+"""Streaming input: a file path, binary file object or iterable of buffers."""
+
+
+def symbol_dtype(n: int, disperse: str) -> np.dtype:
+    """Get the dtype used to serialize fragment symbols in a stream.
+
+    Raises:
+        ValueError: If the dispersal mode is unknown or the prime field
+            symbols do not fit in 16 bits.
+    """
+    if disperse == DISPERSE_GF256:
+        return np.dtype(np.uint8)
+    elif disperse == DISPERSE_IDA:
+        if ida.field_prime(n) > (1 << 16):
+            raise ValueError(
+                f'Streaming IDA supports symbols of at most 16 bits. '
+                f'Got n={n}.',
+            )
+        return np.dtype('<u2')
+    raise ValueError(f'Unknown dispersal mode: {disperse}.')
+
+
+def _block_bytes(m: int, block_size: int) -> int:
+    return max(m, block_size - block_size % m)
+
+
+def _read_blocks(
+    source: Source,
+    block_size: int,
+) -> Generator[memoryview, None, None]:
+    # Yields consecutive blocks of exactly block_size bytes (except the last).
+    # Blocks are only valid until the next block is requested.
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from _read_blocks(f, block_size)
+        return
+
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    if hasattr(source, 'readinto'):
+        while True:
+            filled = 0
+            while filled < block_size:
+                count = source.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            if filled:
+                yield view[:filled]
+            if filled < block_size:
+                return
+    elif hasattr(source, 'read'):
+        while True:
+            filled = 0
+            while filled < block_size:
+                chunk = source.read(block_size - filled)
+                if not chunk:
+                    break
+                view[filled : filled + len(chunk)] = chunk
+                filled += len(chunk)
+            if filled:
+                yield view[:filled]
+            if filled < block_size:
+                return
+    else:
+        yield from _rechunk(source, block_size, view)
+
+
+def _rechunk(
+    chunks: Iterable[bytes],
+    block_size: int,
+    view: memoryview | None = None,
+) -> Generator[memoryview, None, None]:
+    # Regroups arbitrarily sized buffers into blocks of block_size bytes.
+    view = memoryview(bytearray(block_size)) if view is None else view
+    filled = 0
+    for chunk in chunks:
+        remaining = memoryview(chunk).cast('B')
+        while len(remaining) > 0:
+            take = min(block_size - filled, len(remaining))
+            view[filled : filled + take] = remaining[:take]
+            filled += take
+            remaining = remaining[take:]
+            if filled == block_size:
+                yield view
+                filled = 0
+    if filled:
+        yield view[:filled]
+
+
+def encode_stream(
+    source: Source,
+    n: int,
+    m: int,
+    disperse: str = DISPERSE_IDA,
+    block_size: int = DEFAULT_STREAM_BLOCK_SIZE,
+    workers: int = 1,
+) -> Generator[list[memoryview], None, None]:
+    """Disperse a stream into `n` fragment streams block by block.
+
+    Args:
+        source: Path of a file, binary file object, or iterable of buffers
+            to disperse. The input is not pickled.
+        n: Number of fragments to produce.
+        m: Minimum number of fragments required to restore the payload.
+        disperse: Dispersal mode (`"IDA"` or `"GF256"`).
+        block_size: Payload bytes encoded per block. Rounded down to a
+            multiple of `m`.
+        workers: Number of threads encoding each block in parallel.
+
+    Yields:
+        For each block of the input, a list of `n` buffers where buffer `i`
+        is the next block of fragment `i`. Every block but the last has
+        `block_size / m` symbols.
+    """
+    dtype = symbol_dtype(n, disperse)
+    for block in _read_blocks(source, _block_bytes(m, block_size)):
+        if disperse == DISPERSE_GF256:
+            encoded = gf256.encode(block, n, m, workers)
+        else:
+            encoded = ida.encode(block, n, m, workers).astype(
+                dtype,
+                copy=False,
+            )
+        yield [encoded[i].data.cast('B') for i in range(n)]
+
+
+def decode_stream(
+    indices: Sequence[int],
+    fragments: Sequence[Source],
+    n: int,
+    m: int,
+    disperse: str = DISPERSE_IDA,
+    size: int | None = None,
+    block_size: int = DEFAULT_STREAM_BLOCK_SIZE,
+    workers: int = 1,
+) -> Generator[memoryview, None, None]:
+    """Restore a payload from `m` fragment streams block by block.
+
+    Args:
+        indices: Zero-based indices of the fragments.
+        fragments: Fragment streams in the same order as `indices`. Each
+            can be a path, binary file object, or iterable of buffers of
+            any size (e.g., chunks of an HTTP response).
+        n: Number of fragments the payload was dispersed into.
+        m: Minimum number of fragments required to restore the payload.
+        disperse: Dispersal mode used to encode the fragments.
+        size: Size of the original payload. If `None`, the zero padding of
+            the last stripe is not removed.
+        block_size: Block size used by
+            [`encode_stream()`][proxystore.cdn.reliability.stream.encode_stream].
+            Any multiple of `m` works but matching it avoids extra copies.
+        workers: Number of threads decoding each block in parallel.
+
+    Yields:
+        Consecutive blocks of the restored payload.
+
+    Raises:
+        ValueError: If fewer than `m` fragment streams are given or the
+            streams end at different positions.
+    """
+    if len(indices) < m or len(fragments) < m:
+        raise ValueError(
+            'Number of fragments is below the minimum number of fragments '
+            'required to assemble the file.',
+        )
+    dtype = symbol_dtype(n, disperse)
+    symbols = _block_bytes(m, block_size) // m
+    readers = [
+        _read_blocks(fragment, symbols * dtype.itemsize)
+        for fragment in list(fragments)[:m]
+    ]
+    indices = list(indices)[:m]
+    p = gf256.FIELD_ORDER if disperse == DISPERSE_GF256 else ida.field_prime(n)
+
+    remaining = size
+    while remaining is None or remaining > 0:
+        blocks = [next(reader, None) for reader in readers]
+        present = [block for block in blocks if block is not None]
+        if not present:
+            break
+        if len(present) < len(blocks) or any(
+            len(block) != len(present[0]) for block in present
+        ):
+            raise ValueError('Fragment streams have different lengths.')
+        rows = [np.frombuffer(block, dtype=dtype) for block in present]
+        length = len(rows[0]) * m
+        if remaining is not None:
+            length = min(length, remaining)
+            remaining -= length
+        if p == gf256.FIELD_ORDER:
+            decoded = gf256.decode(indices, rows, m, length, workers=workers)
+        else:
+            decoded = ida.decode(indices, rows, m, p, length, workers=workers)
+        yield decoded.data.cast('B')
@@ -1,6 +1,19 @@
+"""Modular arithmetic and block helpers used by the dispersal codecs."""
+from __future__ import annotations
+
 import math
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy
 
+ENCODE_BLOCK_STRIPES = 1 << 14
+"""Number of stripes processed per block by the vectorized codecs.
+
+Bounds the size of the temporary arrays used while encoding or decoding
+independently of the size of the payload.
+"""
+
+
 def isPrime(p): 
     """
     Inputs:
@@ -44,7 +57,6 @@ def inner_product(a, b, p):
     Output: 
     The inner product of a and b, where computations are done modulo p  
     """
-    #print(sum((i*j) for i,j in zip(a,b)), p, sum((i*j) for i,j in zip(a,b))%p)
     return sum((i*j) for i,j in zip(a,b))%p
     
 def matrix_product(A,B, p): 
@@ -193,3 +205,193 @@ def vandermonde_inverse(vandermonde_basis,p):
         result.append(row)
     return transpose(result)
     
+
+# Largest integer magnitude for which every intermediate value of a float
+# matrix product, and the float division used to reduce it, stays exact.
+_FLOAT32_EXACT_BOUND = 2**22
+_FLOAT64_EXACT_BOUND = 2**51
+_INT64_BOUND = 2**63 - 1
+
+
+def mod_matmul(
+    a: numpy.ndarray,
+    b: numpy.ndarray,
+    p: int,
+    bound: int | None = None,
+) -> numpy.ndarray:
+    """Multiply two non-negative integer matrices modulo p.
+
+    The product is computed with a floating point BLAS kernel whenever the
+    largest possible dot product fits in the exact integer range of the
+    float type, and with an int64 kernel otherwise. In the int64 case the
+    inner dimension is split into slices small enough that no partial sum
+    can overflow, and the accumulator is reduced modulo p after each slice.
+
+    Args:
+        a: Array of shape (r, k) with entries in [0, p).
+        b: Array of shape (k, c) with entries in [0, p).
+        p: Modulus.
+        bound: Upper bound (exclusive) on the entries of `a` and `b`.
+            Defaults to `p`.
+
+    Returns:
+        Array of shape (r, c) with the entries of `a @ b` reduced modulo p.
+        The dtype is float32, float64 or int64 depending on which kernel
+        was used; every entry is an exact integer in [0, p).
+    """
+    bound = p if bound is None else bound
+    k = a.shape[1]
+    largest = k * (bound - 1) ** 2
+
+    if largest < _FLOAT64_EXACT_BOUND:
+        dtype = (
+            numpy.float32 if largest < _FLOAT32_EXACT_BOUND else numpy.float64
+        )
+        product = numpy.matmul(
+            a.astype(dtype, copy=False),
+            b.astype(dtype, copy=False),
+        )
+        # Floor division is exact because adding one half keeps the quotient
+        # at least 0.5/p away from an integer, which exceeds the rounding
+        # error of the multiplication by 1/p for values below the bound.
+        quotient = product + dtype(0.5)
+        quotient *= dtype(1 / p)
+        numpy.floor(quotient, out=quotient)
+        quotient *= dtype(p)
+        product -= quotient
+        return product
+
+    a = a.astype(numpy.int64, copy=False)
+    b = b.astype(numpy.int64, copy=False)
+    step = max(1, (_INT64_BOUND - (p - 1)) // ((bound - 1) ** 2))
+    result = numpy.zeros((a.shape[0], b.shape[1]), dtype=numpy.int64)
+    for start in range(0, k, step):
+        result += numpy.matmul(
+            a[:, start : start + step],
+            b[start : start + step],
+        )
+        result %= p
+    return result
+
+
+def segment_matrix(
+    data: bytes | bytearray | memoryview,
+    m: int,
+) -> numpy.ndarray:
+    """Arrange a payload into stripes of `m` bytes.
+
+    Row `k` of the result is the `k`-th segment `data[k*m:(k+1)*m]`. The
+    last segment is padded with zeros to a length of `m`.
+
+    Args:
+        data: Bytes-like payload.
+        m: Number of bytes per stripe.
+
+    Returns:
+        Array of dtype uint8 and shape `(ceil(len(data) / m), m)`.
+    """
+    view = numpy.frombuffer(data, dtype=numpy.uint8)
+    stripes = -(-len(view) // m)
+    if stripes * m != len(view):
+        padded = numpy.zeros(stripes * m, dtype=numpy.uint8)
+        padded[: len(view)] = view
+        view = padded
+    return view.reshape(stripes, m)
+
+
+def for_each_block(func, total: int, workers: int = 1) -> None:
+    """Call `func(start, end)` on consecutive blocks of stripes.
+
+    The range `[0, total)` is cut into blocks of at most
+    [`ENCODE_BLOCK_STRIPES`][proxystore.cdn.reliability.utils.ENCODE_BLOCK_STRIPES]
+    stripes. With more than one worker, the blocks are divided into up to
+    `workers` contiguous ranges that are processed on a thread pool. The
+    codecs spend their time in NumPy kernels that release the GIL, and
+    each block reads and writes disjoint slices of shared arrays, so no
+    data is copied or pickled between workers.
+
+    Args:
+        func: Callable taking the `start` and `end` stripe of a block.
+        total: Number of stripes.
+        workers: Maximum number of threads. `1` runs in the caller.
+
+    Raises:
+        ValueError: If `workers` is less than one.
+    """
+    if workers < 1:
+        raise ValueError(f'workers must be at least 1. Got {workers}.')
+    starts = list(range(0, total, ENCODE_BLOCK_STRIPES))
+
+    def _run(first: int, last: int) -> None:
+        for start in starts[first:last]:
+            func(start, min(start + ENCODE_BLOCK_STRIPES, total))
+
+    workers = min(workers, len(starts))
+    if workers <= 1:
+        _run(0, len(starts))
+        return
+
+    per_worker = -(-len(starts) // workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run, first, first + per_worker)
+            for first in range(0, len(starts), per_worker)
+        ]
+        for future in futures:
+            future.result()
+
+
+def matrix_inverse(a, p):
+    """Invert a square matrix modulo a prime with Gauss-Jordan elimination.
+
+    Args:
+        a: Square matrix as a list of rows.
+        p: Prime modulus.
+
+    Returns:
+        The inverse of `a` modulo p as a list of rows.
+
+    Raises:
+        ValueError: If `a` is singular modulo p.
+    """
+    size = len(a)
+    rows = [
+        [x % p for x in row] + [int(i == j) for j in range(size)]
+        for i, row in enumerate(a)
+    ]
+    for col in range(size):
+        pivot = next((r for r in range(col, size) if rows[r][col]), None)
+        if pivot is None:
+            raise ValueError(f'Matrix is not invertible mod {p}')
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        scale = modulo_inverse(rows[col][col], p)
+        rows[col] = [(x * scale) % p for x in rows[col]]
+        for r in range(size):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [
+                    (x - factor * y) % p for x, y in zip(rows[r], rows[col])
+                ]
+    return [row[size:] for row in rows]
+
+
+def build_systematic_blocks(m, n, p):
+    """Build a systematic coding matrix.
+
+    The matrix is `V * inverse(V[:m])` where `V` is the `(n, m)` matrix from
+    [`build_building_blocks()`][proxystore.cdn.reliability.utils.build_building_blocks].
+    Its first `m` rows are the identity, so the first `m` fragments are the
+    data itself, and any `m` rows are still linearly independent because
+    right multiplication by an invertible matrix preserves rank.
+
+    Args:
+        m: Minimum number of fragments required to restore the data.
+        n: Number of fragments.
+        p: Prime modulus.
+
+    Returns:
+        The `(n, m)` coding matrix as a list of rows.
+    """
+    vandermonde = build_building_blocks(m, n, p)
+    top_inverse = matrix_inverse(vandermonde[:m], p)
+    return matrix_product(vandermonde, top_inverse, p)
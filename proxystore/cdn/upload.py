@@ -0,0 +1,161 @@
+"""Streaming uploads of files to a CDN gateway.
+
+[`Client.put()`][proxystore.cdn.client.Client.put] sends the object as a
+`multipart/form-data` body with a `json` part (the object metadata) and a
+`data` part (the object). The helpers here build the same body from a file
+without reading the file into memory: the body is a file-like object that
+yields the multipart framing and then the file block by block, so memory
+use does not depend on the size of the file.
+
+Resumable uploads (see
+[`Client.put_resumable()`][proxystore.cdn.client.Client.put_resumable])
+instead send the object in fixed-size parts, each with a CRC32 checksum
+([`part_checksum()`][proxystore.cdn.upload.part_checksum]) the gateway
+verifies before acknowledging the part.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+import zlib
+from typing import Any
+from typing import BinaryIO
+from typing import Iterator
+
+from proxystore.cdn.constants import UPLOAD_BLOCK_SIZE
+
+
+def file_digest(
+    path: str | os.PathLike[str],
+    algorithm: str = 'sha3_256',
+    block_size: int = UPLOAD_BLOCK_SIZE,
+) -> str:
+    """Hash a file incrementally.
+
+    Args:
+        path: Path of the file.
+        algorithm: Name of a [`hashlib`][hashlib] algorithm.
+        block_size: Bytes read per block.
+
+    Returns:
+        Hex digest of the file.
+    """
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    with open(path, 'rb') as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+PART_CHECKSUM_HEADER = 'X-Checksum-CRC32'
+"""Header of a part upload with the checksum of the part."""
+
+
+def part_checksum(data: Any) -> str:
+    """Compute the checksum of a part of a resumable upload.
+
+    Args:
+        data: Bytes-like part.
+
+    Returns:
+        CRC32 of the part as eight hex digits.
+    """
+    return f'{zlib.crc32(data):08x}'
+
+
+def part_ranges(size: int, part_size: int) -> Iterator[tuple[int, int]]:
+    """Split an object into parts.
+
+    An empty object has a single empty part.
+
+    Args:
+        size: Size of the object in bytes.
+        part_size: Bytes per part. The last part may be shorter.
+
+    Yields:
+        `(start, end)` byte offsets of each part.
+
+    Raises:
+        ValueError: If `part_size` is less than one.
+    """
+    if part_size < 1:
+        raise ValueError(f'part_size must be at least 1. Got {part_size}.')
+    yield 0, min(part_size, size)
+    for start in range(part_size, size, part_size):
+        yield start, min(start + part_size, size)
+
+
+class MultipartFileBody:
+    """Streaming `multipart/form-data` body with a JSON part and a file.
+
+    The body has a known length (so it is sent with a `Content-Length`
+    header) and is read by `requests` in blocks with
+    [`read()`][proxystore.cdn.upload.MultipartFileBody.read].
+
+    Args:
+        payload: Object metadata sent as the `json` part.
+        path: Path of the file sent as the `data` part.
+        block_size: Maximum bytes returned per read of the file.
+    """
+
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        path: str | os.PathLike[str],
+        block_size: int = UPLOAD_BLOCK_SIZE,
+    ) -> None:
+        boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        self.block_size = block_size
+        self._prefix = (
+            f'--{boundary}\r\n'
+            'Content-Disposition: form-data; name="json"; '
+            'filename="payload.json"\r\n'
+            'Content-Type: application/json\r\n\r\n'
+            f'{json.dumps(payload)}\r\n'
+            f'--{boundary}\r\n'
+            'Content-Disposition: form-data; name="data"; '
+            'filename="data.bin"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        self._suffix = f'\r\n--{boundary}--\r\n'.encode()
+        self._file: BinaryIO = open(path, 'rb')
+        self._file_size = os.fstat(self._file.fileno()).st_size
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._prefix) + self._file_size + len(self._suffix)
+
+    def __enter__(self) -> MultipartFileBody:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read the next bytes of the body."""
+        size = self.block_size if size is None or size < 0 else size
+        prefix = len(self._prefix)
+        file_end = prefix + self._file_size
+        if self._position < prefix:
+            data = self._prefix[self._position : self._position + size]
+        elif self._position < file_end:
+            data = self._file.read(min(size, file_end - self._position))
+            if not data:
+                raise OSError('File was truncated while being uploaded.')
+        else:
+            offset = self._position - file_end
+            data = self._suffix[offset : offset + size]
+        self._position += len(data)
+        return data
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import requests
 import configparser
+import functools
 import hashlib
+import mmap
 import os
+import threading
 import time
 import uuid
 import sys
@@ -13,7 +16,27 @@ from typing import Any
 from typing import NamedTuple
 from typing import Sequence
 
+from proxystore.cdn.balancer import GatewayBalancer
+from proxystore.cdn.balancer import probe_gateway
 from proxystore.cdn.client import Client
+from proxystore.cdn.compression import compress
+from proxystore.cdn.compression import decompress
+from proxystore.cdn.compression import get_codec
+from proxystore.cdn.client import ObjectNotFoundError
+from proxystore.cdn.constants import COMPRESSION_MIN_RATIO
+from proxystore.cdn.constants import DEFAULT_BATCH_WORKERS
+from proxystore.cdn.constants import DEFAULT_POOL_CONNECTIONS
+from proxystore.cdn.constants import DEFAULT_POOL_MAXSIZE
+from proxystore.cdn.constants import DEFAULT_RANGE_SIZE
+from proxystore.cdn.constants import DISPERSE_SINGLE
+from proxystore.cdn.constants import GATEWAY_HEALTH_INTERVAL
+from proxystore.cdn.constants import METADATA_CACHE_SIZE
+from proxystore.cdn.constants import METADATA_CACHE_TTL
+from proxystore.cdn.metadata_cache import ContentIndex
+from proxystore.cdn.metadata_cache import MetadataCache
+from proxystore.cdn.pool import create_session
+from proxystore.cdn.pool import map_bounded
+from proxystore.utils.hedging import HedgePolicy
 
 if sys.version_info >= (3, 11):  # pragma: >=3.11 cover
     from typing import Self
@@ -32,25 +55,181 @@ class CDNKey(NamedTuple):
 
     Attributes:
         cdn_key: Unique object ID.
+        dispersed: If the object was dispersed into fragments on the
+            client and must be restored on the client when read.
+        codec: Name of the codec the object was compressed with or `None`
+            if the object is not compressed.
     """
 
     cdn_key: str
+    dispersed: bool = False
+    codec: str | None = None
+
+def _map_file(filepath: str) -> bytes | mmap.mmap:
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
 
 class CDNConnector:
-    def __init__(self, catalog, user_token=None, gateway=None, configuration_file="config.cfg"):
-        self.configuration_file = configuration_file
+    """Connector to a CDN gateway.
+
+    Args:
+        catalog: Catalog to put objects in.
+        user_token: User token. Read from `configuration_file` if `None`.
+        gateway: Address of the gateway, or a list of addresses of gateways
+            that serve the same objects. Read from `configuration_file`
+            (where gateways are separated by commas) if `None`. Requests
+            are balanced over multiple gateways with a
+            [`GatewayBalancer`][proxystore.cdn.balancer.GatewayBalancer] and
+            retried on another gateway if a gateway cannot be reached.
+        configuration_file: Path of the configuration file.
+        workers: Number of threads used to decode objects dispersed on the
+            client in [`get()`][proxystore.connectors.cdn.CDNConnector.get].
+        pool_connections: Number of per-host connection pools to cache.
+        pool_maxsize: Maximum number of keep-alive connections per host.
+        connections: Maximum number of concurrent byte range requests used
+            to get an object stored without client-side dispersal (see
+            [`Client.get()`][proxystore.cdn.client.Client.get]). `1` gets
+            objects with a single request.
+        range_size: Bytes per range request.
+        metadata_cache_size: Maximum number of objects whose existence and
+            dispersal metadata the client caches (`0` disables the cache).
+        metadata_cache_ttl: Seconds the existence and metadata of an object
+            are cached.
+        batch_workers: Maximum number of concurrent object transfers of
+            batch operations. Batch lookups and evictions are sent as one
+            request.
+        dedup: Put objects with the same content as an object stored in
+            the same catalog as a reference to that content instead of
+            uploading them again (see
+            [`Client.put_dedup()`][proxystore.cdn.client.Client.put_dedup]).
+            Each object keeps its own key, and evicting it drops only its
+            reference. Only applies to objects put without dispersal or
+            D-Rex placement.
+        compression: Names of the codecs (e.g., `["zstd", "lz4"]`) to
+            consider for compressing each object put (see
+            [`compress()`][proxystore.cdn.compression.compress]). The codec
+            is chosen per object by compressing a sample of the object, and
+            objects whose sample does not shrink are stored as is. `None`
+            disables compression. The codec is recorded in the returned key
+            and objects are decompressed transparently when read.
+        compression_min_ratio: Minimum compression ratio of the sample for
+            an object to be compressed.
+        upload_part_size: Put objects (and files) larger than this many
+            bytes without dispersal or D-Rex placement with a resumable
+            upload of parts of this size (see
+            [`Client.put_resumable()`][proxystore.cdn.client.Client.put_resumable]).
+            Parts are uploaded by the `workers` passed to
+            [`put()`][proxystore.connectors.cdn.CDNConnector.put]. `None`
+            puts objects with a single request.
+        health_check_interval: Seconds between background health checks
+            of the gateways if there are several.
+        hedge_percentile: Hedge gets of objects stored without dispersal
+            that take longer than this latency percentile (e.g., `0.95`)
+            with a request to another gateway, and retry failed gets under
+            the shared retry budget (see
+            [`HedgePolicy`][proxystore.utils.hedging.HedgePolicy]). `None`
+            disables hedging.
+        hedge_timeout: Seconds a hedged get waits for a gateway before it
+            fails, or `None` to wait forever.
+
+    Raises:
+        ValueError: If a codec in `compression` is not available.
+    """
 
-        # Maintain single session for connection pooling persistence to
-        # speed up repeat requests to same endpoint.
-        self._session = requests.Session()
+    def __init__(
+        self,
+        catalog: str,
+        user_token: str | None = None,
+        gateway: str | Sequence[str] | None = None,
+        configuration_file: str = 'config.cfg',
+        workers: int = 1,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connections: int = 1,
+        range_size: int = DEFAULT_RANGE_SIZE,
+        metadata_cache_size: int = METADATA_CACHE_SIZE,
+        metadata_cache_ttl: float = METADATA_CACHE_TTL,
+        batch_workers: int = DEFAULT_BATCH_WORKERS,
+        dedup: bool = False,
+        compression: Sequence[str] | None = None,
+        compression_min_ratio: float = COMPRESSION_MIN_RATIO,
+        upload_part_size: int | None = None,
+        health_check_interval: float = GATEWAY_HEALTH_INTERVAL,
+        hedge_percentile: float | None = None,
+        hedge_timeout: float | None = None,
+    ) -> None:
+        self.configuration_file = configuration_file
+        self.workers = workers
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connections = connections
+        self.range_size = range_size
+        self.metadata_cache_size = metadata_cache_size
+        self.metadata_cache_ttl = metadata_cache_ttl
+        self.batch_workers = batch_workers
+        self.dedup = dedup
+        self.compression = None if compression is None else list(compression)
+        self.compression_min_ratio = compression_min_ratio
+        self.upload_part_size = upload_part_size
+        self.health_check_interval = health_check_interval
+        self.hedge_percentile = hedge_percentile
+        self.hedge_timeout = hedge_timeout
+        self.hedge = (
+            None
+            if hedge_percentile is None
+            else HedgePolicy(hedge_percentile, timeout=hedge_timeout)
+        )
+        for codec in self.compression or ():
+            get_codec(codec)
 
         # Load configuration (tokens and url to gateway)
         parser = configparser.RawConfigParser()
         parser.read(configuration_file)
-        self.token_user = parser.get('credentials', 'token_user') if user_token is None else user_token
-        self.gateway = parser.get('services', 'gateway') if gateway is None else gateway
+        self.token_user = (
+            parser.get('credentials', 'token_user')
+            if user_token is None
+            else user_token
+        )
+        self.gateway = (
+            parser.get('services', 'gateway') if gateway is None else gateway
+        )
+        if isinstance(self.gateway, str):
+            self.gateways = [
+                g.strip() for g in self.gateway.split(',') if g.strip()
+            ]
+        else:
+            self.gateways = list(self.gateway)
         self.catalog = catalog
-        self.client = Client(self.gateway)
+
+        # Maintain single session for connection pooling persistence to
+        # speed up repeat requests to same endpoint.
+        self._session = create_session(pool_connections, pool_maxsize)
+        # The gateways serve the same objects, so the clients share the
+        # session, caches and storage node latencies.
+        metadata_cache = MetadataCache(metadata_cache_size, metadata_cache_ttl)
+        content_index = ContentIndex()
+        node_latency: dict[str, float] = {}
+        latency_lock = threading.Lock()
+        self.clients = {
+            gateway: Client(
+                gateway,
+                session=self._session,
+                metadata_cache=metadata_cache,
+                content_index=content_index,
+                node_latency=node_latency,
+                latency_lock=latency_lock,
+            )
+            for gateway in self.gateways
+        }
+        self.client = self.clients[self.gateways[0]]
+        self.balancer = GatewayBalancer(
+            self.gateways,
+            probe=functools.partial(probe_gateway, self._session),
+            health_interval=health_check_interval,
+        )
         
     def __enter__(self) -> Self:
         return self
@@ -65,8 +244,61 @@ class CDNConnector:
 
     def close(self) -> None:
         """Close tpyhe connector and clean up."""
+        self.balancer.close()
+        if self.hedge is not None:
+            self.hedge.close()
         self._session.close()
 
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection reuse statistics of the connector's pool.
+
+        See [`pool_stats()`][proxystore.cdn.pool.pool_stats].
+        """
+        return self.client.pool_stats()
+
+    def gateway_stats(self) -> dict[str, dict[str, Any]]:
+        """Get the load balancing statistics of each gateway.
+
+        See
+        [`GatewayBalancer.stats()`][proxystore.cdn.balancer.GatewayBalancer.stats].
+        """
+        return self.balancer.stats()
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        # Calls a client method on the gateway chosen by the balancer and
+        # fails over to the other gateways if the gateway cannot be reached.
+        tried: list[str] = []
+        while True:
+            gateway = self.balancer.choose(exclude=tried)
+            tried.append(gateway)
+            try:
+                client = self.clients[gateway]
+                with self.balancer.track(gateway):
+                    return getattr(client, method)(*args, **kwargs)
+            except self.balancer.failover_errors:
+                if len(tried) == len(self.gateways):
+                    raise
+
+    def _get_hedged(self, key: CDNKey) -> bytes:
+        # Each attempt goes to a gateway no earlier attempt of the get used,
+        # while there is one.
+        used: list[str] = []
+
+        def _attempt(attempt: int) -> bytes:
+            exclude = used if len(used) < len(self.gateways) else ()
+            gateway = self.balancer.choose(exclude=exclude)
+            used.append(gateway)
+            with self.balancer.track(gateway):
+                return self.clients[gateway].get_once(
+                    key.cdn_key,
+                    self.token_user,
+                    session=self._session,
+                    timeout=self.hedge_timeout,
+                )
+
+        assert self.hedge is not None
+        return self.hedge.run(_attempt)
+
     def config(self) -> dict[str, Any]:
         """Get the connector configuration.
 
@@ -76,7 +308,22 @@ class CDNConnector:
         return {
             'catalog': self.catalog,
             'user_token': self.token_user,
-            'gateway': self.gateway
+            'gateway': self.gateway,
+            'workers': self.workers,
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'connections': self.connections,
+            'range_size': self.range_size,
+            'metadata_cache_size': self.metadata_cache_size,
+            'metadata_cache_ttl': self.metadata_cache_ttl,
+            'batch_workers': self.batch_workers,
+            'dedup': self.dedup,
+            'compression': self.compression,
+            'compression_min_ratio': self.compression_min_ratio,
+            'upload_part_size': self.upload_part_size,
+            'health_check_interval': self.health_check_interval,
+            'hedge_percentile': self.hedge_percentile,
+            'hedge_timeout': self.hedge_timeout,
         }
         
     @classmethod
@@ -98,16 +345,14 @@ class CDNConnector:
             If an object associated with the key exists.
         """
         try:
-            return self.client.exists(
+            return self._call(
+                'exists',
                 key.cdn_key,
                 self.token_user,
                 session=self._session,
             )
         except requests.exceptions.RequestException as e:
-            assert e.response is not None
-            raise CDNConnectorError(
-                f'Exists failed with error code {v}.',
-            ) from e
+            raise CDNConnectorError(f'Exists failed with error {e}.') from e
             
     def evict(self, key: CDNKey) -> None:
         """Evict an object associated with the key.
@@ -116,33 +361,133 @@ class CDNConnector:
             key: Key associated with object to evict.
         """
         try:
-            self.client.evict(
+            self._call(
+                'evict',
                 key.cdn_key,
                 self.token_user,
                 session=self._session,
             )
         except requests.exceptions.RequestException as e:
-            assert e.response is not None
-            raise CDNConnectorError(
-                f'Evict failed with error code {v}.',
-            ) from e
+            raise CDNConnectorError(f'Evict failed with error {e}.') from e
+
+    def get(self, key: CDNKey) -> bytes | bytearray | None:
+        """Get the serialized object associated with the key.
+
+        Args:
+            key: Key associated with the object to retrieve.
+
+        Returns:
+            Serialized object or `None` if the object does not exist.
+        """
+        try:
+            if key.dispersed:
+                data = self._call(
+                    'get_chunks',
+                    key.cdn_key,
+                    self.token_user,
+                    session=self._session,
+                    max_workers=self.workers,
+                )
+            elif self.hedge is not None and self.connections == 1:
+                data = self._get_hedged(key)
+            else:
+                data = self._call(
+                    'get',
+                    key.cdn_key,
+                    self.token_user,
+                    session=self._session,
+                    connections=self.connections,
+                    range_size=self.range_size,
+                )
+        except requests.exceptions.RequestException as e:
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+        return decompress(data, key.codec)
+
+    def get_range(self, key: CDNKey, offset: int, length: int) -> bytes:
+        """Get a byte range of the object associated with the key.
+
+        For objects dispersed on the client, only the stripes covering the
+        range are downloaded and decoded. Other objects, and compressed
+        objects, are downloaded in full and sliced.
+
+        Args:
+            key: Key associated with the object to retrieve.
+            offset: First byte of the range.
+            length: Number of bytes to read. Truncated at the end of the
+                object.
 
-    def get(self, key: CDNKey):
+        Returns:
+            The bytes of the range.
+        """
+        if key.codec is not None:
+            return self.get(key)[offset : offset + length]
         try:
-            return self.client.get(
+            if key.dispersed:
+                return self._call(
+                    'get_range',
+                    key.cdn_key,
+                    offset,
+                    length,
+                    self.token_user,
+                    session=self._session,
+                )
+            data = self._call(
+                'get',
                 key.cdn_key,
                 self.token_user,
                 session=self._session,
             )
         except requests.exceptions.RequestException as e:
-            assert e.response is not None
-            raise CDNConnectorError(
-                f'Get failed with error code {e.response.status_code}.',
-            )(e)
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+        return data[offset : offset + length]
+
+    def get_to_file(self, key: CDNKey, path: str) -> int:
+        """Get the object associated with the key into a file.
+
+        Objects stored without client-side dispersal or compression are
+        streamed to the file without being held in memory.
+
+        Args:
+            key: Key associated with the object to retrieve.
+            path: Path of the file to write.
+
+        Returns:
+            Number of bytes written to the file.
+        """
+        if key.codec is not None:
+            data = self.get(key)
+            with open(path, 'wb') as f:
+                return f.write(data)
+        try:
+            if not key.dispersed:
+                return self._call(
+                    'get_to_file',
+                    key.cdn_key,
+                    path,
+                    self.token_user,
+                    session=self._session,
+                    connections=self.connections,
+                    range_size=self.range_size,
+                )
+            data = self._call(
+                'get_chunks',
+                key.cdn_key,
+                self.token_user,
+                session=self._session,
+                max_workers=self.workers,
+            )
+        except requests.exceptions.RequestException as e:
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+        with open(path, 'wb') as f:
+            return f.write(data)
 
     def get_batch(self, keys: Sequence[CDNKey]) -> list[bytes | None]:
         """Get a batch of serialized objects associated with the keys.
 
+        The objects are looked up with one metadata request (see
+        [`Client.metadata_batch()`][proxystore.cdn.client.Client.metadata_batch])
+        and the objects that exist are downloaded concurrently.
+
         Args:
             keys: Sequence of keys associated with objects to retrieve.
 
@@ -150,7 +495,67 @@ class CDNConnector:
             List with same order as `keys` with the serialized objects or \
             `None` if the corresponding key does not have an associated object.
         """
-        return [self.get(key) for key in keys]
+        try:
+            entries = self._call(
+                'metadata_batch',
+                [key.cdn_key for key in keys],
+                self.token_user,
+                session=self._session,
+            )
+        except requests.exceptions.RequestException as e:
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+
+        def _get(key: CDNKey) -> bytes | None:
+            try:
+                return self.get(key)
+            except CDNConnectorError as e:
+                if isinstance(e.__cause__, ObjectNotFoundError):
+                    return None
+                raise
+
+        present = [
+            key for key, entry in zip(keys, entries) if entry is not None
+        ]
+        objects = iter(map_bounded(_get, present, self.batch_workers))
+        return [None if entry is None else next(objects) for entry in entries]
+
+    def exists_batch(self, keys: Sequence[CDNKey]) -> list[bool]:
+        """Check if a batch of objects exist.
+
+        Cached answers are returned without a request and the other keys
+        are checked with one request.
+
+        Args:
+            keys: Sequence of keys potentially associated with objects.
+
+        Returns:
+            List with same order as `keys`.
+        """
+        try:
+            return self._call(
+                'exists_batch',
+                [key.cdn_key for key in keys],
+                self.token_user,
+                session=self._session,
+            )
+        except requests.exceptions.RequestException as e:
+            raise CDNConnectorError(f'Exists failed with error {e}.') from e
+
+    def evict_batch(self, keys: Sequence[CDNKey]) -> None:
+        """Evict a batch of objects with one request.
+
+        Args:
+            keys: Sequence of keys associated with objects to evict.
+        """
+        try:
+            self._call(
+                'evict_batch',
+                [key.cdn_key for key in keys],
+                self.token_user,
+                session=self._session,
+            )
+        except requests.exceptions.RequestException as e:
+            raise CDNConnectorError(f'Evict failed with error {e}.') from e
 
     def new_key(self) -> CDNKey:
         """Create a new key.
@@ -174,73 +579,244 @@ class CDNConnector:
         return CDNKey(cdn_key=str(uuid.uuid4()))
     
 
-    def put(self, data: bytes = None, filepath: str = None, is_encrypted: bool = False,
-            workers: int = 1, resiliency: int = 0, number_of_chunks=1, required_chunks=1, nodes=None) -> CDNKey:
-        # Read data from file if data is null and a filepath is received
+    def _resumable(self, size: int) -> bool:
+        part_size = self.upload_part_size
+        return part_size is not None and size > part_size
 
-        name = time.time() if filepath is None else os.path.basename(filepath)
+    def put(
+        self,
+        data: bytes | None = None,
+        filepath: str | None = None,
+        is_encrypted: bool = False,
+        workers: int = 1,
+        resiliency: int = 0,
+        number_of_chunks: int = 1,
+        required_chunks: int = 1,
+        nodes: Sequence[Any] | None = None,
+        disperse: str = DISPERSE_SINGLE,
+        dedup: bool | None = None,
+    ) -> tuple[CDNKey, dict[str, Any]]:
+        """Put a serialized object or file in the CDN.
 
-        if data is None and filepath is not None:
-            data = open(filepath, mode='rb').read()
+        Args:
+            data: Serialized object to put.
+            filepath: Path of a file to put if `data` is `None`. Without
+                dispersal, D-Rex placement or compression, the file is
+                streamed to the gateway block by block (see
+                [`Client.put_file()`][proxystore.cdn.client.Client.put_file])
+                so it is never held in memory. Otherwise the file is
+                memory-mapped.
+            is_encrypted: If the data is encrypted.
+            workers: Number of parallel upload workers. Objects dispersed on
+                the client are also encoded with this many threads, each
+                encoding a range of stripes.
+            resiliency: Resiliency level of gateway side dispersal.
+            number_of_chunks: Number of fragments (n) to disperse into.
+            required_chunks: Number of fragments (m) required to restore
+                the object.
+            nodes: Storage nodes to use for D-Rex placement.
+            disperse: `"SINGLE"` to let the gateway store the object, or
+                `"IDA"`/`"GF256"` to disperse the object into
+                `number_of_chunks` fragments on the client with the prime
+                field IDA or GF(2^8) Reed-Solomon coding.
+            dedup: Override the connector's `dedup` option for this object.
+                If the content was deduplicated, `deduplicated` is `True`
+                in the metrics.
+
+        Returns:
+            Tuple of the key and a dictionary of timing metrics. If
+            compression is enabled, the metrics also contain the `codec`,
+            the `original_size`, `stored_size` and `saved_bytes` of the
+            object, and the codec CPU time (`compression_time`).
+        """
+        dedup = self.dedup if dedup is None else dedup
+        name = time.time() if filepath is None else os.path.basename(filepath)
 
         # calculate the object id
-        object_id = CDNKey(cdn_key=str(uuid.uuid4()))
+        object_id = CDNKey(
+            cdn_key=str(uuid.uuid4()),
+            dispersed=disperse != DISPERSE_SINGLE,
+        )
 
+        mapped = None
+        if data is None and filepath is not None:
+            if (
+                disperse == DISPERSE_SINGLE
+                and nodes is None
+                and self.compression is None
+                and not self._resumable(os.path.getsize(filepath))
+            ):
+                # Stream the file instead of reading it into memory.
+                try:
+                    time_metrics = self._call(
+                        'put_file',
+                        filepath,
+                        self.token_user,
+                        self.catalog,
+                        key=object_id.cdn_key,
+                        name=name,
+                        session=self._session,
+                        is_encrypted=is_encrypted,
+                        resiliency=resiliency,
+                    )
+                except requests.exceptions.RequestException as e:
+                    raise CDNConnectorError(
+                        f'Put failed with error code {e!s}.',
+                    ) from e
+                return object_id, time_metrics
+            # Dispersal needs random access to the whole object; map the
+            # file instead of copying it into memory. The mapping is closed
+            # once the object is uploaded.
+            mapped = data = _map_file(filepath)
+
+        compression_metrics = {}
+        if self.compression is not None and data is not None:
+            codec, data, compression_metrics = compress(
+                data,
+                self.compression,
+                min_ratio=self.compression_min_ratio,
+            )
+            object_id = object_id._replace(codec=codec)
+
+        dedup = dedup and disperse == DISPERSE_SINGLE and nodes is None
+        # The digest is computed once and shared by the reference lookup and
+        # the upload.
+        data_hash = (
+            hashlib.sha3_256(data).hexdigest()
+            if dedup or disperse != DISPERSE_SINGLE
+            else None
+        )
         try:
-            if nodes == None:
-                time_metrics = self.client.put(
-                    key=object_id.cdn_key,
-                    name=name,
-                    data=data,
-                    token_user=self.token_user,
-                    catalog=self.catalog,
-                    session=self._session,
-                    is_encrypted=is_encrypted,
-                    max_workers=workers, 
-                    resiliency=resiliency
-                )
-            else:
-                time_metrics = self.client.put_drex(
+            time_metrics = None
+            if dedup:
+                # Store a reference to the content if the gateway has it,
+                # otherwise upload the object below.
+                time_metrics = self._call(
+                    'put_reference',
+                    data_hash,
+                    self.token_user,
+                    self.catalog,
                     key=object_id.cdn_key,
-                    name=name,
-                    data=data,
-                    token_user=self.token_user,
-                    catalog=self.catalog,
                     session=self._session,
-                    is_encrypted=is_encrypted,
-                    max_workers=workers, 
-                    resiliency=resiliency,
-                    number_of_chunks=number_of_chunks,
-                    required_chunks=required_chunks,
-                    nodes=nodes
                 )
+
+            if time_metrics is None:
+                if disperse != DISPERSE_SINGLE:
+                    time_metrics = self._call(
+                        'put_chunks',
+                        key=object_id.cdn_key,
+                        data_hash=data_hash,
+                        name=name,
+                        data=data,
+                        token_user=self.token_user,
+                        catalog=self.catalog,
+                        session=self._session,
+                        is_encrypted=is_encrypted,
+                        chunks=number_of_chunks,
+                        required_chunks=required_chunks,
+                        max_workers=workers,
+                        disperse=disperse,
+                    )
+                elif nodes is None and self._resumable(len(data)):
+                    time_metrics = self._call(
+                        'put_resumable',
+                        data,
+                        self.token_user,
+                        self.catalog,
+                        key=object_id.cdn_key,
+                        name=name,
+                        session=self._session,
+                        is_encrypted=is_encrypted,
+                        resiliency=resiliency,
+                        part_size=self.upload_part_size,
+                        max_workers=workers,
+                    )
+                elif nodes is None:
+                    time_metrics = self._call(
+                        'put',
+                        key=object_id.cdn_key,
+                        name=name,
+                        data=data,
+                        token_user=self.token_user,
+                        catalog=self.catalog,
+                        session=self._session,
+                        is_encrypted=is_encrypted,
+                        max_workers=workers,
+                        resiliency=resiliency,
+                        data_hash=data_hash,
+                    )
+                else:
+                    time_metrics = self._call(
+                        'put_drex',
+                        key=object_id.cdn_key,
+                        name=name,
+                        data=data,
+                        token_user=self.token_user,
+                        catalog=self.catalog,
+                        session=self._session,
+                        is_encrypted=is_encrypted,
+                        max_workers=workers,
+                        resiliency=resiliency,
+                        number_of_chunks=number_of_chunks,
+                        required_chunks=required_chunks,
+                        nodes=nodes,
+                    )
         except requests.exceptions.RequestException as e:
             #assert e.response is not None
             raise CDNConnectorError(
                 f'Put failed with error code {str(e)}.',
             ) from e
+        finally:
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
 
+        if dedup:
+            time_metrics.setdefault('deduplicated', False)
+        time_metrics.update(compression_metrics)
         return object_id, time_metrics
 
-    def put_batch(self, objs: Sequence[bytes] = None, files: Sequence[CDNKey] = None) -> list[str]:
-        """Put a batch of serialized objects in the store.
+    def put_batch(
+        self,
+        objs: Sequence[bytes] | None = None,
+        files: Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> list[tuple[CDNKey, dict[str, Any]]]:
+        """Put a batch of serialized objects or files concurrently.
 
         Args:
             objs: Sequence of serialized objects to put in the store.
             files: Sequence of paths to reads the files to put in the store
+                if `objs` is `None`.
+            kwargs: Keyword arguments passed to each
+                [`put()`][proxystore.connectors.cdn.CDNConnector.put].
 
         Returns:
-            List of keys with the same order as `objs` which can be used to \
-            retrieve the objects.
+            List of keys and timing metrics with the same order as `objs` \
+            (or `files`) which can be used to retrieve the objects.
         """
-
         if objs is not None:
-            return [self.put(data=obj) for obj in objs]
+            return map_bounded(
+                lambda obj: self.put(data=obj, **kwargs),
+                objs,
+                self.batch_workers,
+            )
         elif files is not None:
-            return [self.put(filepath=file) for file in files]
+            return map_bounded(
+                lambda file: self.put(filepath=file, **kwargs),
+                files,
+                self.batch_workers,
+            )
+        return []
 
-    def set(self, key: str, obj: bytes, is_encrypted: bool = False,
-            number_of_chunks: int = 1, required_chunks: int = 1, disperse="SINGLE") -> None:
+    def set(
+        self,
+        key: str,
+        obj: bytes,
+        is_encrypted: bool = False,
+        number_of_chunks: int = 1,
+        required_chunks: int = 1,
+        disperse: str = DISPERSE_SINGLE,
+    ) -> None:
         """Set the object associated with a key.
 
         Note:
@@ -253,6 +829,13 @@ class CDNConnector:
         Args:
             key: Key that the object will be associated with.
             obj: Object to associate with the key.
+            is_encrypted: If the object is encrypted.
+            number_of_chunks: Number of fragments (n) to disperse into.
+            required_chunks: Number of fragments (m) required to restore
+                the object.
+            disperse: `"SINGLE"` to let the gateway store the object, or a
+                client-side dispersal (see
+                [`put()`][proxystore.connectors.cdn.CDNConnector.put]).
         """
         name = str(time.time())
 
@@ -263,23 +846,33 @@ class CDNConnector:
         obj_sha3_256 = sha3_256.hexdigest()
 
         try:
-            self.client.put(
-                address=self.gateway,
-                key=key,
-                data_hash=obj_sha3_256,
-                name=name,
-                data=obj,
-                token_user=self.token_user,
-                catalog=self.catalog,
-                session=self._session,
-                is_encrypted=is_encrypted,
-                chunks=number_of_chunks,
-                required_chunks=required_chunks,
-                disperse=disperse
-            )
+            if disperse == DISPERSE_SINGLE:
+                self._call(
+                    'put',
+                    key=key,
+                    name=name,
+                    data=obj,
+                    token_user=self.token_user,
+                    catalog=self.catalog,
+                    session=self._session,
+                    is_encrypted=is_encrypted,
+                )
+            else:
+                self._call(
+                    'put_chunks',
+                    key=key,
+                    data_hash=obj_sha3_256,
+                    name=name,
+                    data=obj,
+                    token_user=self.token_user,
+                    catalog=self.catalog,
+                    session=self._session,
+                    is_encrypted=is_encrypted,
+                    chunks=number_of_chunks,
+                    required_chunks=required_chunks,
+                    disperse=disperse,
+                )
         except requests.exceptions.RequestException as e:
-            assert e.response is not None
             raise CDNConnectorError(
-                f'Put failed with error code {v}.',
+                f'Put failed with error {e}.',
             ) from e
-            
\ No newline at end of file
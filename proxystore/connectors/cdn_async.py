@@ -0,0 +1,370 @@
+"""Asyncio connector to a CDN gateway.
+
+[`AsyncCDNConnector`][proxystore.connectors.cdn_async.AsyncCDNConnector]
+mirrors [`CDNConnector`][proxystore.connectors.cdn.CDNConnector] with
+coroutine methods backed by an
+[`AsyncClient`][proxystore.cdn.async_client.AsyncClient]. It is meant for
+applications that already run an event loop (e.g., workflow engines and
+endpoints) and cannot be used with a
+[`Store`][proxystore.store.base.Store], which expects synchronous
+connectors.
+
+Objects dispersed on the client are encoded and decoded by a synchronous
+[`Client`][proxystore.cdn.client.Client] in the loop's default executor so
+the CPU-bound coding does not block the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import configparser
+import functools
+import hashlib
+import os
+import sys
+import time
+import uuid
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Sequence
+from typing import TypeVar
+
+import requests
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover
+    import warnings
+
+    warnings.warn(
+        f'{e}. To enable the async CDN connector, install proxystore with '
+        '"pip install proxystore[cdn]".',
+        stacklevel=2,
+    )
+
+if sys.version_info >= (3, 11):  # pragma: >=3.11 cover
+    from typing import Self
+else:  # pragma: <3.11 cover
+    from typing_extensions import Self
+
+from proxystore.cdn.async_client import AsyncClient
+from proxystore.cdn.client import Client
+from proxystore.cdn.compression import decompress
+from proxystore.cdn.constants import DEFAULT_ASYNC_LIMIT
+from proxystore.cdn.constants import DISPERSE_SINGLE
+from proxystore.connectors.cdn import CDNConnectorError
+from proxystore.connectors.cdn import CDNKey
+
+T = TypeVar('T')
+
+
+def _read_file(filepath: str) -> bytes:
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+
+class AsyncCDNConnector:
+    """Asyncio connector to a CDN gateway.
+
+    Args:
+        catalog: Catalog to put objects in.
+        user_token: User token. Read from `configuration_file` if `None`.
+        gateway: Address of the gateway. Read from `configuration_file` if
+            `None`.
+        configuration_file: Path of the configuration file.
+        workers: Number of threads used to encode and decode objects
+            dispersed on the client.
+        limit: Maximum number of concurrent connections and of requests in
+            flight in batch methods.
+    """
+
+    def __init__(
+        self,
+        catalog: str,
+        user_token: str | None = None,
+        gateway: str | None = None,
+        configuration_file: str = 'config.cfg',
+        workers: int = 1,
+        limit: int = DEFAULT_ASYNC_LIMIT,
+    ) -> None:
+        self.configuration_file = configuration_file
+        self.workers = workers
+        self.limit = limit
+
+        parser = configparser.RawConfigParser()
+        parser.read(configuration_file)
+        self.token_user = (
+            parser.get('credentials', 'token_user')
+            if user_token is None
+            else user_token
+        )
+        self.gateway = (
+            parser.get('services', 'gateway') if gateway is None else gateway
+        )
+        self.catalog = catalog
+        self.client = AsyncClient(self.gateway, limit=limit)
+        # Encodes and decodes objects dispersed on the client.
+        self._sync_client = Client(self.gateway)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connector and clean up."""
+        await self.client.close()
+        self._sync_client.close()
+
+    def config(self) -> dict[str, Any]:
+        """Get the connector configuration.
+
+        The configuration contains all the information needed to reconstruct
+        the connector object.
+        """
+        return {
+            'catalog': self.catalog,
+            'user_token': self.token_user,
+            'gateway': self.gateway,
+            'workers': self.workers,
+            'limit': self.limit,
+        }
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> AsyncCDNConnector:
+        """Create a new connector instance from a configuration.
+
+        Args:
+            config: Configuration returned by `#!python .config()`.
+        """
+        return cls(**config)
+
+    async def _in_executor(self, func: Callable[..., T], **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(func, **kwargs),
+        )
+
+    async def exists(self, key: CDNKey) -> bool:
+        """Check if an object associated with the key exists.
+
+        Args:
+            key: Key potentially associated with stored object.
+
+        Returns:
+            If an object associated with the key exists.
+        """
+        try:
+            return await self.client.exists(key.cdn_key, self.token_user)
+        except aiohttp.ClientError as e:
+            raise CDNConnectorError(f'Exists failed with error {e}.') from e
+
+    async def evict(self, key: CDNKey) -> None:
+        """Evict an object associated with the key.
+
+        Args:
+            key: Key associated with object to evict.
+        """
+        try:
+            await self.client.evict(key.cdn_key, self.token_user)
+        except aiohttp.ClientError as e:
+            raise CDNConnectorError(f'Evict failed with error {e}.') from e
+
+    async def get(self, key: CDNKey) -> bytes | None:
+        """Get the serialized object associated with the key.
+
+        Args:
+            key: Key associated with the object to retrieve.
+
+        Returns:
+            Serialized object or `None` if the object does not exist.
+            Objects compressed by a
+            [`CDNConnector`][proxystore.connectors.cdn.CDNConnector] are
+            decompressed.
+        """
+        data: bytes | None
+        try:
+            if key.dispersed:
+                data = await self._in_executor(
+                    self._sync_client.get_chunks,
+                    key=key.cdn_key,
+                    token_user=self.token_user,
+                    max_workers=self.workers,
+                )
+            else:
+                data = await self.client.get(key.cdn_key, self.token_user)
+        except (
+            aiohttp.ClientError,
+            requests.exceptions.RequestException,
+        ) as e:
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+        if key.codec is None or data is None:
+            return data
+        return await self._in_executor(decompress, data=data, codec=key.codec)
+
+    def new_key(self) -> CDNKey:
+        """Create a new key."""
+        return CDNKey(cdn_key=str(uuid.uuid4()))
+
+    async def put(
+        self,
+        data: bytes | None = None,
+        filepath: str | None = None,
+        is_encrypted: bool = False,
+        resiliency: int = 0,
+        number_of_chunks: int = 1,
+        required_chunks: int = 1,
+        nodes: list[str] | None = None,
+        disperse: str = DISPERSE_SINGLE,
+    ) -> tuple[CDNKey, dict[str, float]]:
+        """Put a serialized object or file in the CDN.
+
+        Args:
+            data: Serialized object to put.
+            filepath: Path of a file to put if `data` is `None`.
+            is_encrypted: If the data is encrypted.
+            resiliency: Resiliency level of gateway side dispersal.
+            number_of_chunks: Number of fragments (n) to disperse into.
+            required_chunks: Number of fragments (m) required to restore
+                the object.
+            nodes: Storage nodes to use for D-Rex placement.
+            disperse: `"SINGLE"` to let the gateway store the object, or a
+                client-side dispersal mode (e.g., `"IDA"`).
+
+        Returns:
+            Tuple of the key and a dictionary of timing metrics.
+        """
+        if filepath is None:
+            name = str(time.time())
+        else:
+            name = os.path.basename(filepath)
+        if data is None:
+            if filepath is None:
+                raise ValueError('One of data or filepath must be provided.')
+            # Reading the file blocks, so it is read in the executor.
+            data = await self._in_executor(_read_file, filepath=filepath)
+
+        key = CDNKey(
+            cdn_key=str(uuid.uuid4()),
+            dispersed=disperse != DISPERSE_SINGLE,
+        )
+        try:
+            if key.dispersed:
+                metrics = await self._in_executor(
+                    self._sync_client.put_chunks,
+                    key=key.cdn_key,
+                    data_hash=hashlib.sha3_256(data).hexdigest(),
+                    name=name,
+                    data=data,
+                    token_user=self.token_user,
+                    catalog=self.catalog,
+                    is_encrypted=is_encrypted,
+                    chunks=number_of_chunks,
+                    required_chunks=required_chunks,
+                    max_workers=self.workers,
+                    disperse=disperse,
+                )
+            else:
+                metrics = await self.client.put(
+                    data,
+                    self.token_user,
+                    self.catalog,
+                    key=key.cdn_key,
+                    name=name,
+                    is_encrypted=is_encrypted,
+                    resiliency=resiliency,
+                    number_of_chunks=number_of_chunks,
+                    required_chunks=required_chunks,
+                    nodes=nodes,
+                )
+        except (
+            aiohttp.ClientError,
+            requests.exceptions.RequestException,
+        ) as e:
+            raise CDNConnectorError(
+                f'Put failed with error code {e!s}.',
+            ) from e
+        return key, metrics
+
+    async def _batch(
+        self,
+        method: Callable[..., Any],
+        items: Sequence[Any],
+    ) -> list[Any]:
+        semaphore = asyncio.Semaphore(self.limit)
+
+        async def _run(item: Any) -> Any:
+            async with semaphore:
+                return await method(item)
+
+        return list(await asyncio.gather(*(_run(item) for item in items)))
+
+    async def evict_batch(self, keys: Sequence[CDNKey]) -> None:
+        """Evict a batch of objects with one request."""
+        try:
+            await self.client.evict_batch(
+                [key.cdn_key for key in keys],
+                self.token_user,
+            )
+        except aiohttp.ClientError as e:
+            raise CDNConnectorError(f'Evict failed with error {e}.') from e
+
+    async def exists_batch(self, keys: Sequence[CDNKey]) -> list[bool]:
+        """Check if a batch of objects exist with one request.
+
+        Returns:
+            List with the same order as `keys`.
+        """
+        try:
+            return await self.client.exists_batch(
+                [key.cdn_key for key in keys],
+                self.token_user,
+            )
+        except aiohttp.ClientError as e:
+            raise CDNConnectorError(f'Exists failed with error {e}.') from e
+
+    async def get_batch(self, keys: Sequence[CDNKey]) -> list[bytes | None]:
+        """Get a batch of serialized objects.
+
+        The objects are looked up with one metadata request and the objects
+        that exist are downloaded concurrently.
+
+        Returns:
+            List with the same order as `keys`.
+        """
+        try:
+            entries = await self.client.metadata_batch(
+                [key.cdn_key for key in keys],
+                self.token_user,
+            )
+        except aiohttp.ClientError as e:
+            raise CDNConnectorError(f'Get failed with error {e}.') from e
+        present = [
+            key for key, entry in zip(keys, entries) if entry is not None
+        ]
+        objects = iter(await self._batch(self.get, present))
+        return [None if entry is None else next(objects) for entry in entries]
+
+    async def put_batch(
+        self,
+        objs: Sequence[bytes],
+        **kwargs: Any,
+    ) -> list[tuple[CDNKey, dict[str, float]]]:
+        """Put a batch of serialized objects concurrently.
+
+        Args:
+            objs: Serialized objects to put.
+            kwargs: Keyword arguments passed to each
+                [`put()`][proxystore.connectors.cdn_async.AsyncCDNConnector.put].
+
+        Returns:
+            List of keys and timing metrics with the same order as `objs`.
+        """
+        return await self._batch(lambda obj: self.put(obj, **kwargs), objs)
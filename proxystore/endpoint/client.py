@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import uuid
+from typing import Sequence
 
 import requests
 from requests.exceptions import RequestException  # noqa: F401
 
 from proxystore.endpoint.constants import MAX_CHUNK_LENGTH
 from proxystore.utils.data import chunk_bytes
+from proxystore.utils.hedging import HedgePolicy
 
 
 def evict(
@@ -91,6 +93,8 @@ def get(
     key: str,
     endpoint: uuid.UUID | str | None = None,
     session: requests.Session | None = None,
+    hedge: HedgePolicy | None = None,
+    replicas: Sequence[str] = (),
 ) -> bytes | None:
     """Get the serialized object associated with the key.
 
@@ -101,6 +105,13 @@ def get(
         session: Session instance to use for making the request. Reusing the
             same session across multiple requests to the same host can improve
             performance.
+        hedge: Policy to hedge and retry the request with (see
+            [`HedgePolicy.run()`][proxystore.utils.hedging.HedgePolicy.run]).
+            Requests are sent once and wait forever if `None`.
+        replicas: Addresses of other endpoints that can serve the object
+            (e.g., peers of the endpoint that forward the operation to
+            `endpoint`). Hedged and retried requests are sent to `address`
+            and the replicas in turn.
 
     Returns:
         Serialized object or `None` if the object does not exist.
@@ -112,11 +123,34 @@ def get(
     endpoint_str = (
         str(endpoint) if isinstance(endpoint, uuid.UUID) else endpoint
     )
+    if hedge is None:
+        return _get(address, key, endpoint_str, session)
+
+    addresses = [address, *replicas]
+    return hedge.run(
+        lambda attempt: _get(
+            addresses[attempt % len(addresses)],
+            key,
+            endpoint_str,
+            session,
+            hedge.timeout,
+        ),
+    )
+
+
+def _get(
+    address: str,
+    key: str,
+    endpoint: str | None,
+    session: requests.Session | None,
+    timeout: float | None = None,
+) -> bytes | None:
     get_ = requests.get if session is None else session.get
     response = get_(
         f'{address}/get',
-        params={'key': key, 'endpoint': endpoint_str},
+        params={'key': key, 'endpoint': endpoint},
         stream=True,
+        timeout=timeout,
     )
 
     # Status code 404 is only returned if there's no data associated with the
@@ -0,0 +1,363 @@
+"""Hedged requests with a retry budget.
+
+A read that is slower than most reads is usually waiting on one slow or
+stalled server, connection or replica rather than on the amount of data.
+[`HedgePolicy.run()`][proxystore.utils.hedging.HedgePolicy.run] sends a
+duplicate (hedged) request once a read has taken longer than a percentile
+of the recent read latencies and returns whichever request finishes first.
+Requests that fail with a transient error are retried.
+
+Every hedge and retry is an extra request, so both draw from a
+[`RetryBudget`][proxystore.utils.hedging.RetryBudget] shared by all
+policies (unless a policy is given its own). Each request earns a fraction
+of a token, so extra requests stay a bounded fraction of all requests and
+cannot amplify load when a server is overloaded.
+
+Example:
+    ```python
+    from proxystore.endpoint import client
+    from proxystore.utils.hedging import HedgePolicy
+
+    policy = HedgePolicy(percentile=0.95, timeout=10)
+    data = client.get(address, key, hedge=policy)
+    ```
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Callable
+from typing import TypeVar
+
+import requests
+
+T = TypeVar('T')
+
+HEDGE_PERCENTILE = 0.95
+"""Default latency percentile after which a read is hedged."""
+
+HEDGE_MAX_ATTEMPTS = 3
+"""Default maximum number of requests (including hedges and retries)."""
+
+HEDGE_INITIAL_DELAY = 0.1
+"""Default seconds before hedging until enough latencies are recorded."""
+
+HEDGE_MIN_SAMPLES = 20
+"""Minimum number of recorded latencies to compute the hedging delay."""
+
+HEDGE_WINDOW = 1000
+"""Number of most recent latencies the hedging delay is computed from."""
+
+RETRY_BUDGET_RATIO = 0.1
+"""Default tokens earned per request (i.e., extra requests per request)."""
+
+RETRY_BUDGET_RESERVE = 10.0
+"""Default tokens a retry budget starts with."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Check if a failed request is worth retrying.
+
+    Connection errors, timeouts and server errors (HTTP 5xx) are transient.
+    Other errors, such as a missing object, are not.
+    """
+    if isinstance(
+        error,
+        (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+    ):
+        return True
+    if isinstance(error, requests.exceptions.RequestException):
+        response = error.response
+        return response is not None and response.status_code >= 500
+    return False
+
+
+class RetryBudget:
+    """Token bucket limiting extra requests to a fraction of all requests.
+
+    Args:
+        ratio: Tokens earned per request.
+        reserve: Tokens the budget starts with. The budget saves at most
+            twice as many tokens so a burst of failures after a quiet period
+            is still bounded.
+
+    Raises:
+        ValueError: If `ratio` or `reserve` is negative.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        reserve: float = RETRY_BUDGET_RESERVE,
+    ) -> None:
+        if ratio < 0 or reserve < 0:
+            raise ValueError(
+                f'ratio and reserve must be non-negative. Got {ratio} and '
+                f'{reserve}.',
+            )
+        self.ratio = ratio
+        self.reserve = reserve
+        self.max_tokens = 2 * reserve
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available."""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Earn the tokens of a request."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """Spend a token on an extra request.
+
+        Returns:
+            If a token was available.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+default_budget = RetryBudget()
+"""Retry budget shared by policies not given their own."""
+
+
+class LatencyTracker:
+    """Sliding window of request latencies.
+
+    Args:
+        window: Number of most recent latencies kept.
+    """
+
+    def __init__(self, window: int = HEDGE_WINDOW) -> None:
+        self._samples: collections.deque[float] = collections.deque(
+            maxlen=window,
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a request."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """Get a percentile of the recorded latencies.
+
+        Args:
+            q: Percentile in `[0, 1]`.
+
+        Returns:
+            Latency in seconds or `None` if no latency was recorded.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) == 0:
+            return None
+        index = min(int(q * len(samples)), len(samples) - 1)
+        return samples[index]
+
+
+class HedgePolicy:
+    """Hedge and retry reads.
+
+    A policy is thread-safe and meant to be shared by all reads against the
+    same kind of target so the hedging delay reflects their latencies.
+
+    Args:
+        percentile: Latency percentile in `(0, 1]` after which a read is
+            hedged. E.g., `0.95` hedges the 5% slowest reads.
+        max_attempts: Maximum number of requests per read, including the
+            first request, hedges and retries. `1` disables hedging and
+            retries.
+        timeout: Seconds a request may wait for the server (passed to the
+            request), or `None` to wait forever.
+        initial_delay: Seconds before hedging a read until
+            [`HEDGE_MIN_SAMPLES`][proxystore.utils.hedging.HEDGE_MIN_SAMPLES]
+            latencies are recorded.
+        budget: Budget of hedges and retries. Defaults to the
+            [`default_budget`][proxystore.utils.hedging.default_budget]
+            shared by all policies.
+        window: Number of recent latencies the hedging delay is computed
+            from.
+
+    Raises:
+        ValueError: If `percentile` or `max_attempts` is out of range.
+    """
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        max_attempts: int = HEDGE_MAX_ATTEMPTS,
+        timeout: float | None = None,
+        initial_delay: float = HEDGE_INITIAL_DELAY,
+        budget: RetryBudget | None = None,
+        window: int = HEDGE_WINDOW,
+    ) -> None:
+        if not 0 < percentile <= 1:
+            raise ValueError(
+                f'percentile must be in (0, 1]. Got {percentile}.',
+            )
+        if max_attempts < 1:
+            raise ValueError(
+                f'max_attempts must be at least 1. Got {max_attempts}.',
+            )
+        self.percentile = percentile
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.budget = default_budget if budget is None else budget
+        self.latency = LatencyTracker(window)
+        self._counts: collections.Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _submit(self, fn: Callable[[], T]) -> Future[T]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix='hedge',
+                )
+            return self._executor.submit(fn)
+
+    def close(self) -> None:
+        """Shut down the threads of the policy.
+
+        Requests in flight are not interrupted.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def delay(self) -> float:
+        """Seconds after which a read is hedged."""
+        if len(self.latency) < HEDGE_MIN_SAMPLES:
+            return self.initial_delay
+        delay = self.latency.percentile(self.percentile)
+        assert delay is not None
+        return delay
+
+    def stats(self) -> dict[str, Any]:
+        """Get the counts of reads and extra requests.
+
+        Returns:
+            Dictionary with the number of `reads`, `hedges` and `retries`
+            sent, `hedge_wins` (reads answered by an extra request), hedges
+            and retries `denied` by the budget, the current hedging `delay`
+            in seconds, and the `budget_tokens` available.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'reads': counts.get('reads', 0),
+            'hedges': counts.get('hedges', 0),
+            'retries': counts.get('retries', 0),
+            'hedge_wins': counts.get('hedge_wins', 0),
+            'denied': counts.get('denied', 0),
+            'delay': self.delay(),
+            'budget_tokens': self.budget.tokens,
+        }
+
+    def run(self, request: Callable[[int], T]) -> T:
+        """Run a read with hedging and retries.
+
+        `request(attempt)` sends one request and returns its result.
+        `attempt` counts from zero so requests can be sent to a different
+        server or replica per attempt (e.g., `servers[attempt % n]`).
+        Requests run in the policy's thread pool. If the first request has
+        not finished after
+        [`delay()`][proxystore.utils.hedging.HedgePolicy.delay] seconds, a
+        hedged request is sent, and the first successful result is returned.
+        A request that fails with a transient error (see
+        [`is_transient()`][proxystore.utils.hedging.is_transient]) is
+        retried if no other request is in flight. Every hedge and retry
+        needs a token of the budget.
+
+        Requests that lose are cancelled if they have not started, and
+        their results are discarded otherwise.
+
+        Raises:
+            Exception: The error of the last failed request if no request
+                succeeds, or the first error that is not transient.
+        """
+        self._count('reads')
+        self.budget.deposit()
+        if self.max_attempts == 1:
+            return request(0)
+
+        def _timed(attempt: int) -> tuple[int, float, T]:
+            start = time.perf_counter()
+            result = request(attempt)
+            return attempt, time.perf_counter() - start, result
+
+        attempts = 1
+        pending = {self._submit(functools.partial(_timed, 0))}
+        error: BaseException | None = None
+        try:
+            while True:
+                done, pending = wait(
+                    pending,
+                    timeout=(
+                        self.delay() if attempts < self.max_attempts else None
+                    ),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    try:
+                        attempt, seconds, result = future.result()
+                    except Exception as e:
+                        if not is_transient(e):
+                            raise
+                        error = e
+                        continue
+                    self.latency.record(seconds)
+                    if attempt > 0:
+                        self._count('hedge_wins')
+                    return result
+
+                if attempts >= self.max_attempts:
+                    if len(pending) == 0:
+                        assert error is not None
+                        raise error
+                    continue
+                if len(done) == 0:
+                    kind = 'hedges'
+                elif len(pending) == 0:
+                    kind = 'retries'
+                else:
+                    # A request failed but another is still in flight.
+                    continue
+                if not self.budget.withdraw():
+                    self._count('denied')
+                    if len(pending) == 0:
+                        assert error is not None
+                        raise error
+                    # Wait for the requests in flight without hedging.
+                    attempts = self.max_attempts
+                    continue
+                self._count(kind)
+                pending.add(self._submit(functools.partial(_timed, attempts)))
+                attempts += 1
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,544 @@
+"""Local stand-in for the CDN gateway used in unit tests.
+
+The [`CDNGateway`][testing.cdn.CDNGateway] implements the subset of the
+metadata server and storage node HTTP API used by
+[`Client`][proxystore.cdn.client.Client] with in-memory storage. A single
+HTTP server plays the role of both the gateway and all storage nodes;
+storage node routes are of the form `<host>:<port>/nodes/<i>/<key>`.
+Object and fragment downloads support single byte `Range` requests.
+
+`POST /storage/<user>/batch` looks up or evicts many objects with one
+request. The JSON body holds the `op` and the `keys`:
+
+* `exists` returns `{"exists": [...]}` with a boolean per key.
+* `get` returns `{"objects": [...]}` with, per key, the dispersal metadata
+  of objects put with client-side dispersal, `{"key": ..., "size": ...}`
+  for other objects, or `null` if the object does not exist.
+* `evict` deletes the objects and returns `{"evicted": [...]}` with a
+  boolean per key.
+
+Objects stored through the gateway are indexed by the hash of their
+content (as sent by the client) per user and catalog so that identical
+content can be shared between keys (see
+[`Client.put_dedup()`][proxystore.cdn.client.Client.put_dedup]):
+
+* `GET /storage/<user>/<catalog>/hash/<hash>` returns the `key` of an
+  object with the content and the number of keys (`refs`) sharing it, or
+  HTTP 404.
+* `POST /storage/<user>/<catalog>/<key>/alias` with the JSON body
+  `{"target": <key>}` stores the key as a reference to the content of the
+  target (HTTP 404 if the target does not exist). Evicting a key drops
+  only that reference; the content is kept until no key references it.
+
+Resumable uploads (see
+[`Client.put_resumable()`][proxystore.cdn.client.Client.put_resumable]) use
+the `/uploads` routes:
+
+* `POST /uploads/<user>/<catalog>/<key>` starts an upload of the object
+  described by the JSON body and returns its `upload_id`.
+* `PUT /uploads/<user>/<upload_id>/<index>` stores a part whose CRC32 is
+  sent in the `X-Checksum-CRC32` header (HTTP 400 if it does not match).
+* `GET /uploads/<user>/<upload_id>` returns the checksums of the stored
+  parts.
+* `POST /uploads/<user>/<upload_id>/commit` joins the parts into the
+  object (HTTP 409 if a part is missing, 422 if the hash does not match).
+* `DELETE /uploads/<user>/<upload_id>` aborts the upload.
+"""
+from __future__ import annotations
+
+import email.parser
+import email.policy
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Generator
+
+import pytest
+
+from testing.utils import open_port
+
+
+class CDNGateway:
+    """In-memory CDN gateway and storage nodes.
+
+    Attributes:
+        address: `host:port` of the gateway.
+        objects: Objects put through the gateway keyed by `(user, key)`.
+        metadata: Metadata registered for client-side dispersal keyed by
+            `(user, key)`.
+        fragments: Fragments uploaded to storage nodes keyed by
+            `(node, key)`.
+        failed_nodes: Storage node indices that respond with HTTP 503.
+        slow_nodes: Seconds storage nodes wait before answering a
+            fragment download keyed by node index.
+        requests: Count of requests handled per `(method, first path part)`.
+        ignore_ranges: Answer `Range` requests with the whole object, as a
+            server without range support.
+        uploads: Resumable uploads in progress keyed by upload ID.
+        failed_parts: Number of times the upload of a part index fails with
+            HTTP 503 before it succeeds.
+        corrupt_parts: Number of times a part index is corrupted in transit
+            (so its checksum does not match) before it is stored intact.
+        failed_gets: Number of object downloads that fail with HTTP 503
+            before downloads succeed.
+        hashes: Keys referencing each stored content keyed by
+            `(user, catalog, hash)`.
+        digests: `(catalog, hash)` of the content of a key keyed by
+            `(user, key)`.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int | None = None):
+        port = open_port() if port is None else port
+        self.address = f'{host}:{port}'
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.metadata: dict[tuple[str, str], dict[str, Any]] = {}
+        self.fragments: dict[tuple[int, str], bytes] = {}
+        self.failed_nodes: set[int] = set()
+        self.slow_nodes: dict[int, float] = {}
+        self.requests: dict[tuple[str, str], int] = {}
+        self.ignore_ranges = False
+        self.uploads: dict[str, dict[str, Any]] = {}
+        self.failed_parts: dict[int, int] = {}
+        self.corrupt_parts: dict[int, int] = {}
+        self.failed_gets = 0
+        self.hashes: dict[tuple[str, str, str], set[str]] = {}
+        self.digests: dict[tuple[str, str], tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+        gateway = self
+
+        class _Handler(_GatewayHandler):
+            server_gateway = gateway
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.01},
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def count(self, method: str, prefix: str) -> int:
+        """Number of handled requests with the method and path prefix."""
+        return self.requests.get((method, prefix), 0)
+
+    def store(
+        self,
+        user: str,
+        catalog: str,
+        key: str,
+        data: bytes,
+        digest: str | None = None,
+    ) -> None:
+        """Store an object, replacing the previous object of the key.
+
+        Args:
+            user: User the object belongs to.
+            catalog: Catalog of the object.
+            key: Key of the object.
+            data: Content of the object. References to the same content
+                share the `bytes` object.
+            digest: Hash of the content, if known, used to share the
+                content with other keys.
+        """
+        with self._lock:
+            self._drop(user, key)
+            self.objects[(user, key)] = data
+            if digest is not None:
+                self.digests[(user, key)] = (catalog, digest)
+                self.hashes.setdefault((user, catalog, digest), set()).add(key)
+
+    def evict(self, user: str, key: str) -> bool:
+        """Drop a key and its reference to its content.
+
+        Returns:
+            If the key had an object.
+        """
+        with self._lock:
+            return self._drop(user, key)
+
+    def _drop(self, user: str, key: str) -> bool:
+        found = self.objects.pop((user, key), None) is not None
+        found |= self.metadata.pop((user, key), None) is not None
+        content = self.digests.pop((user, key), None)
+        if content is not None:
+            catalog, digest = content
+            keys = self.hashes[(user, catalog, digest)]
+            keys.discard(key)
+            if len(keys) == 0:
+                del self.hashes[(user, catalog, digest)]
+        return found
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    server_gateway: CDNGateway
+    protocol_version = 'HTTP/1.1'
+    # Headers and bodies are written separately so avoid delayed ACK stalls
+    # on keep-alive connections.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    @property
+    def gateway(self) -> CDNGateway:
+        return self.server_gateway
+
+    def _parse(self) -> tuple[list[str], dict[str, str]]:
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(p) for p in url.path.split('/') if p]
+        query = dict(urllib.parse.parse_qsl(url.query))
+        prefix = parts[0] if parts else ''
+        with self.gateway._lock:
+            key = (self.command, prefix)
+            self.gateway.requests[key] = self.gateway.requests.get(key, 0) + 1
+        return parts, query
+
+    def _body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            data = bytearray()
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(data)
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes | dict[str, Any] = b'',
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+            headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_data(self, data: bytes) -> None:
+        # Serves a single byte range if requested (e.g., bytes=10-19).
+        header = self.headers.get('Range')
+        if (
+            header is None
+            or not header.startswith('bytes=')
+            or self.gateway.ignore_ranges
+        ):
+            self._send(200, data)
+            return
+        first, _, last = header[len('bytes=') :].partition('-')
+        start = int(first) if first else max(len(data) - int(last), 0)
+        end = int(last) if first and last else len(data) - 1
+        end = min(end, len(data) - 1)
+        if start > end:
+            self._send(
+                416,
+                b'Range not satisfiable',
+                {'Content-Range': f'bytes */{len(data)}'},
+            )
+            return
+        self._send(
+            206,
+            data[start : end + 1],
+            {'Content-Range': f'bytes {start}-{end}/{len(data)}'},
+        )
+
+    def _multipart(self, body: bytes) -> tuple[dict[str, Any], bytes]:
+        header = f'Content-Type: {self.headers["Content-Type"]}\r\n\r\n'
+        message = email.parser.BytesParser(
+            policy=email.policy.HTTP,
+        ).parsebytes(header.encode() + body)
+        payload: dict[str, Any] = {}
+        data = b''
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            content = part.get_payload(decode=True)
+            if name == 'json':
+                payload = json.loads(content)
+            elif name == 'data':
+                data = content
+        return payload, data
+
+    def do_GET(self) -> None:  # noqa: N802
+        parts, query = self._parse()
+        gateway = self.gateway
+        if parts[:1] == ['storage'] and parts[3:4] == ['hash']:
+            # /storage/<user>/<catalog>/hash/<hash>
+            keys = gateway.hashes.get((parts[1], parts[2], parts[4]))
+            if keys:
+                self._send(200, {'key': min(keys), 'refs': len(keys)})
+            else:
+                self._send(404, b'Not found')
+        elif parts[:1] == ['storage'] and len(parts) == 4:
+            # /storage/<user>/<key>/exists
+            exists = (parts[1], parts[2]) in gateway.objects
+            self._send(200, {'exists': exists})
+        elif parts[:1] == ['storage'] and len(parts) == 3:
+            data = gateway.objects.get((parts[1], parts[2]))
+            with gateway._lock:
+                failed = gateway.failed_gets > 0
+                gateway.failed_gets = max(gateway.failed_gets - 1, 0)
+            if failed:
+                self._send(503, b'Unavailable')
+            elif data is None:
+                self._send(404, b'Not found')
+            else:
+                self._send_data(data)
+        elif parts == ['api', 'files', 'pull']:
+            metadata = gateway.metadata.get(
+                (query['tokenuser'], query['key']),
+            )
+            if metadata is None:
+                self._send(404, b'Not found')
+            else:
+                self._send(200, metadata)
+        elif parts[:1] == ['uploads'] and len(parts) == 3:
+            upload = gateway.uploads.get(parts[2])
+            if upload is None or upload['user'] != parts[1]:
+                self._send(404, b'Not found')
+            else:
+                self._send(
+                    200,
+                    {
+                        **upload['payload'],
+                        'upload_id': parts[2],
+                        'parts': {
+                            str(index): f'{zlib.crc32(part):08x}'
+                            for index, part in upload['parts'].items()
+                        },
+                    },
+                )
+        elif parts[:1] == ['nodes']:
+            node, key = int(parts[1]), parts[2]
+            data = gateway.fragments.get((node, key))
+            time.sleep(gateway.slow_nodes.get(node, 0))
+            if node in gateway.failed_nodes:
+                self._send(503, b'Unavailable')
+            elif data is None:
+                self._send(404, b'Not found')
+            else:
+                self._send_data(data)
+        else:
+            self._send(200, b'')
+
+    def do_PUT(self) -> None:  # noqa: N802
+        parts, _ = self._parse()
+        body = self._body()
+        if parts[:1] == ['drex']:
+            parts = parts[1:]
+        if parts[:1] == ['storage'] and len(parts) == 4:
+            payload, data = self._multipart(body)
+            self.gateway.store(
+                parts[1],
+                parts[2],
+                parts[3],
+                data,
+                payload.get('hash'),
+            )
+            self._send(
+                201,
+                {
+                    'key': payload.get('key', parts[3]),
+                    'total_time': 0,
+                    'time_upload': 0,
+                    'chunking_time': 0,
+                },
+            )
+        elif parts[:1] == ['uploads'] and len(parts) == 4:
+            self._put_part(parts[1], parts[2], int(parts[3]), body)
+        else:
+            self._send(404, b'Not found')
+
+    def _put_part(
+        self,
+        user: str,
+        upload_id: str,
+        index: int,
+        body: bytes,
+    ) -> None:
+        gateway = self.gateway
+        upload = gateway.uploads.get(upload_id)
+        if upload is None or upload['user'] != user:
+            self._send(404, b'Not found')
+            return
+        with gateway._lock:
+            failures = gateway.failed_parts.get(index, 0)
+            gateway.failed_parts[index] = max(failures - 1, 0)
+            corruptions = gateway.corrupt_parts.get(index, 0)
+            gateway.corrupt_parts[index] = max(corruptions - 1, 0)
+        if failures > 0:
+            self._send(503, b'Unavailable')
+            return
+        if corruptions > 0 and len(body) > 0:
+            body = bytes([body[0] ^ 0xFF]) + body[1:]
+        checksum = f'{zlib.crc32(body):08x}'
+        if self.headers.get('X-Checksum-CRC32') != checksum:
+            self._send(400, b'Checksum mismatch')
+            return
+        upload['parts'][index] = body
+        self._send(200, {'index': index, 'checksum': checksum})
+
+    def _commit(self, user: str, upload_id: str) -> None:
+        gateway = self.gateway
+        upload = gateway.uploads.get(upload_id)
+        if upload is None or upload['user'] != user:
+            self._send(404, b'Not found')
+            return
+        payload = upload['payload']
+        if set(upload['parts']) != set(range(payload['parts'])):
+            self._send(409, b'Missing parts')
+            return
+        data = b''.join(
+            upload['parts'][index] for index in range(payload['parts'])
+        )
+        if hashlib.sha3_256(data).hexdigest() != payload['hash']:
+            self._send(422, b'Hash mismatch')
+            return
+        gateway.store(
+            user,
+            payload['catalog'],
+            payload['key'],
+            data,
+            payload['hash'],
+        )
+        del gateway.uploads[upload_id]
+        self._send(
+            201,
+            {'key': payload['key'], 'total_time': 0, 'time_upload': 0},
+        )
+
+    def _alias(
+        self,
+        user: str,
+        catalog: str,
+        key: str,
+        request: dict[str, Any],
+    ) -> None:
+        gateway = self.gateway
+        target = request['target']
+        with gateway._lock:
+            data = gateway.objects.get((user, target))
+            content = gateway.digests.get((user, target))
+        if data is None:
+            self._send(404, b'Not found')
+            return
+        digest = None if content is None else content[1]
+        gateway.store(user, catalog, key, data, digest)
+        refs = len(gateway.hashes.get((user, catalog, str(digest)), {key}))
+        self._send(201, {'key': key, 'target': target, 'refs': refs})
+
+    def _batch(self, user: str, request: dict[str, Any]) -> None:
+        gateway = self.gateway
+        keys = request['keys']
+        if request['op'] == 'exists':
+            self._send(
+                200,
+                {'exists': [(user, key) in gateway.objects for key in keys]},
+            )
+        elif request['op'] == 'get':
+            objects: list[dict[str, Any] | None] = []
+            for key in keys:
+                data = gateway.objects.get((user, key))
+                if (user, key) in gateway.metadata:
+                    objects.append(gateway.metadata[(user, key)])
+                elif data is not None:
+                    objects.append({'key': key, 'size': len(data)})
+                else:
+                    objects.append(None)
+            self._send(200, {'objects': objects})
+        elif request['op'] == 'evict':
+            evicted = [gateway.evict(user, key) for key in keys]
+            self._send(200, {'evicted': evicted})
+        else:
+            self._send(400, b'Unknown batch operation')
+
+    def do_POST(self) -> None:  # noqa: N802
+        parts, query = self._parse()
+        body = self._body()
+        gateway = self.gateway
+        if parts[:1] == ['storage'] and parts[2:] == ['batch']:
+            self._batch(parts[1], json.loads(body))
+        elif parts[:1] == ['storage'] and parts[4:] == ['alias']:
+            self._alias(parts[1], parts[2], parts[3], json.loads(body))
+        elif parts == ['api', 'files', 'push']:
+            key, user = query['key'], query['tokenuser']
+            chunks = int(query['chunks'])
+            metadata = {
+                'key': key,
+                'name': query.get('name'),
+                'size': int(query['size']),
+                'hash': query.get('hash'),
+                'chunks': chunks,
+                'required_chunks': int(query['required_chunks']),
+                'disperse': query.get('disperse'),
+                'nodes': [
+                    {'route': f'{gateway.address}/nodes/{i}/{key}'}
+                    for i in range(chunks)
+                ],
+            }
+            gateway.metadata[(user, key)] = metadata
+            self._send(201, metadata)
+        elif parts[:1] == ['uploads'] and parts[3:] == ['commit']:
+            self._commit(parts[1], parts[2])
+        elif parts[:1] == ['uploads'] and len(parts) == 4:
+            payload = json.loads(body)
+            upload_id = str(uuid.uuid4())
+            gateway.uploads[upload_id] = {
+                'user': parts[1],
+                'payload': {**payload, 'catalog': parts[2], 'key': parts[3]},
+                'parts': {},
+            }
+            self._send(201, {'upload_id': upload_id})
+        elif parts[:1] == ['nodes']:
+            node, key = int(parts[1]), parts[2]
+            if node in gateway.failed_nodes:
+                self._send(503, b'Unavailable')
+            else:
+                gateway.fragments[(node, key)] = body
+                self._send(201, b'')
+        else:
+            self._send(404, b'Not found')
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        parts, _ = self._parse()
+        if parts[:1] == ['storage'] and len(parts) == 3:
+            self.gateway.evict(parts[1], parts[2])
+            self._send(200, b'')
+        elif parts[:1] == ['uploads'] and len(parts) == 3:
+            self.gateway.uploads.pop(parts[2], None)
+            self._send(200, b'')
+        else:
+            self._send(404, b'Not found')
+
+
+@pytest.fixture()
+def cdn_gateway() -> Generator[CDNGateway, None, None]:
+    """Run a local stand-in CDN gateway."""
+    gateway = CDNGateway()
+    gateway.start()
+    yield gateway
+    gateway.stop()
@@ -0,0 +1,274 @@
+"""Erasure Coding Throughput Test.
+
+Measures the cost of dispersing and restoring objects on the client apart
+from any network time. For each payload size, `(n, m)` pair, codec and
+number of workers the test reports:
+
+* encode MB/s: `disperse_bytes()` into `n` fragments.
+* decode MB/s: `restore_bytes()` from the first `m` fragments (for the
+  systematic codec these are the data fragments so no decoding is needed).
+* degraded decode MB/s: `restore_bytes()` from the last `m` fragments, as
+  when the first `n - m` storage nodes are unavailable.
+* peak RSS of the process running the configuration.
+
+Both directions include the SHA-224 digest of the payload, as in
+`Client.put_chunks()` and `Client.get_chunks()`.
+
+Example:
+    ```bash
+    python codec.py --payload-sizes 1000 1000000 1000000000 \
+        --nm 5:3 10:8 --codecs IDA IDA_SYSTEMATIC GF256 --workers 1 4 \
+        --csv-file results_csv/codec.csv
+    ```
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import logging
+import resource
+import statistics
+import sys
+import time
+from typing import NamedTuple
+from typing import Sequence
+
+from psargparse import add_logging_options
+from pscsv import CSVLogger
+from pslogging import init_logging
+from pslogging import TESTING_LOG_LEVEL
+from utils import randbytes
+
+from proxystore.cdn.reliability.ida import disperse_bytes
+from proxystore.cdn.reliability.ida import restore_bytes
+
+CODECS = ('IDA', 'IDA_SYSTEMATIC', 'GF256')
+
+logger = logging.getLogger('codec')
+
+
+class CodecStats(NamedTuple):
+    """Stats for a given codec configuration."""
+
+    codec: str
+    payload_size_bytes: int
+    n: int
+    m: int
+    workers: int
+    repeat: int
+    encode_time_ms: float
+    decode_time_ms: float
+    degraded_decode_time_ms: float
+    encode_mbps: float
+    decode_mbps: float
+    degraded_decode_mbps: float
+    peak_rss_mb: float
+
+
+def peak_rss_mb() -> float:
+    """Get the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def _mbps(payload_size: int, time_ms: float) -> float:
+    return payload_size / 1e6 / (time_ms / 1e3) if time_ms > 0 else 0.0
+
+
+def run(
+    codec: str,
+    payload_size: int,
+    n: int,
+    m: int,
+    workers: int = 1,
+    repeat: int = 3,
+) -> CodecStats:
+    """Run test for a single configuration and measure performance.
+
+    Args:
+        codec (str): dispersal mode passed to `disperse_bytes()`.
+        payload_size (int): bytes to disperse.
+        n (int): number of fragments.
+        m (int): number of fragments required to restore the payload.
+        workers (int): encode/decode threads.
+        repeat (int): number of times to repeat each operation. If repeat is
+            greater than or equal to three, the slowest and fastest times
+            will be dropped.
+
+    Returns:
+        CodecStats with summary of test run.
+    """
+    data = randbytes(payload_size)
+    encode_ms: list[float] = []
+    decode_ms: list[float] = []
+    degraded_ms: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fragments = disperse_bytes(data, n, m, codec, workers=workers)
+        encode_ms.append((time.perf_counter_ns() - start) / 1e6)
+
+        start = time.perf_counter_ns()
+        restored = restore_bytes(fragments[:m], workers=workers)
+        decode_ms.append((time.perf_counter_ns() - start) / 1e6)
+        assert len(restored) == payload_size
+        del restored
+
+        start = time.perf_counter_ns()
+        restored = restore_bytes(fragments[n - m :], workers=workers)
+        degraded_ms.append((time.perf_counter_ns() - start) / 1e6)
+        assert len(restored) == payload_size
+        del restored, fragments
+
+    def _avg(times_ms: list[float]) -> float:
+        if len(times_ms) >= 3:
+            times_ms = sorted(times_ms)[1:-1]
+        return statistics.mean(times_ms)
+
+    encode, decode, degraded = map(_avg, (encode_ms, decode_ms, degraded_ms))
+    return CodecStats(
+        codec=codec,
+        payload_size_bytes=payload_size,
+        n=n,
+        m=m,
+        workers=workers,
+        repeat=repeat,
+        encode_time_ms=encode,
+        decode_time_ms=decode,
+        degraded_decode_time_ms=degraded,
+        encode_mbps=_mbps(payload_size, encode),
+        decode_mbps=_mbps(payload_size, decode),
+        degraded_decode_mbps=_mbps(payload_size, degraded),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def runner(
+    codecs: list[str],
+    *,
+    payload_sizes: list[int],
+    nm_pairs: list[tuple[int, int]],
+    workers: list[int],
+    repeat: int,
+    isolate: bool = True,
+    csv_file: str | None = None,
+) -> None:
+    """Run matrix of test configurations.
+
+    Args:
+        codecs (str): dispersal modes to test.
+        payload_sizes (int): bytes to disperse.
+        nm_pairs (tuple): `(n, m)` pairs to test.
+        workers (int): encode/decode threads to test.
+        repeat (int): number of times to repeat operations.
+        isolate (bool): run each configuration in a new process so the peak
+            RSS is per configuration.
+        csv_file (str): optional csv filepath to log results to.
+    """
+    if csv_file is not None:
+        csv_logger = CSVLogger(csv_file, CodecStats)
+
+    for payload_size in payload_sizes:
+        for n, m in nm_pairs:
+            for codec in codecs:
+                for worker_count in workers:
+                    args = (codec, payload_size, n, m, worker_count, repeat)
+                    if isolate:
+                        with concurrent.futures.ProcessPoolExecutor(
+                            max_workers=1,
+                        ) as executor:
+                            run_stats = executor.submit(run, *args).result()
+                    else:
+                        run_stats = run(*args)
+
+                    logger.log(TESTING_LOG_LEVEL, run_stats)
+                    if csv_file is not None:
+                        csv_logger.log(run_stats)
+
+    if csv_file is not None:
+        csv_logger.close()
+        logger.log(TESTING_LOG_LEVEL, f'results logged to {csv_file}')
+
+
+def _nm_pair(value: str) -> tuple[int, int]:
+    n, _, m = value.partition(':')
+    try:
+        pair = (int(n), int(m))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'Expected N:M (e.g., 5:3). Got {value}.',
+        ) from None
+    if not 0 < pair[1] <= pair[0]:
+        raise argparse.ArgumentTypeError(f'Expected 0 < M <= N. Got {value}.')
+    return pair
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Erasure coding throughput test entrypoint."""
+    argv = argv if argv is not None else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description='Erasure coding throughput test.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        '--codecs',
+        choices=CODECS,
+        nargs='+',
+        default=list(CODECS),
+        help='Dispersal modes to measure',
+    )
+    parser.add_argument(
+        '--payload-sizes',
+        type=int,
+        nargs='+',
+        default=[1_000, 1_000_000, 100_000_000],
+        help='Payload sizes in bytes',
+    )
+    parser.add_argument(
+        '--nm',
+        type=_nm_pair,
+        nargs='+',
+        default=[(5, 3)],
+        metavar='N:M',
+        help='Number of fragments and fragments required to restore',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=[1],
+        help='Encode/decode threads',
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Number of times to repeat operations',
+    )
+    parser.add_argument(
+        '--no-isolate',
+        action='store_true',
+        help='Run all configurations in this process (peak RSS is cumulative)',
+    )
+    add_logging_options(parser)
+    args = parser.parse_args(argv)
+
+    init_logging(args.log_file, args.log_level, force=True)
+
+    runner(
+        args.codecs,
+        payload_sizes=args.payload_sizes,
+        nm_pairs=args.nm,
+        workers=args.workers,
+        repeat=args.repeat,
+        isolate=not args.no_isolate,
+        csv_file=args.csv_file,
+    )
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,2 @@
+"""ProxyStore CDN Tests."""
+from __future__ import annotations
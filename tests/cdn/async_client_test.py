@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from unittest import mock
+
+import aiohttp
+import pytest
+
+from proxystore.cdn.async_client import AsyncClient
+from testing.cdn import CDNGateway
+
+
+def test_invalid_limit() -> None:
+    with pytest.raises(ValueError, match='limit'):
+        AsyncClient('localhost:1234', limit=0)
+
+
+@pytest.mark.asyncio()
+async def test_put_get_exists_evict(cdn_gateway: CDNGateway) -> None:
+    data = os.urandom(10_000)
+    async with AsyncClient(cdn_gateway.address) as client:
+        metrics = await client.put(data, 'user', 'catalog', key='key')
+        assert 'upload_time' in metrics
+        assert cdn_gateway.objects[('user', 'key')] == data
+
+        assert await client.exists('key', 'user')
+        assert await client.get('key', 'user') == data
+
+        await client.evict('key', 'user')
+        assert not await client.exists('key', 'user')
+        with pytest.raises(aiohttp.ClientResponseError, match='404'):
+            await client.get('key', 'user')
+
+
+@pytest.mark.asyncio()
+async def test_batch(cdn_gateway: CDNGateway) -> None:
+    objs = [os.urandom(100) for _ in range(20)]
+    keys = [str(i) for i in range(len(objs))]
+    async with AsyncClient(cdn_gateway.address, limit=4) as client:
+        metrics = await client.put_batch(objs, 'user', 'catalog', keys=keys)
+        assert len(metrics) == len(objs)
+        assert await client.exists_batch(keys, 'user') == [True] * len(keys)
+        assert await client.get_batch([*keys, 'missing'], 'user') == [
+            *objs,
+            None,
+        ]
+        await client.evict_batch(keys, 'user')
+        assert await client.exists_batch(keys, 'user') == [False] * len(keys)
+        # One metadata request per batch lookup or eviction.
+        assert cdn_gateway.count('POST', 'storage') == 4
+        assert cdn_gateway.count('GET', 'storage') == len(keys)
+        assert await client.exists_batch([], 'user') == []
+
+        with pytest.raises(ValueError, match='keys'):
+            await client.put_batch(objs, 'user', 'catalog', keys=keys[:1])
+
+
+@pytest.mark.asyncio()
+async def test_get_batch_evicted_after_lookup(cdn_gateway: CDNGateway) -> None:
+    async with AsyncClient(cdn_gateway.address) as client:
+        await client.put(b'data', 'user', 'catalog', key='key')
+        # The object is evicted after the metadata lookup found it.
+        entries = [{'key': 'key', 'size': 4}, {'key': 'gone', 'size': 4}]
+        with mock.patch.object(
+            client,
+            'metadata_batch',
+            mock.AsyncMock(return_value=entries),
+        ):
+            assert await client.get_batch(['key', 'gone'], 'user') == [
+                b'data',
+                None,
+            ]
+
+
+@pytest.mark.asyncio()
+async def test_close_reopens(cdn_gateway: CDNGateway) -> None:
+    client = AsyncClient(cdn_gateway.address)
+    assert not await client.exists('key', 'user')
+    await client.close()
+    assert not await client.exists('key', 'user')
+    await client.close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from proxystore.cdn.balancer import GatewayBalancer
+from proxystore.cdn.balancer import probe_gateway
+from testing.cdn import CDNGateway
+from testing.utils import open_port
+
+
+def test_no_gateways() -> None:
+    with pytest.raises(ValueError, match='gateway'):
+        GatewayBalancer([])
+
+
+def test_choose_least_loaded() -> None:
+    balancer = GatewayBalancer(['a', 'b'])
+    with balancer.track('a'):
+        time.sleep(0.01)
+    with balancer.track('b'):
+        pass
+    for _ in range(10):
+        assert balancer.choose() == 'b'
+    assert balancer.choose(exclude=['b']) == 'a'
+    with pytest.raises(ValueError, match='excluded'):
+        balancer.choose(exclude=['a', 'b'])
+
+    stats = balancer.stats()
+    assert stats['a']['requests'] == stats['b']['requests'] == 1
+    assert stats['a']['latency'] > stats['b']['latency']
+
+
+def test_choose_counts_in_flight() -> None:
+    balancer = GatewayBalancer(['a', 'b'])
+    for gateway in ('a', 'b'):
+        with balancer.track(gateway):
+            pass
+    entered, release = threading.Event(), threading.Event()
+
+    def _request() -> None:
+        with balancer.track('b'):
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=_request)
+    thread.start()
+    entered.wait()
+    try:
+        assert balancer.stats()['b']['in_flight'] == 1
+        balancer._states['a'].latency = balancer._states['b'].latency
+        assert balancer.choose() == 'a'
+    finally:
+        release.set()
+        thread.join()
+    assert balancer.stats()['b']['in_flight'] == 0
+
+
+def test_failures_mark_unhealthy() -> None:
+    balancer = GatewayBalancer(['a', 'b'])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        with balancer.track('a'):
+            raise requests.exceptions.ConnectionError()
+    # Other errors are answers from the gateway.
+    with pytest.raises(requests.exceptions.HTTPError):
+        with balancer.track('b'):
+            raise requests.exceptions.HTTPError()
+
+    stats = balancer.stats()
+    assert not stats['a']['healthy']
+    assert stats['a']['failures'] == 1
+    assert stats['b']['healthy']
+    assert all(balancer.choose() == 'b' for _ in range(10))
+    # Unhealthy gateways are used if no healthy gateway is left.
+    assert balancer.choose(exclude=['b']) == 'a'
+
+
+def test_health_checks(cdn_gateway: CDNGateway) -> None:
+    dead = f'localhost:{open_port()}'
+    with requests.Session() as session:
+        assert probe_gateway(session, cdn_gateway.address)
+        assert not probe_gateway(session, dead, timeout=0.5)
+
+        healthy = {cdn_gateway.address: False, dead: True}
+        balancer = GatewayBalancer(
+            [cdn_gateway.address, dead],
+            probe=lambda gateway: probe_gateway(session, gateway, 0.5),
+            health_interval=0.01,
+        )
+        try:
+            for gateway, state in healthy.items():
+                balancer._states[gateway].healthy = state
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                stats = balancer.stats()
+                healthy = stats[cdn_gateway.address]['healthy']
+                if healthy and not stats[dead]['healthy']:
+                    break
+                time.sleep(0.01)
+            else:
+                pytest.fail('Health check did not update the gateways.')
+        finally:
+            balancer.close()
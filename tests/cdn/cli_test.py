@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import uuid
+
+import click.testing
+
+from proxystore.cdn.cli import cli
+from proxystore.cdn.client import Client
+from testing.cdn import CDNGateway
+
+
+def test_repair_command(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    keys = [str(uuid.uuid4()) for _ in range(2)]
+    for key in keys:
+        client.put_chunks(
+            key=key,
+            data_hash='hash',
+            name='name',
+            data=os.urandom(1000),
+            token_user='user',
+            catalog='catalog',
+            chunks=5,
+            required_chunks=3,
+        )
+    expected = {key: cdn_gateway.fragments.pop((2, key)) for key in keys}
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            'repair',
+            '--gateway',
+            cdn_gateway.address,
+            '--token',
+            'user',
+            '--index',
+            '2',
+            *keys,
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    for key in keys:
+        assert cdn_gateway.fragments[(2, key)] == expected[key]
+
+
+def test_repair_command_failure(cdn_gateway: CDNGateway) -> None:
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            'repair',
+            '--gateway',
+            cdn_gateway.address,
+            '--token',
+            'user',
+            '--index',
+            '0',
+            'missing-key',
+        ],
+    )
+    assert result.exit_code == 1
+
+
+def test_repair_command_bad_index(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    key = str(uuid.uuid4())
+    client.put_chunks(
+        key=key,
+        data_hash='hash',
+        name='name',
+        data=os.urandom(1000),
+        token_user='user',
+        catalog='catalog',
+        chunks=5,
+        required_chunks=3,
+    )
+
+    runner = click.testing.CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            'repair',
+            '--gateway',
+            cdn_gateway.address,
+            '--token',
+            'user',
+            '--index',
+            '7',
+            key,
+        ],
+    )
+
+    assert result.exit_code == click.BadParameter.exit_code
+    assert '--index' in result.output
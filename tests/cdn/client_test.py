@@ -0,0 +1,664 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import threading
+import time
+import uuid
+from unittest import mock
+
+import pytest
+import requests
+
+import proxystore.cdn.client as client_module
+from proxystore.cdn.client import Client
+from proxystore.cdn.client import ResumableUploadError
+from proxystore.utils.hedging import HedgePolicy
+from proxystore.utils.hedging import RetryBudget
+from testing.cdn import CDNGateway
+
+
+def _put_chunks(client: Client, data: bytes, disperse: str, n=5, m=3) -> str:
+    key = str(uuid.uuid4())
+    client.put_chunks(
+        key=key,
+        data_hash='hash',
+        name='name',
+        data=data,
+        token_user='user',
+        catalog='catalog',
+        chunks=n,
+        required_chunks=m,
+        disperse=disperse,
+    )
+    return key
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+def test_put_get_chunks(cdn_gateway: CDNGateway, disperse: str) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, disperse)
+
+    assert len([k for k in cdn_gateway.fragments if k[1] == key]) == 5
+    assert client.get_chunks(key, 'user') == data
+
+
+def test_get_chunks_systematic_reads_data_fragments(
+    cdn_gateway: CDNGateway,
+) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA_SYSTEMATIC')
+
+    before = cdn_gateway.count('GET', 'nodes')
+    assert client.get_chunks(key, 'user', extra_requests=0) == data
+    assert cdn_gateway.count('GET', 'nodes') - before == 3
+
+
+def test_get_chunks_degraded(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA_SYSTEMATIC')
+
+    cdn_gateway.failed_nodes.update({0, 2})
+    assert client.get_chunks(key, 'user') == data
+
+    cdn_gateway.failed_nodes.add(3)
+    with pytest.raises(requests.exceptions.RequestException, match='Only 2'):
+        client.get_chunks(key, 'user')
+
+
+def test_get_chunks_cancels_stragglers(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA')
+
+    cdn_gateway.slow_nodes[1] = 1.0
+    start = time.perf_counter()
+    assert client.get_chunks(key, 'user') == data
+    assert time.perf_counter() - start < 0.8
+
+    # The straggler records its latency once the node answers.
+    slow = f'{cdn_gateway.address}/nodes/1'
+    while slow not in client.node_latency:
+        time.sleep(0.05)
+    assert client.node_latency[slow] >= 1.0
+    assert len(client.node_latency) == 5
+
+
+def test_get_chunks_prefers_fast_nodes(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA_SYSTEMATIC')
+    for i in range(5):
+        client.record_latency(f'{cdn_gateway.address}/nodes/{i}', 0.01)
+    client.record_latency(f'{cdn_gateway.address}/nodes/0', 10.0)
+
+    cdn_gateway.slow_nodes[0] = 1.0
+    start = time.perf_counter()
+    assert client.get_chunks(key, 'user', extra_requests=0) == data
+    assert time.perf_counter() - start < 0.8
+
+
+def test_get_chunks_extra_requests_replace_failures(
+    cdn_gateway: CDNGateway,
+) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'GF256')
+
+    cdn_gateway.failed_nodes.update({0, 1})
+    assert client.get_chunks(key, 'user', extra_requests=1) == data
+    assert cdn_gateway.count('GET', 'nodes') == 5
+    failed = client.node_latency[f'{cdn_gateway.address}/nodes/0']
+    assert failed >= 1.0
+
+
+def test_record_latency_moving_average() -> None:
+    client = Client('localhost:0')
+    client.record_latency('node', 1.0)
+    assert client.node_latency['node'] == 1.0
+    client.record_latency('node', 2.0)
+    assert 1.0 < client.node_latency['node'] < 2.0
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+def test_repair_chunks(cdn_gateway: CDNGateway, disperse: str) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, disperse)
+
+    # Node 1 is replaced by an empty node.
+    expected = cdn_gateway.fragments.pop((1, key))
+    reads = cdn_gateway.count('GET', 'nodes')
+    writes = cdn_gateway.count('POST', 'nodes')
+
+    assert client.repair_chunks(key, [1], 'user') == [1]
+    assert cdn_gateway.fragments[(1, key)] == expected
+    assert cdn_gateway.count('GET', 'nodes') - reads == 3
+    assert cdn_gateway.count('POST', 'nodes') - writes == 1
+
+
+def test_repair_chunks_not_enough_fragments(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    key = _put_chunks(client, os.urandom(1000), 'IDA')
+
+    cdn_gateway.failed_nodes.update({0, 1})
+    with pytest.raises(requests.exceptions.RequestException, match='repair'):
+        client.repair_chunks(key, [2], 'user')
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+def test_get_range(cdn_gateway: CDNGateway, disperse: str) -> None:
+    client = Client(cdn_gateway.address)
+    # Ends in zero bytes which must not be stripped.
+    data = os.urandom(10_000) + bytes(7)
+    key = _put_chunks(client, data, disperse)
+
+    for offset, length in ((0, 16), (1234, 1), (3330, 20), (0, len(data))):
+        assert (
+            client.get_range(key, offset, length, 'user')
+            == data[offset : offset + length]
+        )
+    assert client.get_range(key, len(data) - 3, 100, 'user') == bytes(3)
+    assert client.get_range(key, len(data), 10, 'user') == b''
+
+    cdn_gateway.failed_nodes.update({0, 3})
+    assert client.get_range(key, 3330, 20, 'user') == data[3330:3350]
+
+    with pytest.raises(ValueError, match='outside'):
+        client.get_range(key, len(data) + 1, 1, 'user')
+
+
+def test_get_range_reads_only_needed_bytes(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(30_000)
+    key = _put_chunks(client, data, 'IDA_SYSTEMATIC')
+
+    before = cdn_gateway.count('GET', 'nodes')
+    # The range is within data fragment 1 so only one node is read.
+    assert client.get_range(key, 12_000, 100, 'user') == data[12_000:12_100]
+    assert cdn_gateway.count('GET', 'nodes') - before == 1
+
+
+def test_client_reuses_connections(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address, pool_maxsize=4, metadata_cache_size=0)
+    data = os.urandom(100)
+    for _ in range(5):
+        key = str(uuid.uuid4())
+        client.put(data, 'user', 'catalog', key=key)
+        assert client.exists(key, 'user')
+        client.evict(key, 'user')
+
+    stats = client.pool_stats()
+    assert stats['requests'] == 15
+    assert stats['connections_opened'] == 1
+    client.close()
+
+
+def test_put_file(cdn_gateway: CDNGateway, tmp_path: pathlib.Path) -> None:
+    client = Client(cdn_gateway.address)
+    path = tmp_path / 'file'
+    data = os.urandom(100_000)
+    path.write_bytes(data)
+
+    metrics = client.put_file(
+        str(path),
+        'user',
+        'catalog',
+        key='key',
+        block_size=4096,
+    )
+    assert 'hash_time' in metrics
+    assert cdn_gateway.objects[('user', 'key')] == data
+    assert client.get('key', 'user') == data
+
+
+def test_get_single(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(10_000)
+    cdn_gateway.objects[('user', 'key')] = data
+
+    assert client.get('key', 'user') == data
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get('missing', 'user')
+
+
+def test_get_into_buffer(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(10_000)
+    cdn_gateway.objects[('user', 'key')] = data
+
+    buffer = bytearray(len(data) + 10)
+    assert client.get_into('key', memoryview(buffer), 'user', block_size=999)
+    assert buffer[: len(data)] == data
+
+    with pytest.raises(ValueError, match='too small'):
+        client.get_into('key', bytearray(10), 'user')
+
+
+def test_get_to_file(cdn_gateway: CDNGateway, tmp_path: pathlib.Path) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(10_000)
+    cdn_gateway.objects[('user', 'key')] = data
+
+    path = tmp_path / 'file'
+    assert client.get_to_file('key', str(path), 'user', block_size=999) == len(
+        data,
+    )
+    assert path.read_bytes() == data
+
+    missing = tmp_path / 'missing'
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get_to_file('missing', str(missing), 'user')
+    assert not missing.exists()
+
+
+def test_put_chunks_registers_while_encoding(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    encoded = threading.Event()
+    register = client.regist_on_metadata
+    iter_fragments = client_module.iter_fragments
+
+    def _register(*args, **kwargs):
+        # Only returns if the first fragment is encoded meanwhile.
+        assert encoded.wait(timeout=5)
+        return register(*args, **kwargs)
+
+    def _iter_fragments(*args, **kwargs):
+        for fragment in iter_fragments(*args, **kwargs):
+            encoded.set()
+            yield fragment
+
+    data = os.urandom(10_000)
+    with mock.patch.object(
+        client,
+        'regist_on_metadata',
+        side_effect=_register,
+    ), mock.patch.object(
+        client_module,
+        'iter_fragments',
+        side_effect=_iter_fragments,
+    ):
+        key = _put_chunks(client, data, 'IDA')
+    assert client.get_chunks(key, 'user') == data
+
+
+def test_put_chunks_registration_fails(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    response = requests.Response()
+    response.status_code = 500
+    response._content = b'error'
+    with mock.patch.object(
+        client,
+        'regist_on_metadata',
+        return_value=response,
+    ), mock.patch.object(client, 'upload_to_storage_node') as upload:
+        with pytest.raises(requests.exceptions.RequestException, match='500'):
+            _put_chunks(client, os.urandom(1000), 'IDA')
+    assert upload.call_count < 5
+
+
+def test_put_chunks_no_fragments(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    with mock.patch.object(
+        client_module,
+        'iter_fragments',
+        return_value=iter(()),
+    ), mock.patch.object(client, 'upload_to_storage_node') as upload:
+        times = client.put_chunks(
+            key=str(uuid.uuid4()),
+            data_hash='hash',
+            name='name',
+            data=b'',
+            token_user='user',
+            catalog='catalog',
+        )
+    upload.assert_not_called()
+    assert times['data_upload_time'] >= 0
+
+
+@pytest.mark.parametrize('size', (0, 1, 999, 1000, 10_001))
+def test_get_ranges(cdn_gateway: CDNGateway, size: int) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(size)
+    cdn_gateway.objects[('user', 'key')] = data
+
+    result = client.get('key', 'user', connections=4, range_size=1000)
+    assert isinstance(result, bytearray)
+    assert result == data
+    assert cdn_gateway.count('GET', 'storage') == max(1, -(-size // 1000))
+
+    buffer = bytearray(size)
+    assert (
+        client.get_into(
+            'key',
+            buffer,
+            'user',
+            connections=4,
+            range_size=1000,
+        )
+        == size
+    )
+    assert buffer == data
+
+
+def test_get_ranges_to_file(
+    cdn_gateway: CDNGateway,
+    tmp_path: pathlib.Path,
+) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(10_000)
+    cdn_gateway.objects[('user', 'key')] = data
+
+    path = tmp_path / 'file'
+    assert client.get_to_file(
+        'key',
+        str(path),
+        'user',
+        connections=3,
+        range_size=999,
+    ) == len(data)
+    assert path.read_bytes() == data
+
+
+def test_get_ranges_errors(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    cdn_gateway.objects[('user', 'key')] = b'x' * 100
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get('missing', 'user', connections=2)
+    with pytest.raises(ValueError, match='too small'):
+        client.get_into('key', bytearray(10), 'user', connections=2)
+    with pytest.raises(ValueError, match='at least 1'):
+        client.get('key', 'user', connections=2, range_size=0)
+
+
+def test_get_ranges_not_supported(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(10_000)
+    cdn_gateway.objects[('user', 'key')] = data
+    cdn_gateway.ignore_ranges = True
+
+    assert client.get('key', 'user', connections=4, range_size=1000) == data
+    assert cdn_gateway.count('GET', 'storage') == 1
+
+
+def test_metadata_cache_exists(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    assert not client.exists('key', 'user')
+    assert not client.exists('key', 'user')
+    assert cdn_gateway.count('GET', 'storage') == 1
+    # Recently missing objects fail without a request.
+    with pytest.raises(requests.exceptions.RequestException, match='cached'):
+        client.get('key', 'user')
+    assert cdn_gateway.count('GET', 'storage') == 1
+
+    client.put(b'data', 'user', 'catalog', key='key')
+    assert client.exists('key', 'user')
+    assert client.get('key', 'user') == b'data'
+    assert cdn_gateway.count('GET', 'storage') == 2
+
+    client.evict('key', 'user')
+    assert not client.exists('key', 'user')
+    assert cdn_gateway.count('GET', 'storage') == 3
+
+
+def test_metadata_cache_dispersed(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA')
+    for _ in range(3):
+        assert client.get_chunks(key, 'user') == data
+    assert cdn_gateway.count('GET', 'api') == 1
+    assert client.metadata_cache.stats()['hits'] >= 2
+
+    # Putting the object again drops its cached metadata.
+    client.put_chunks(
+        key=key,
+        data_hash='hash',
+        name='name',
+        data=data[::-1],
+        token_user='user',
+        catalog='catalog',
+        chunks=5,
+        required_chunks=3,
+        disperse='GF256',
+    )
+    assert client.get_chunks(key, 'user') == data[::-1]
+    assert cdn_gateway.count('GET', 'api') == 2
+
+
+def test_batch(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address, metadata_cache_size=0)
+    objs = [os.urandom(100) for _ in range(20)]
+    keys = [str(i) for i in range(len(objs))]
+
+    assert len(client.put_batch(objs, 'user', 'catalog', keys=keys)) == 20
+    exists = client.exists_batch([*keys, 'missing'], 'user')
+    assert exists == [True] * 20 + [False]
+    assert cdn_gateway.count('POST', 'storage') == 1
+
+    assert client.get_batch([*keys, 'missing'], 'user') == [*objs, None]
+    assert cdn_gateway.count('POST', 'storage') == 2
+    assert cdn_gateway.count('GET', 'storage') == 20
+
+    client.evict_batch(keys[:10], 'user')
+    assert cdn_gateway.count('POST', 'storage') == 3
+    assert cdn_gateway.count('DELETE', 'storage') == 0
+    assert client.exists_batch(keys, 'user') == [False] * 10 + [True] * 10
+
+    client.evict_batch([], 'user')
+    assert client.exists_batch([], 'user') == []
+    assert cdn_gateway.count('POST', 'storage') == 4
+
+    with pytest.raises(ValueError, match='keys'):
+        client.put_batch(objs, 'user', 'catalog', keys=keys[:1])
+
+
+def test_batch_uses_metadata_cache(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    keys = [str(i) for i in range(10)]
+    client.put_batch([b'x'] * 10, 'user', 'catalog', keys=keys)
+
+    assert client.exists_batch(keys, 'user') == [True] * 10
+    assert cdn_gateway.count('POST', 'storage') == 0
+
+    assert client.get_batch(['missing', 'missing'], 'user') == [None, None]
+    assert client.get_batch(['missing'], 'user') == [None]
+    assert cdn_gateway.count('POST', 'storage') == 1
+    assert cdn_gateway.count('GET', 'storage') == 0
+
+
+def test_metadata_batch(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    key = _put_chunks(client, data, 'IDA')
+    client.metadata_cache.clear()
+    cdn_gateway.objects[('user', 'plain')] = b'abc'
+
+    entries = client.metadata_batch([key, 'plain', 'missing'], 'user')
+    assert entries[0] == cdn_gateway.metadata[('user', key)]
+    assert entries[1:] == [{'key': 'plain', 'size': 3}, None]
+    assert cdn_gateway.count('POST', 'storage') == 1
+
+    # The dispersal metadata is cached so the fragments are fetched without
+    # pulling the metadata again.
+    assert client.get_chunks(key, 'user') == data
+    assert cdn_gateway.count('GET', 'api') == 0
+
+
+def test_put_dedup(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    key, metrics = client.put_dedup(b'data', 'user', 'catalog')
+    assert not metrics['deduplicated']
+    alias, metrics = client.put_dedup(b'data', 'user', 'catalog')
+    assert alias != key
+    assert metrics['deduplicated']
+    assert cdn_gateway.count('PUT', 'storage') == 1
+    # Only the first put looks up the hash. The content index answers
+    # the second.
+    assert cdn_gateway.count('GET', 'storage') == 1
+    assert client.get(alias, 'user') == b'data'
+
+    # Evicting either key leaves the content of the other.
+    client.evict(key, 'user')
+    assert client.get(alias, 'user') == b'data'
+    again, metrics = client.put_dedup(b'data', 'user', 'catalog')
+    assert metrics['deduplicated']
+    client.evict(alias, 'user')
+    assert client.get(again, 'user') == b'data'
+    assert cdn_gateway.count('PUT', 'storage') == 1
+
+    # Other catalogs are not shared.
+    other, metrics = client.put_dedup(b'data', 'user', 'other')
+    assert not metrics['deduplicated']
+
+    # Content is freed once no key references it.
+    client.evict(again, 'user')
+    new, metrics = client.put_dedup(b'data', 'user', 'catalog')
+    assert not metrics['deduplicated']
+    assert cdn_gateway.count('PUT', 'storage') == 3
+    assert client.get(new, 'user') == b'data'
+
+
+def test_put_dedup_other_client(cdn_gateway: CDNGateway) -> None:
+    other = Client(cdn_gateway.address)
+    key, _ = other.put_dedup(b'data', 'user', 'cat', key='a')
+    client = Client(cdn_gateway.address)
+    alias, metrics = client.put_dedup(b'data', 'user', 'cat', key='b')
+    assert alias == 'b'
+    assert metrics['deduplicated']
+    assert cdn_gateway.count('PUT', 'storage') == 1
+    digest = hashlib.sha3_256(b'data').hexdigest()
+    assert cdn_gateway.hashes[('user', 'cat', digest)] == {key, alias}
+
+    # The probed key is cached, and a stale entry falls back to a probe.
+    client.put_dedup(b'data', 'user', 'cat')
+    assert cdn_gateway.count('GET', 'storage') == 2
+    cdn_gateway.evict('user', key)
+    _, metrics = client.put_dedup(b'data', 'user', 'cat')
+    assert metrics['deduplicated']
+    assert cdn_gateway.count('GET', 'storage') == 3
+
+
+def test_put_dedup_overwritten_key(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    key, _ = client.put_dedup(b'data', 'user', 'catalog')
+    client.put(b'other', 'user', 'catalog', key=key)
+    new, metrics = client.put_dedup(b'data', 'user', 'catalog')
+    assert new != key
+    assert not metrics['deduplicated']
+    assert client.get(new, 'user') == b'data'
+
+
+@pytest.mark.parametrize(('size', 'workers'), ((0, 1), (1000, 1), (1000, 4)))
+def test_put_resumable(
+    cdn_gateway: CDNGateway,
+    size: int,
+    workers: int,
+) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(size)
+    metrics = client.put_resumable(
+        data,
+        'user',
+        'catalog',
+        key='key',
+        part_size=300,
+        max_workers=workers,
+    )
+    assert metrics['parts'] == max(-(-size // 300), 1)
+    assert metrics['resumed_parts'] == metrics['retries'] == 0
+    assert cdn_gateway.objects[('user', 'key')] == data
+    assert cdn_gateway.uploads == {}
+    assert client.get('key', 'user') == data
+
+
+def test_put_resumable_retries_parts(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    cdn_gateway.failed_parts[1] = 2
+    cdn_gateway.corrupt_parts[3] = 1
+    with mock.patch.object(client_module, 'UPLOAD_RETRY_BACKOFF', 0):
+        metrics = client.put_resumable(
+            data,
+            'user',
+            'catalog',
+            key='key',
+            part_size=300,
+        )
+    assert metrics['retries'] == 3
+    # Only the failed parts were sent again.
+    assert cdn_gateway.count('PUT', 'uploads') == 4 + 3
+    assert cdn_gateway.objects[('user', 'key')] == data
+
+
+def test_put_resumable_resume(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    data = os.urandom(1000)
+    cdn_gateway.failed_parts[2] = 10
+    with mock.patch.object(client_module, 'UPLOAD_RETRY_BACKOFF', 0):
+        with pytest.raises(ResumableUploadError) as exc_info:
+            client.put_resumable(
+                data,
+                'user',
+                'catalog',
+                key='key',
+                part_size=300,
+                retries=1,
+            )
+    upload_id = exc_info.value.upload_id
+    assert ('user', 'key') not in cdn_gateway.objects
+    status = client.upload_status(upload_id, 'user')
+    # Parts are sent in order by a single worker.
+    assert set(status['parts']) == {'0', '1'}
+
+    cdn_gateway.failed_parts.clear()
+    with pytest.raises(ValueError, match='bytes'):
+        client.put_resumable(data[:10], 'user', 'catalog', upload_id=upload_id)
+    metrics = client.put_resumable(
+        data,
+        'user',
+        'catalog',
+        upload_id=upload_id,
+    )
+    assert metrics['resumed_parts'] == 2
+    assert cdn_gateway.objects[('user', 'key')] == data
+
+
+def test_put_resumable_abort(cdn_gateway: CDNGateway) -> None:
+    client = Client(cdn_gateway.address)
+    cdn_gateway.failed_parts[0] = 1
+    with pytest.raises(ResumableUploadError) as exc_info:
+        client.put_resumable(b'data', 'user', 'catalog', retries=0)
+    client.abort_upload(exc_info.value.upload_id, 'user')
+    assert cdn_gateway.uploads == {}
+    with pytest.raises(requests.exceptions.RequestException):
+        client.upload_status(exc_info.value.upload_id, 'user')
+    with pytest.raises(requests.exceptions.RequestException):
+        client.put_resumable(
+            b'data',
+            'user',
+            'catalog',
+            upload_id=exc_info.value.upload_id,
+        )
+
+
+def test_get_hedged(cdn_gateway: CDNGateway) -> None:
+    hedge = HedgePolicy(max_attempts=3, timeout=5, budget=RetryBudget())
+    client = Client(cdn_gateway.address, hedge=hedge)
+    client.put(b'data', 'user', 'catalog', key='key')
+
+    cdn_gateway.failed_gets = 2
+    assert client.get('key', 'user') == b'data'
+    assert hedge.stats()['retries'] == 2
+
+    cdn_gateway.failed_gets = 3
+    with pytest.raises(requests.exceptions.RequestException, match='503'):
+        client.get('key', 'user')
+    with pytest.raises(client_module.ObjectNotFoundError):
+        client.get('missing', 'user')
+    hedge.close()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from proxystore.cdn import compression
+from proxystore.cdn.compression import available_codecs
+from proxystore.cdn.compression import choose_codec
+from proxystore.cdn.compression import Codec
+from proxystore.cdn.compression import compress
+from proxystore.cdn.compression import decompress
+from proxystore.cdn.compression import get_codec
+from proxystore.cdn.compression import register_codec
+from proxystore.cdn.compression import sample
+
+
+@pytest.mark.parametrize('codec', available_codecs())
+def test_round_trip(codec: str) -> None:
+    data = b'proxystore' * 1000
+    name, stored, metrics = compress(data, [codec])
+    assert name == codec
+    assert len(stored) < len(data)
+    assert metrics['saved_bytes'] == len(data) - len(stored)
+    assert metrics['compression_time'] >= 0
+    assert decompress(stored, name) == data
+
+
+def test_incompressible() -> None:
+    data = os.urandom(10_000)
+    name, stored, metrics = compress(data, available_codecs())
+    assert name is None
+    assert stored is data
+    assert metrics['saved_bytes'] == 0
+    assert decompress(stored, None) is data
+
+
+def test_choose_codec_best_ratio(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(compression, '_codecs', dict(compression._codecs))
+    register_codec(Codec('test-copy', bytes, bytes))
+    assert 'test-copy' in available_codecs()
+    data = b'\x00' * 1000
+    assert choose_codec(data, ['test-copy']) is None
+    assert choose_codec(data, ['test-copy', 'zlib']) == 'zlib'
+    assert choose_codec(b'', ['zlib']) is None
+
+
+def test_sample() -> None:
+    data = bytes(range(256)) * 100
+    assert sample(data, len(data)) == data
+    part = sample(data, 1000)
+    assert len(part) == 1000
+    # Slices are taken from the start and the end of the object.
+    assert part[:250] == data[:250]
+    assert part[-250:] == data[-250:]
+
+
+def test_unknown_codec() -> None:
+    with pytest.raises(ValueError, match='Unknown compression codec'):
+        get_codec('missing')
+    with pytest.raises(ValueError, match='Unknown compression codec'):
+        compress(b'data', ['missing'])
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import pathlib
+
+import pytest
+import requests
+
+from proxystore.cdn.download import content_length
+from proxystore.cdn.download import OffsetWriter
+from proxystore.cdn.download import parse_content_range
+from proxystore.cdn.download import read_body
+from proxystore.cdn.download import read_body_into
+
+
+def _response(
+    data: bytes,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(data)
+    response.headers.update(
+        {'Content-Length': str(len(data))} if headers is None else headers,
+    )
+    return response
+
+
+def test_content_length() -> None:
+    assert content_length(_response(b'abc')) == 3
+    assert content_length(_response(b'abc', {})) is None
+    headers = {'Content-Length': '3', 'Content-Encoding': 'gzip'}
+    assert content_length(_response(b'abc', headers)) is None
+
+
+def test_read_body() -> None:
+    assert read_body(_response(b'abc')) == b'abc'
+    assert read_body(_response(b'abc', {})) == b'abc'
+
+
+def test_read_body_incomplete() -> None:
+    response = _response(b'abc', {'Content-Length': '10'})
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        read_body(response)
+    response = _response(b'abc', {'Content-Length': '10'})
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        read_body_into(response, bytearray(10))
+
+
+@pytest.mark.parametrize('headers', (None, {}))
+def test_read_body_into_buffer(headers: dict[str, str] | None) -> None:
+    data = bytes(range(256)) * 10
+    buffer = bytearray(len(data))
+    response = _response(data, headers)
+    assert read_body_into(response, buffer, block_size=100) == len(data)
+    assert buffer == data
+
+
+@pytest.mark.parametrize('headers', (None, {}))
+def test_read_body_into_file(headers: dict[str, str] | None) -> None:
+    data = bytes(range(256)) * 10
+    file = io.BytesIO()
+    response = _response(data, headers)
+    assert read_body_into(response, file, block_size=100) == len(data)
+    assert file.getvalue() == data
+
+
+@pytest.mark.parametrize('headers', (None, {}))
+def test_read_body_into_small_buffer(headers: dict[str, str] | None) -> None:
+    with pytest.raises(ValueError, match='too small'):
+        read_body_into(_response(b'abcdef', headers), bytearray(3))
+
+
+def test_parse_content_range() -> None:
+    assert parse_content_range('bytes 0-99/1000') == (0, 100, 1000)
+    assert parse_content_range('bytes */1000') == (0, 0, 1000)
+    for header in ('bytes 0-99/*', 'items 0-1/2', ''):
+        with pytest.raises(ValueError, match='Content-Range'):
+            parse_content_range(header)
+
+
+def test_offset_writer(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'file'
+    with open(path, 'wb') as f:
+        f.truncate(6)
+        second = OffsetWriter(f.fileno(), 3)
+        first = OffsetWriter(f.fileno())
+        assert second.write(b'def') == 3
+        assert first.write(memoryview(b'abc')) == 3
+        assert first.offset == 3
+    assert path.read_bytes() == b'abcdef'
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+from proxystore.cdn.metadata_cache import ContentIndex
+from proxystore.cdn.metadata_cache import MetadataCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_invalid_ttl() -> None:
+    with pytest.raises(ValueError, match='time-to-live'):
+        MetadataCache(ttl=-1)
+    with pytest.raises(ValueError, match='size'):
+        MetadataCache(maxsize=-1)
+
+
+def test_positive_and_negative_ttl() -> None:
+    clock = _Clock()
+    cache = MetadataCache(ttl=10, negative_ttl=1, clock=clock)
+    assert cache.exists('user', 'a') is None
+
+    cache.set_exists('user', 'a', True)
+    cache.set_exists('user', 'b', False)
+    assert cache.exists('user', 'a') is True
+    assert cache.exists('user', 'b') is False
+
+    clock.now = 1
+    assert cache.exists('user', 'a') is True
+    assert cache.exists('user', 'b') is None
+
+    clock.now = 10
+    assert cache.exists('user', 'a') is None
+    assert cache.stats() == {'hits': 3, 'misses': 3, 'size': 0}
+
+
+def test_metadata() -> None:
+    cache = MetadataCache()
+    cache.set_metadata('user', 'a', {'nodes': []})
+    assert cache.exists('user', 'a') is True
+    assert cache.metadata('user', 'a') == {'nodes': []}
+    assert cache.metadata('other', 'a') is None
+
+    # Replacing the object drops its metadata.
+    cache.set_exists('user', 'a', True)
+    assert cache.metadata('user', 'a') is None
+
+    cache.invalidate('user', 'a')
+    assert cache.exists('user', 'a') is None
+
+
+def test_size_bound() -> None:
+    cache = MetadataCache(maxsize=2)
+    for key in 'abc':
+        cache.set_exists('user', key, True)
+    assert cache.exists('user', 'a') is None
+    assert cache.exists('user', 'c') is True
+
+    # A hit makes the entry most recently used.
+    assert cache.exists('user', 'b') is True
+    cache.set_exists('user', 'd', True)
+    assert cache.exists('user', 'c') is None
+    assert cache.exists('user', 'b') is True
+    cache.clear()
+    assert cache.stats()['size'] == 0
+
+
+def test_disabled() -> None:
+    cache = MetadataCache(maxsize=0)
+    cache.set_exists('user', 'a', True)
+    assert cache.exists('user', 'a') is None
+
+    cache = MetadataCache(negative_ttl=0)
+    cache.set_exists('user', 'a', False)
+    assert cache.exists('user', 'a') is None
+
+
+def test_content_index() -> None:
+    index = ContentIndex()
+    index.add('user', 'catalog', 'hash', 'a')
+    assert index.get('user', 'catalog', 'hash') == 'a'
+    assert index.get('user', 'other', 'hash') is None
+    assert index.get('other', 'catalog', 'hash') is None
+
+    # Overwriting the key drops the hash of its previous content.
+    index.add('user', 'catalog', 'new', 'a')
+    assert index.get('user', 'catalog', 'hash') is None
+    assert index.get('user', 'catalog', 'new') == 'a'
+
+    index.add('user', 'catalog', 'new', 'b')
+    index.discard('user', 'a')
+    assert index.get('user', 'catalog', 'new') == 'b'
+    index.discard('user', 'b')
+    assert index.get('user', 'catalog', 'new') is None
+
+
+def test_content_index_size_bound() -> None:
+    index = ContentIndex(maxsize=2)
+    for key in 'abc':
+        index.add('user', 'catalog', f'hash-{key}', key)
+    assert index.get('user', 'catalog', 'hash-a') is None
+    assert index.get('user', 'catalog', 'hash-c') == 'c'
+
+    index = ContentIndex(maxsize=0)
+    index.add('user', 'catalog', 'hash', 'a')
+    assert index.get('user', 'catalog', 'hash') is None
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from proxystore.cdn.pool import create_session
+from proxystore.cdn.pool import map_bounded
+from proxystore.cdn.pool import pool_stats
+from testing.cdn import CDNGateway
+
+
+def test_create_session_pool_size() -> None:
+    with create_session(pool_connections=2, pool_maxsize=3) as session:
+        adapter = session.get_adapter('http://localhost')
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 3
+        assert session.get_adapter('https://localhost') is not adapter
+
+
+def test_pool_stats_empty() -> None:
+    with create_session() as session:
+        assert pool_stats(session) == {
+            'hosts': 0,
+            'requests': 0,
+            'connections_opened': 0,
+            'idle_connections': 0,
+            'reuse_ratio': 0.0,
+        }
+
+
+def test_pool_stats_reuse(cdn_gateway: CDNGateway) -> None:
+    with create_session() as session:
+        for _ in range(10):
+            response = session.get(
+                f'http://{cdn_gateway.address}/storage/user/key/exists',
+            )
+            assert response.ok
+
+        stats = pool_stats(session)
+        assert stats['hosts'] == 1
+        assert stats['requests'] == 10
+        assert stats['connections_opened'] == 1
+        assert stats['idle_connections'] == 1
+        assert stats['reuse_ratio'] == 0.9
+
+
+def test_pool_stats_default_session() -> None:
+    # Sessions without explicitly sized pools are supported too.
+    with requests.Session() as session:
+        assert pool_stats(session)['hosts'] == 0
+
+
+def test_map_bounded() -> None:
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _square(x: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return x * x
+
+    assert map_bounded(_square, range(20), max_workers=4) == [
+        x * x for x in range(20)
+    ]
+    assert 1 < peak <= 4
+    assert map_bounded(_square, [3], max_workers=4) == [9]
+
+    with pytest.raises(ValueError, match='max_workers'):
+        map_bounded(_square, [1], max_workers=0)
+
+
+def test_map_bounded_raises_first_error() -> None:
+    def _fail(x: int) -> int:
+        if x == 3:
+            raise RuntimeError('failed')
+        return x
+
+    with pytest.raises(RuntimeError, match='failed'):
+        map_bounded(_fail, range(10), max_workers=2)
@@ -0,0 +1,2 @@
+"""Reliability Tests."""
+from __future__ import annotations
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pathlib
+
+import numpy
+import pytest
+
+from proxystore.cdn.reliability.fragment_handler import ContentError
+from proxystore.cdn.reliability.fragment_handler import dumps_fragment
+from proxystore.cdn.reliability.fragment_handler import Fragment
+from proxystore.cdn.reliability.fragment_handler import FRAGMENT_HEADER
+from proxystore.cdn.reliability.fragment_handler import fragment_reader
+from proxystore.cdn.reliability.fragment_handler import fragment_writer
+from proxystore.cdn.reliability.fragment_handler import loads_fragment
+from proxystore.cdn.reliability.ida import disperse_bytes
+from proxystore.cdn.reliability.ida import restore_bytes
+
+
+@pytest.mark.parametrize(
+    ('disperse', 'itemsize'),
+    (('IDA', 2), ('IDA_SYSTEMATIC', 2), ('GF256', 1)),
+)
+def test_dumps_loads(disperse: str, itemsize: int) -> None:
+    data = os.urandom(1000) + b'\0\0\0'
+    fragments = disperse_bytes(data, 5, 3, disperse)
+
+    serialized = [dumps_fragment(f) for f in fragments]
+    stripes = len(fragments[0].content)
+    assert all(
+        len(s) == FRAGMENT_HEADER.size + stripes * itemsize for s in serialized
+    )
+
+    loaded = [loads_fragment(memoryview(s)) for s in serialized]
+    for original, fragment in zip(fragments, loaded):
+        assert fragment.idx == original.idx
+        assert (fragment.m, fragment.n, fragment.p) == (3, 5, original.p)
+        assert fragment.systematic == (disperse == 'IDA_SYSTEMATIC')
+        assert fragment.length == len(data)
+        assert numpy.array_equal(fragment.content, original.content)
+        # Content is a view of the serialized buffer
+        assert not fragment.content.flags.writeable
+
+    # Trailing zero bytes are restored exactly
+    assert restore_bytes(loaded[2:]).tobytes() == data
+
+
+def test_loads_from_mmap(tmp_path: pathlib.Path) -> None:
+    fragment = disperse_bytes(b'hello', 2, 1)[1]
+    path = tmp_path / 'fragment'
+    path.write_bytes(dumps_fragment(fragment))
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            loaded = loads_fragment(buffer)
+            assert restore_bytes([loaded]).tobytes() == b'hello'
+            del loaded
+
+
+def test_loads_errors() -> None:
+    serialized = bytearray(dumps_fragment(disperse_bytes(b'data', 2, 1)[0]))
+
+    with pytest.raises(ValueError, match='too small'):
+        loads_fragment(serialized[:10])
+    with pytest.raises(ValueError, match='version 1'):
+        loads_fragment(b'XXXX' + serialized[4:])
+    with pytest.raises(ValueError, match='truncated'):
+        loads_fragment(serialized[:-1])
+
+    serialized[-1] ^= 0xFF
+    with pytest.raises(ContentError):
+        loads_fragment(serialized)
+    loads_fragment(serialized, verify=False)
+
+
+def test_dumps_requires_length() -> None:
+    with pytest.raises(ValueError, match='length and digest'):
+        dumps_fragment(Fragment(0, numpy.zeros(1), 257, 1, 1))
+
+
+def test_restore_errors() -> None:
+    a = disperse_bytes(b'first', 3, 2)
+    b = disperse_bytes(b'other', 3, 2)
+
+    with pytest.raises(ValueError, match='No fragments'):
+        restore_bytes([])
+    with pytest.raises(ValueError, match='not derived from the same'):
+        restore_bytes([a[0], b[1]])
+    with pytest.raises(ValueError, match='insufficient'):
+        restore_bytes([a[0], a[0]])
+
+    a[1].digest = b'\0' * 28
+    a[0].digest = b'\0' * 28
+    with pytest.raises(ContentError):
+        restore_bytes(a[:2])
+
+
+def test_fragment_files(tmp_path: pathlib.Path) -> None:
+    data = os.urandom(100)
+    fragments = disperse_bytes(data, 4, 2, 'GF256')
+
+    filenames = fragment_writer(str(tmp_path / 'data.bin'), fragments)
+    assert len(filenames) == 4
+
+    restored = restore_bytes(fragment_reader(filenames[1:3]))
+    assert restored.tobytes() == data
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+
+import numpy
+import pytest
+
+from proxystore.cdn.reliability import gf256
+
+
+def test_tables() -> None:
+    for a in range(1, 256):
+        assert gf256.mul(a, gf256.inverse(a)) == 1
+        assert gf256.mul(a, 1) == a
+        assert gf256.mul(a, 0) == 0
+    # Carry-less multiplication reduced by 0x11d
+    assert gf256.mul(0x80, 2) == 0x1D
+    assert gf256.MUL_TABLE[0x53, 0xCA] == gf256.mul(0x53, 0xCA)
+
+    with pytest.raises(ZeroDivisionError):
+        gf256.inverse(0)
+
+
+def test_matrix_inverse() -> None:
+    matrix = gf256.build_building_blocks(4, 10)
+    rows = [matrix[i] for i in (9, 1, 5, 3)]
+    inverse = gf256.matrix_inverse(rows)
+
+    for i in range(4):
+        for j in range(4):
+            value = 0
+            for k in range(4):
+                value ^= gf256.mul(inverse[i][k], rows[k][j])
+            assert value == int(i == j)
+
+    with pytest.raises(ValueError, match='not invertible'):
+        gf256.matrix_inverse([[1, 2], [1, 2]])
+
+
+def test_too_many_fragments() -> None:
+    with pytest.raises(ValueError, match='at most'):
+        gf256.build_building_blocks(2, 257)
+
+
+@pytest.mark.parametrize(('n', 'm'), ((1, 1), (3, 2), (12, 8), (256, 4)))
+@pytest.mark.parametrize('size', (1, 9, 4097))
+def test_encode_decode(n: int, m: int, size: int) -> None:
+    data = os.urandom(size)
+    fragments = gf256.encode(data, n, m)
+
+    assert fragments.dtype == numpy.uint8
+    assert fragments.shape == (n, -(-size // m))
+
+    rng = numpy.random.default_rng(size)
+    indices = rng.choice(n, size=m, replace=False).tolist()
+    out = bytearray(size)
+    gf256.decode(indices, fragments[indices], m, size, out)
+
+    assert out == data
+
+
+def test_encode_decode_errors() -> None:
+    with pytest.raises(ValueError):
+        gf256.encode(b'data', 0, 1)
+    with pytest.raises(ValueError):
+        gf256.encode(b'data', 2, 3)
+
+    fragments = gf256.encode(b'data', 3, 2)
+    with pytest.raises(ValueError, match='minimum number'):
+        gf256.decode([0], fragments[:1], 2)
+    with pytest.raises(ValueError, match='same length'):
+        gf256.decode([0, 1], [fragments[0], fragments[1][:1]], 2)
+    with pytest.raises(ValueError, match='Cannot restore'):
+        gf256.decode([0, 1], fragments[:2], 2, size=5)
+    with pytest.raises(ValueError, match='Output buffer'):
+        gf256.decode([0, 1], fragments[:2], 2, 4, bytearray(1))
+
+
+def test_encode_rows() -> None:
+    data = os.urandom(1001)
+    full = gf256.encode(data, 6, 4)
+    assert numpy.array_equal(
+        gf256.encode(data, 6, 4, rows=[4, 1]),
+        full[[4, 1]],
+    )
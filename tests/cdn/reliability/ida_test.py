@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import pickle
+from unittest import mock
+
+import numpy
+import pytest
+
+from proxystore.cdn.reliability.ida import assemble
+from proxystore.cdn.reliability.ida import assemble_bytes
+from proxystore.cdn.reliability.ida import data_fragment_ranges
+from proxystore.cdn.reliability.ida import decode
+from proxystore.cdn.reliability.ida import decode_systematic
+from proxystore.cdn.reliability.ida import disperse_bytes
+from proxystore.cdn.reliability.ida import encode
+from proxystore.cdn.reliability.ida import encode_systematic
+from proxystore.cdn.reliability.ida import iter_fragments
+from proxystore.cdn.reliability.ida import restore_bytes
+from proxystore.cdn.reliability.ida import restore_range
+from proxystore.cdn.reliability.ida import split
+from proxystore.cdn.reliability.ida import split_bytes
+from proxystore.cdn.reliability.ida import stripe_range
+from proxystore.cdn.reliability.utils import build_building_blocks
+from proxystore.cdn.reliability.utils import ENCODE_BLOCK_STRIPES
+from proxystore.cdn.reliability.utils import inner_product
+from proxystore.cdn.reliability.utils import segment_matrix
+
+
+@pytest.mark.parametrize(('n', 'm'), ((1, 1), (3, 2), (5, 3), (12, 8)))
+@pytest.mark.parametrize('size', (1, 7, 1000))
+def test_encode_matches_inner_product(n: int, m: int, size: int) -> None:
+    data = os.urandom(size)
+    p = 257
+    blocks = build_building_blocks(m, n, p)
+    segments = [list(data[i : i + m]) for i in range(0, size, m)]
+    segments[-1].extend([0] * (m - len(segments[-1])))
+
+    fragments = encode(data, n, m)
+
+    assert fragments.shape == (n, len(segments))
+    for i in range(n):
+        expected = [inner_product(blocks[i], s, p) for s in segments]
+        assert fragments[i].tolist() == expected
+
+
+def test_encode_large_field() -> None:
+    fragments = encode(b'abcdefgh', 300, 2)
+
+    assert fragments.dtype == numpy.uint16
+    assert int(fragments.max()) < 307
+
+
+def test_encode_bad_parameters() -> None:
+    with pytest.raises(ValueError):
+        encode(b'data', -1, 1)
+    with pytest.raises(ValueError):
+        encode(b'data', 2, 3)
+
+
+def test_split_bytes_format() -> None:
+    fragments = split_bytes(b'data', 4, 2)
+
+    assert len(fragments) == 4
+    for i, fragment in enumerate(fragments):
+        assert fragment.idx == i
+        assert (fragment.n, fragment.m, fragment.p) == (4, 2, 257)
+        assert fragment.content.dtype == numpy.int64
+
+
+@pytest.mark.parametrize('obj', (b'hello, world!', os.urandom(10000)))
+def test_split_assemble_roundtrip(obj: bytes) -> None:
+    fragments = split_bytes(obj, 5, 3)
+
+    assert assemble_bytes(fragments[2:]) == obj
+    assert pickle.loads(pickle.dumps(fragments[0])).idx == 0
+
+
+@pytest.mark.parametrize(('n', 'm'), ((1, 1), (4, 2), (12, 8)))
+@pytest.mark.parametrize('size', (1, 8, 999))
+def test_decode_any_subset(n: int, m: int, size: int) -> None:
+    data = os.urandom(size)
+    fragments = encode(data, n, m)
+    rng = numpy.random.default_rng(size)
+    indices = rng.choice(n, size=m, replace=False).tolist()
+
+    restored = decode(indices, [fragments[i] for i in indices], m, 257, size)
+
+    assert restored.tobytes() == data
+
+
+def test_decode_into_buffer() -> None:
+    data = os.urandom(1001)
+    fragments = encode(data, 5, 3)
+    out = bytearray(len(data))
+
+    restored = decode([4, 0, 2], fragments[[4, 0, 2]], 3, 257, len(data), out)
+
+    assert out == data
+    assert restored.base is not None
+
+
+def test_decode_padding_kept_by_default() -> None:
+    fragments = encode(b'abcd', 3, 3)
+
+    assert decode([0, 1, 2], fragments, 3, 257).tobytes() == b'abcd\0\0'
+
+
+def test_decode_bad_inputs() -> None:
+    fragments = encode(b'abcd', 3, 2)
+
+    with pytest.raises(ValueError, match='minimum number'):
+        decode([0], fragments[:1], 2, 257)
+    with pytest.raises(ValueError, match='same length'):
+        decode([0, 1], [fragments[0], fragments[1][:-1]], 2, 257)
+    with pytest.raises(ValueError, match='Cannot restore'):
+        decode([0, 1], fragments[:2], 2, 257, size=5)
+    with pytest.raises(ValueError, match='Output buffer'):
+        decode([0, 1], fragments[:2], 2, 257, size=4, out=bytearray(3))
+
+
+def test_split_assemble_files(tmp_path: pathlib.Path) -> None:
+    filepath = tmp_path / 'data.bin'
+    data = os.urandom(500) + b'x'
+    filepath.write_bytes(data)
+
+    filenames = split(str(filepath), 4, 2)
+    output = tmp_path / 'restored.bin'
+    assemble(filenames[2:], str(output))
+
+    assert output.read_bytes() == data
+
+
+def test_split_assemble_gf256() -> None:
+    obj = os.urandom(1000)
+    fragments = split_bytes(obj, 6, 4, 'GF256')
+
+    assert all(f.content.dtype == numpy.uint8 for f in fragments)
+    assert all(f.p == 256 for f in fragments)
+    assert assemble_bytes(fragments[::-1]) == obj
+
+
+def test_split_bytes_unknown_mode() -> None:
+    with pytest.raises(ValueError, match='Unknown dispersal mode'):
+        split_bytes(b'data', 2, 1, 'XOR')
+
+
+@pytest.mark.parametrize('size', (1, 10, 1001))
+def test_encode_systematic(size: int) -> None:
+    data = os.urandom(size)
+    n, m = 6, 4
+    fragments = encode_systematic(data, n, m)
+    length = -(-size // m)
+
+    assert fragments.shape == (n, length)
+    assert fragments[:m].astype(numpy.uint8).tobytes()[:size] == data
+
+    for indices in ([0, 1, 2, 3], [3, 1, 0, 2], [5, 0, 4, 2], [4, 5, 1, 3]):
+        restored = decode_systematic(
+            indices,
+            fragments[indices],
+            m,
+            257,
+            size,
+        )
+        assert restored.tobytes() == data
+
+
+def test_split_assemble_systematic() -> None:
+    obj = os.urandom(777)
+    fragments = split_bytes(obj, 5, 3, 'IDA_SYSTEMATIC')
+
+    assert all(f.systematic for f in fragments)
+    # Healthy read uses the data fragments regardless of order
+    assert assemble_bytes(fragments[::-1]) == obj
+    # Degraded read
+    assert assemble_bytes([fragments[4], fragments[1], fragments[3]]) == obj
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+def test_parallel_matches_serial(disperse: str) -> None:
+    data = os.urandom(3 * ENCODE_BLOCK_STRIPES * 4 + 11)
+
+    serial = disperse_bytes(data, 6, 4, disperse)
+    parallel = disperse_bytes(data, 6, 4, disperse, workers=3)
+    for a, b in zip(serial, parallel):
+        assert numpy.array_equal(a.content, b.content)
+
+    # Use parity fragments so every mode decodes.
+    subset = [parallel[i] for i in (5, 1, 4, 2)]
+    restored = restore_bytes(subset, workers=3)
+    assert restored.tobytes() == data
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+@pytest.mark.parametrize('size', (1, 1000, 4097))
+def test_restore_range(disperse: str, size: int) -> None:
+    data = os.urandom(size - 1) + b'\x00'
+    fragments = disperse_bytes(data, 5, 3, disperse)
+    systematic = disperse == 'IDA_SYSTEMATIC'
+    p = fragments[0].p
+
+    ranges = [(0, size), (0, 1), (size - 1, 1), (size // 3, size // 2)]
+    for offset, length in ranges:
+        start, end = stripe_range(size, 3, offset, length, systematic)
+        for indices in ((0, 1, 2), (4, 2, 0)):
+            symbols = [fragments[i].content[start:end] for i in indices]
+            restored = restore_range(
+                indices,
+                symbols,
+                3,
+                p,
+                size,
+                offset,
+                length,
+                systematic,
+            )
+            assert restored.tobytes() == data[offset : offset + length]
+
+
+def test_range_helpers() -> None:
+    assert stripe_range(10, 3, 4, 3) == (1, 3)
+    assert stripe_range(10, 3, 4, 0) == (0, 0)
+    # Systematic rows of 4 bytes: [0, 4), [4, 8), [8, 10).
+    assert stripe_range(10, 3, 5, 2, systematic=True) == (1, 3)
+    assert stripe_range(10, 3, 3, 2, systematic=True) == (0, 4)
+    assert data_fragment_ranges(10, 3, 3, 6) == [
+        (0, 3, 4),
+        (1, 0, 4),
+        (2, 0, 1),
+    ]
+
+    with pytest.raises(ValueError, match='outside'):
+        stripe_range(10, 3, 8, 3)
+    with pytest.raises(ValueError, match='symbols of the range'):
+        restore_range([0, 1, 2], [[1], [2], [3]], 3, 257, 10, 0, 9)
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+def test_iter_fragments_matches_disperse_bytes(disperse: str) -> None:
+    data = os.urandom(10_001)
+    expected = disperse_bytes(data, 5, 3, disperse)
+    fragments = list(iter_fragments(data, 5, 3, disperse, workers=2))
+
+    assert [f.idx for f in fragments] == list(range(5))
+    for fragment, other in zip(fragments, expected):
+        assert numpy.array_equal(fragment.content, other.content)
+        assert (fragment.p, fragment.systematic) == (other.p, other.systematic)
+        assert (fragment.length, fragment.digest) == (
+            other.length,
+            other.digest,
+        )
+    assert bytes(restore_bytes(fragments[2:])) == data
+
+    with pytest.raises(ValueError, match='Unknown'):
+        next(iter_fragments(data, 5, 3, 'UNKNOWN'))
+
+
+@pytest.mark.parametrize('encoder', (encode, encode_systematic))
+def test_encode_rows(encoder) -> None:
+    data = os.urandom(1001)
+    full = encoder(data, 6, 4)
+    rows = [5, 0, 3]
+    assert numpy.array_equal(encoder(data, 6, 4, rows=rows), full[rows])
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'GF256'))
+def test_iter_fragments_segments_once(disperse: str) -> None:
+    data = os.urandom(1001)
+    with mock.patch(
+        'proxystore.cdn.reliability.ida.segment_matrix',
+        wraps=segment_matrix,
+    ) as segment:
+        fragments = list(iter_fragments(data, 5, 3, disperse))
+    assert segment.call_count == 1
+    assert bytes(restore_bytes(fragments[:3])) == data
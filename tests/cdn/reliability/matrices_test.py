@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Generator
+
+import numpy
+import pytest
+
+from proxystore.cdn.constants import DISPERSE_GF256
+from proxystore.cdn.constants import DISPERSE_IDA
+from proxystore.cdn.constants import DISPERSE_IDA_SYSTEMATIC
+from proxystore.cdn.reliability import gf256
+from proxystore.cdn.reliability import ida
+from proxystore.cdn.reliability import matrices
+from proxystore.cdn.reliability.utils import build_building_blocks
+from proxystore.cdn.reliability.utils import vandermonde_inverse
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Generator[None, None, None]:
+    matrices.clear_cache()
+    yield
+    matrices.clear_cache()
+
+
+def test_encoding_matrix_cached() -> None:
+    first = matrices.encoding_matrix(DISPERSE_IDA, 3, 5, 257)
+    second = matrices.encoding_matrix(DISPERSE_IDA, 3, 5, 257)
+
+    assert first is second
+    assert numpy.array_equal(first, build_building_blocks(3, 5, 257))
+    assert not first.flags.writeable
+
+    info = matrices.cache_info()['encoding']
+    assert info['hits'] == 1
+    assert info['misses'] == 1
+    assert info['size'] == 1
+
+
+def test_encoding_matrix_keys() -> None:
+    ida_matrix = matrices.encoding_matrix(DISPERSE_IDA, 3, 5, 257)
+    systematic = matrices.encoding_matrix(DISPERSE_IDA_SYSTEMATIC, 3, 5, 257)
+    gf_matrix = matrices.encoding_matrix(DISPERSE_GF256, 3, 5, 256)
+
+    assert not numpy.array_equal(ida_matrix, systematic)
+    assert gf_matrix == tuple(
+        tuple(row) for row in gf256.build_building_blocks(3, 5)
+    )
+    assert matrices.cache_info()['encoding']['misses'] == 3
+
+
+def test_decoding_matrix() -> None:
+    inverse = matrices.decoding_matrix(DISPERSE_IDA, 257, [4, 0, 2])
+    expected = numpy.array(vandermonde_inverse([5, 1, 3], 257)).T
+    assert numpy.array_equal(inverse, expected)
+
+    # Indices are normalized so lists, tuples and arrays share an entry.
+    again = matrices.decoding_matrix(DISPERSE_IDA, 257, numpy.array([4, 0, 2]))
+    assert again is inverse
+    # The order of the surviving fragments matters.
+    other = matrices.decoding_matrix(DISPERSE_IDA, 257, (0, 2, 4))
+    assert other is not inverse
+
+    info = matrices.cache_info()['decoding']
+    assert info['hits'] == 1
+    assert info['misses'] == 2
+
+
+@pytest.mark.parametrize(
+    ('mode', 'p'),
+    (
+        (DISPERSE_IDA_SYSTEMATIC, 257),
+        (DISPERSE_GF256, gf256.FIELD_ORDER),
+    ),
+)
+def test_decoding_matrix_inverts_rows(mode: str, p: int) -> None:
+    indices = (6, 1, 3)
+    coding = matrices.encoding_matrix(mode, 3, 7, p)
+    inverse = matrices.decoding_matrix(mode, p, indices)
+    rows = [coding[i] for i in indices]
+
+    for i in range(3):
+        for j in range(3):
+            if mode == DISPERSE_GF256:
+                value = 0
+                for k in range(3):
+                    value ^= gf256.mul(inverse[i][k], rows[k][j])
+            else:
+                value = (
+                    sum(int(inverse[i][k]) * int(rows[k][j]) for k in range(3))
+                    % p
+                )
+            assert value == int(i == j)
+
+
+def test_lru_eviction() -> None:
+    for n in range(1, matrices.ENCODING_CACHE_SIZE + 2):
+        matrices.encoding_matrix(DISPERSE_IDA, 1, n, 257)
+
+    info = matrices.cache_info()['encoding']
+    assert info['size'] == matrices.ENCODING_CACHE_SIZE
+    assert info['misses'] == matrices.ENCODING_CACHE_SIZE + 1
+
+    # n=1 was the least recently used entry so it was evicted.
+    matrices.encoding_matrix(DISPERSE_IDA, 1, 1, 257)
+    assert matrices.cache_info()['encoding']['hits'] == 0
+
+
+def test_unknown_mode() -> None:
+    with pytest.raises(ValueError, match='Unknown dispersal mode'):
+        matrices.encoding_matrix('XOR', 1, 2, 257)
+    with pytest.raises(ValueError, match='Unknown dispersal mode'):
+        matrices.decoding_matrix('XOR', 257, [0])
+
+
+def test_codecs_reuse_matrices() -> None:
+    data = bytes(range(256)) * 10
+
+    for _ in range(3):
+        fragments = ida.encode(data, 5, 3)
+        restored = ida.decode([4, 1, 2], fragments[[4, 1, 2]], 3, 257)
+        assert restored.tobytes()[: len(data)] == data
+
+        encoded = gf256.encode(data, 5, 3)
+        restored = gf256.decode([3, 0, 4], encoded[[3, 0, 4]], 3, len(data))
+        assert restored.tobytes() == data
+
+    info = matrices.cache_info()
+    assert info['encoding']['misses'] == 2
+    assert info['encoding']['hits'] == 4
+    assert info['decoding']['misses'] == 2
+    assert info['decoding']['hits'] == 4
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+
+import numpy
+import pytest
+
+from proxystore.cdn.reliability.fragment_handler import dumps_fragment
+from proxystore.cdn.reliability.ida import disperse_bytes
+from proxystore.cdn.reliability.ida import restore_bytes
+from proxystore.cdn.reliability.repair import fragment_mode
+from proxystore.cdn.reliability.repair import repair_fragment
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'IDA_SYSTEMATIC', 'GF256'))
+@pytest.mark.parametrize('size', (1, 1000, 100_001))
+def test_repair_matches_encoder(disperse: str, size: int) -> None:
+    data = os.urandom(size)
+    fragments = disperse_bytes(data, 6, 4, disperse)
+    assert fragment_mode(fragments[0]) == disperse
+
+    for target in range(6):
+        surviving = [f for f in reversed(fragments) if f.idx != target]
+        repaired = repair_fragment(surviving[:4], target, workers=2)
+        expected = fragments[target]
+        assert repaired.idx == target
+        assert repaired.content.dtype == expected.content.dtype
+        assert numpy.array_equal(repaired.content, expected.content)
+        assert dumps_fragment(repaired) == dumps_fragment(expected)
+
+    # Repaired fragments restore the payload.
+    repaired = [repair_fragment(fragments[2:], i) for i in (0, 1)]
+    assert restore_bytes(repaired + fragments[4:]).tobytes() == data
+
+
+def test_repair_available_fragment_copies() -> None:
+    fragments = disperse_bytes(b'data', 3, 2)
+    repaired = repair_fragment(fragments, 1)
+    assert numpy.array_equal(repaired.content, fragments[1].content)
+    assert repaired.content is not fragments[1].content
+
+
+def test_repair_errors() -> None:
+    fragments = disperse_bytes(b'data', 5, 3)
+    other = disperse_bytes(b'other', 5, 3)
+
+    with pytest.raises(ValueError, match='No fragments'):
+        repair_fragment([], 0)
+    with pytest.raises(ValueError, match='out of range'):
+        repair_fragment(fragments, 5)
+    with pytest.raises(ValueError, match='insufficient'):
+        repair_fragment(fragments[:2], 4)
+    with pytest.raises(ValueError, match='same file'):
+        repair_fragment([fragments[0], other[1], fragments[2]], 4)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import io
+import os
+import pathlib
+
+import pytest
+
+from proxystore.cdn.reliability.stream import decode_stream
+from proxystore.cdn.reliability.stream import encode_stream
+from proxystore.cdn.reliability.stream import symbol_dtype
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _disperse(source, n, m, disperse, block_size):
+    fragments = [bytearray() for _ in range(n)]
+    sizes = set()
+    for blocks in encode_stream(source, n, m, disperse, block_size):
+        assert len(blocks) == n
+        sizes.add(len(blocks[0]))
+        for i, block in enumerate(blocks):
+            fragments[i] += block
+    return fragments, sizes
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'GF256'))
+@pytest.mark.parametrize('size', (1, 1000, 4096, 10001))
+def test_stream_roundtrip(disperse: str, size: int) -> None:
+    data = os.urandom(size)
+    n, m, block_size = 5, 3, 1000
+
+    fragments, sizes = _disperse(io.BytesIO(data), n, m, disperse, block_size)
+    assert len(sizes) <= 2
+    itemsize = symbol_dtype(n, disperse).itemsize
+    assert max(sizes) <= 999 // m * itemsize
+
+    indices = [4, 1, 2]
+    # Fragment streams may arrive in arbitrarily sized chunks.
+    streams = [_chunks(fragments[i], 77) for i in indices]
+    restored = b''.join(
+        bytes(block)
+        for block in decode_stream(
+            indices,
+            streams,
+            n,
+            m,
+            disperse,
+            size,
+            block_size,
+        )
+    )
+    assert restored == data
+
+
+def test_stream_sources(tmp_path: pathlib.Path) -> None:
+    data = os.urandom(5000)
+    filepath = tmp_path / 'data.bin'
+    filepath.write_bytes(data)
+    chunks = _chunks(data, 333)
+
+    expected, _ = _disperse(io.BytesIO(data), 4, 2, 'GF256', 512)
+    for source in (str(filepath), filepath, chunks):
+        assert _disperse(source, 4, 2, 'GF256', 512)[0] == expected
+
+    fragment_files = []
+    for i in (0, 3):
+        path = tmp_path / f'fragment{i}'
+        path.write_bytes(expected[i])
+        fragment_files.append(path)
+    restored = b''.join(
+        bytes(b)
+        for b in decode_stream([0, 3], fragment_files, 4, 2, 'GF256', 5000)
+    )
+    assert restored == data
+
+
+def test_stream_padding_without_size() -> None:
+    fragments, _ = _disperse([b'abc'], 2, 2, 'IDA', 100)
+    restored = b''.join(
+        bytes(b) for b in decode_stream([0, 1], [[f] for f in fragments], 2, 2)
+    )
+    assert restored == b'abc\0'
+
+
+def test_stream_errors() -> None:
+    with pytest.raises(ValueError, match='Unknown'):
+        symbol_dtype(3, 'XOR')
+    with pytest.raises(ValueError, match='16 bits'):
+        symbol_dtype(70000, 'IDA')
+
+    fragments, _ = _disperse([b'abcdef'], 3, 2, 'GF256', 100)
+    with pytest.raises(ValueError, match='minimum number'):
+        list(decode_stream([0], [[fragments[0]]], 3, 2, 'GF256'))
+    with pytest.raises(ValueError, match='different lengths'):
+        list(
+            decode_stream(
+                [0, 1],
+                [[fragments[0]], [fragments[1][:1]]],
+                3,
+                2,
+                'GF256',
+            ),
+        )
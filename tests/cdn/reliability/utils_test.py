@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import itertools
+import threading
+
+import numpy
+import pytest
+
+from proxystore.cdn.reliability.utils import build_building_blocks
+from proxystore.cdn.reliability.utils import build_systematic_blocks
+from proxystore.cdn.reliability.utils import ENCODE_BLOCK_STRIPES
+from proxystore.cdn.reliability.utils import for_each_block
+from proxystore.cdn.reliability.utils import matrix_inverse
+from proxystore.cdn.reliability.utils import matrix_product
+from proxystore.cdn.reliability.utils import mod_matmul
+
+
+@pytest.mark.parametrize(
+    ('rows', 'inner', 'p'),
+    ((3, 4, 257), (12, 63, 257), (4, 3, 2**20 + 7), (2, 3, 2**31 - 1)),
+)
+def test_mod_matmul_matches_matrix_product(
+    rows: int,
+    inner: int,
+    p: int,
+) -> None:
+    rng = numpy.random.default_rng(0)
+    a = rng.integers(0, p, size=(rows, inner), dtype=numpy.int64)
+    b = rng.integers(0, p, size=(inner, 5), dtype=numpy.int64)
+
+    expected = matrix_product(a.tolist(), b.tolist(), p)
+    result = mod_matmul(a, b, p)
+
+    assert result.astype(object).tolist() == expected
+
+
+def test_mod_matmul_exact_at_multiples_of_p() -> None:
+    p = 257
+    a = numpy.full((1, 63), p - 1, dtype=numpy.int64)
+    b = numpy.full((63, 1), p - 1, dtype=numpy.int64)
+
+    assert int(mod_matmul(a, b, p)[0, 0]) == (63 * (p - 1) ** 2) % p
+
+
+def test_matrix_inverse() -> None:
+    p = 257
+    matrix = build_building_blocks(4, 9, p)
+    rows = [matrix[i] for i in (8, 0, 3, 5)]
+
+    identity = matrix_product(matrix_inverse(rows, p), rows, p)
+
+    assert identity == [[int(i == j) for j in range(4)] for i in range(4)]
+    with pytest.raises(ValueError, match='not invertible'):
+        matrix_inverse([[1, 2], [2, 4]], p)
+
+
+def test_build_systematic_blocks() -> None:
+    p = 257
+    blocks = build_systematic_blocks(3, 6, p)
+
+    assert blocks[:3] == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    # Every choice of 3 rows must still be invertible.
+    for rows in itertools.combinations(blocks, 3):
+        matrix_inverse(list(rows), p)
+
+
+@pytest.mark.parametrize('workers', (1, 2, 3, 16))
+def test_for_each_block_covers_range(workers: int) -> None:
+    total = 5 * ENCODE_BLOCK_STRIPES + 7
+    covered = numpy.zeros(total, dtype=numpy.int64)
+    threads = set()
+
+    def _mark(start: int, end: int) -> None:
+        assert end - start <= ENCODE_BLOCK_STRIPES
+        covered[start:end] += 1
+        threads.add(threading.get_ident())
+
+    for_each_block(_mark, total, workers)
+
+    assert numpy.all(covered == 1)
+    assert len(threads) <= workers
+
+
+def test_for_each_block_errors() -> None:
+    def _fail(start: int, end: int) -> None:
+        raise RuntimeError('block failed')
+
+    with pytest.raises(RuntimeError, match='block failed'):
+        for_each_block(_fail, 4 * ENCODE_BLOCK_STRIPES, 4)
+    with pytest.raises(ValueError, match='workers'):
+        for_each_block(_fail, 1, 0)
+    # Nothing to do for an empty range.
+    for_each_block(_fail, 0, 4)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import email.parser
+import email.policy
+import hashlib
+import json
+import pathlib
+import zlib
+
+import pytest
+
+from proxystore.cdn.upload import file_digest
+from proxystore.cdn.upload import MultipartFileBody
+from proxystore.cdn.upload import part_checksum
+from proxystore.cdn.upload import part_ranges
+
+
+def test_file_digest(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'file'
+    data = b'abc' * 1000
+    path.write_bytes(data)
+
+    assert (
+        file_digest(path, block_size=7) == hashlib.sha3_256(data).hexdigest()
+    )
+    assert file_digest(path, 'sha256') == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize('size', (0, 1, 1000))
+def test_multipart_file_body(tmp_path: pathlib.Path, size: int) -> None:
+    path = tmp_path / 'file'
+    data = bytes(i % 256 for i in range(size))
+    path.write_bytes(data)
+    payload = {'key': 'key', 'size': size}
+
+    with MultipartFileBody(payload, path, block_size=64) as body:
+        parts = []
+        while True:
+            chunk = body.read(100)
+            if not chunk:
+                break
+            assert len(chunk) <= 100
+            parts.append(chunk)
+        content = b''.join(parts)
+        assert len(content) == len(body)
+        # Reads without a size are bounded by the block size.
+        assert body.read() == b''
+
+    header = f'Content-Type: {body.content_type}\r\n\r\n'.encode()
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        header + content,
+    )
+    received = {
+        part.get_param('name', header='content-disposition'): part.get_payload(
+            decode=True,
+        )
+        for part in message.iter_parts()
+    }
+    assert json.loads(received['json']) == payload
+    assert received['data'] == data
+
+
+def test_multipart_file_body_truncated(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / 'file'
+    path.write_bytes(b'x' * 100)
+
+    with MultipartFileBody({}, path) as body:
+        body.read(len(body._prefix))
+        path.write_bytes(b'')
+        with pytest.raises(OSError, match='truncated'):
+            body.read(10)
+
+
+def test_part_ranges() -> None:
+    assert list(part_ranges(0, 4)) == [(0, 0)]
+    assert list(part_ranges(8, 4)) == [(0, 4), (4, 8)]
+    assert list(part_ranges(10, 4)) == [(0, 4), (4, 8), (8, 10)]
+    with pytest.raises(ValueError, match='part_size'):
+        list(part_ranges(10, 0))
+
+
+def test_part_checksum() -> None:
+    assert part_checksum(b'') == '00000000'
+    assert part_checksum(memoryview(b'data')) == f'{zlib.crc32(b"data"):08x}'
@@ -15,6 +15,7 @@ import uvloop
 
 # Import fixtures from testing/ so they are known by pytest
 # and can be used with
+from testing.cdn import cdn_gateway
 from testing.connectors import connectors
 from testing.connectors import endpoint_connector
 from testing.connectors import file_connector
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from proxystore.connectors.cdn import CDNConnectorError
+from proxystore.connectors.cdn_async import AsyncCDNConnector
+from testing.cdn import CDNGateway
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize('disperse', ('SINGLE', 'IDA'))
+async def test_put_get(
+    cdn_gateway: CDNGateway,
+    disperse: str,
+) -> None:
+    data = bytes(range(256)) * 10
+    async with AsyncCDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        key, _ = await connector.put(
+            data,
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse=disperse,
+        )
+        assert key.dispersed == (disperse != 'SINGLE')
+        assert await connector.get(key) == data
+
+
+@pytest.mark.asyncio()
+async def test_exists_evict(cdn_gateway: CDNGateway) -> None:
+    async with AsyncCDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        key, _ = await connector.put(b'data')
+        assert await connector.exists(key)
+        await connector.evict(key)
+        assert not await connector.exists(key)
+
+
+@pytest.mark.asyncio()
+async def test_batch(cdn_gateway: CDNGateway) -> None:
+    objs = [bytes([i]) * 100 for i in range(10)]
+    async with AsyncCDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        limit=3,
+    ) as connector:
+        keys = [key for key, _ in await connector.put_batch(objs)]
+        assert await connector.exists_batch(keys) == [True] * len(keys)
+        assert await connector.get_batch(keys) == objs
+        await connector.evict_batch(keys)
+        assert await connector.exists_batch(keys) == [False] * len(keys)
+
+
+@pytest.mark.asyncio()
+async def test_get_missing(cdn_gateway: CDNGateway) -> None:
+    async with AsyncCDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        with pytest.raises(CDNConnectorError):
+            await connector.get(connector.new_key())
+
+
+def test_config() -> None:
+    connector = AsyncCDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway='localhost:1234',
+        limit=5,
+    )
+    config = connector.config()
+    assert AsyncCDNConnector.from_config(config).config() == config
@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pathlib
+from unittest import mock
+
+import pytest
+
+from proxystore.connectors.cdn import _map_file
+from proxystore.connectors.cdn import CDNConnector
+from proxystore.connectors.cdn import CDNConnectorError
+from testing.cdn import CDNGateway
+from testing.utils import open_port
+
+
+@pytest.fixture()
+def connector():
+    with CDNConnector(
+        catalog='catalog',
+        user_token='token',
+        gateway='localhost:1234',
+    ) as connector:
+        yield connector
+
+
+@pytest.mark.parametrize('disperse', ('IDA', 'GF256'))
+def test_put_client_side_dispersal(
+    connector: CDNConnector,
+    disperse: str,
+) -> None:
+    metrics = {'metadata_time': 0}
+    with mock.patch.object(
+        connector.client,
+        'put_chunks',
+        return_value=metrics,
+    ) as put_chunks:
+        key, result = connector.put(
+            b'data',
+            number_of_chunks=5,
+            required_chunks=3,
+            disperse=disperse,
+        )
+
+    assert result == metrics
+    kwargs = put_chunks.call_args.kwargs
+    assert kwargs['key'] == key.cdn_key
+    assert kwargs['disperse'] == disperse
+    assert (kwargs['chunks'], kwargs['required_chunks']) == (5, 3)
+    assert kwargs['max_workers'] == 1
+
+
+def test_put_single(connector: CDNConnector) -> None:
+    with mock.patch.object(connector.client, 'put') as put, mock.patch.object(
+        connector.client,
+        'put_chunks',
+    ) as put_chunks:
+        connector.put(b'data')
+
+    put.assert_called_once()
+    put_chunks.assert_not_called()
+
+
+def test_dispersed_put_get(cdn_gateway: CDNGateway) -> None:
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        key, _ = connector.put(
+            b'data',
+            number_of_chunks=4,
+            required_chunks=2,
+            disperse='IDA_SYSTEMATIC',
+        )
+        assert key.dispersed
+        assert connector.get(key) == b'data'
+
+
+def test_dispersed_put_get_workers(cdn_gateway: CDNGateway) -> None:
+    data = bytes(range(256)) * 1000
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        workers=2,
+    ) as connector:
+        assert connector.config()['workers'] == 2
+        key, _ = connector.put(
+            data,
+            workers=4,
+            number_of_chunks=5,
+            required_chunks=3,
+            disperse='IDA',
+        )
+        cdn_gateway.failed_nodes.add(0)
+        assert connector.get(key) == data
+
+
+def test_get_range(cdn_gateway: CDNGateway) -> None:
+    data = bytes(range(256)) * 10
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        dispersed, _ = connector.put(
+            data,
+            number_of_chunks=4,
+            required_chunks=2,
+            disperse='GF256',
+        )
+        single, _ = connector.put(data)
+
+        assert connector.get_range(dispersed, 100, 50) == data[100:150]
+        assert connector.get_range(single, 100, 50) == data[100:150]
+
+
+@pytest.mark.parametrize('disperse', ('SINGLE', 'IDA'))
+def test_put_filepath(
+    cdn_gateway: CDNGateway,
+    tmp_path: pathlib.Path,
+    disperse: str,
+) -> None:
+    path = tmp_path / 'file'
+    data = bytes(range(256)) * 100
+    path.write_bytes(data)
+
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector, mock.patch(
+        'builtins.open',
+        wraps=open,
+    ) as mock_open:
+        key, _ = connector.put(
+            filepath=str(path),
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse=disperse,
+        )
+        assert connector.get(key) == data
+
+    # The file is never read into memory in one call.
+    for call in mock_open.call_args_list:
+        assert call.args[1:] in (('rb',), ())
+
+
+def test_put_filepath_closes_mapping(
+    cdn_gateway: CDNGateway,
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / 'file'
+    data = os.urandom(1000)
+    path.write_bytes(data)
+
+    mappings = []
+
+    def _map(filepath: str) -> bytes | mmap.mmap:
+        mappings.append(_map_file(filepath))
+        return mappings[-1]
+
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector, mock.patch(
+        'proxystore.connectors.cdn._map_file',
+        side_effect=_map,
+    ):
+        key, _ = connector.put(
+            filepath=str(path),
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse='IDA',
+        )
+        assert connector.get(key) == data
+
+    assert len(mappings) == 1
+    assert isinstance(mappings[0], mmap.mmap)
+    assert mappings[0].closed
+
+
+@pytest.mark.parametrize('disperse', ('SINGLE', 'IDA'))
+def test_get_to_file(
+    cdn_gateway: CDNGateway,
+    tmp_path: pathlib.Path,
+    disperse: str,
+) -> None:
+    data = bytes(range(256)) * 100
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+    ) as connector:
+        key, _ = connector.put(
+            data,
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse=disperse,
+        )
+        path = tmp_path / 'file'
+        assert connector.get_to_file(key, str(path)) == len(data)
+    assert path.read_bytes() == data
+
+
+def test_get_ranges(cdn_gateway: CDNGateway) -> None:
+    data = bytes(range(256)) * 10
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        connections=3,
+        range_size=1000,
+    ) as connector:
+        assert connector.config()['connections'] == 3
+        key, _ = connector.put(data)
+        assert connector.get(key) == data
+    assert cdn_gateway.count('GET', 'storage') == 3
+
+
+def test_exists_cached(cdn_gateway: CDNGateway) -> None:
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        metadata_cache_ttl=60,
+    ) as connector:
+        config = connector.config()
+        assert CDNConnector.from_config(config).config() == config
+
+        key, _ = connector.put(b'data')
+        for _ in range(3):
+            assert connector.exists(key)
+        assert cdn_gateway.count('GET', 'storage') == 0
+        connector.evict(key)
+        assert not connector.exists(key)
+
+
+def test_batch(cdn_gateway: CDNGateway) -> None:
+    objs = [bytes([i]) * 100 for i in range(10)]
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        batch_workers=4,
+    ) as connector:
+        keys = [key for key, _ in connector.put_batch(objs)]
+        keys.append(connector.new_key())
+        dispersed, _ = connector.put(
+            b'dispersed',
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse='IDA',
+        )
+
+        assert connector.exists_batch(keys) == [True] * 10 + [False]
+        assert connector.get_batch([*keys, dispersed]) == [
+            *objs,
+            None,
+            b'dispersed',
+        ]
+        # One lookup for exists_batch and one for get_batch.
+        assert cdn_gateway.count('POST', 'storage') == 2
+        connector.evict_batch(keys[:5])
+        assert cdn_gateway.count('POST', 'storage') == 3
+        assert connector.exists_batch(keys) == [False] * 5 + [True] * 5 + [
+            False,
+        ]
+        assert connector.put_batch() == []
+
+
+def test_put_dedup(cdn_gateway: CDNGateway) -> None:
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        dedup=True,
+    ) as connector:
+        config = connector.config()
+        with CDNConnector.from_config(config) as copy:
+            assert copy.config() == config
+
+        key, metrics = connector.put(b'data')
+        assert not metrics['deduplicated']
+        alias, metrics = connector.put(b'data')
+        assert alias != key
+        assert metrics['deduplicated']
+        other, metrics = connector.put(b'data', dedup=False)
+        assert 'deduplicated' not in metrics
+        assert cdn_gateway.count('PUT', 'storage') == 2
+
+        # Each key holds a reference, so evicting one keeps the content.
+        connector.evict(key)
+        assert connector.get(alias) == b'data'
+
+
+def test_put_dedup_resumable(cdn_gateway: CDNGateway) -> None:
+    data = os.urandom(1000)
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        dedup=True,
+        upload_part_size=400,
+    ) as connector:
+        key, metrics = connector.put(data)
+        assert not metrics['deduplicated']
+        assert cdn_gateway.count('PUT', 'uploads') == 3
+        alias, metrics = connector.put(data)
+        assert metrics['deduplicated']
+        assert cdn_gateway.count('PUT', 'uploads') == 3
+        connector.evict(key)
+        assert connector.get(alias) == data
+
+
+def test_compression(cdn_gateway: CDNGateway, tmp_path: pathlib.Path) -> None:
+    data = b'proxystore' * 10_000
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        compression=['zlib'],
+    ) as connector:
+        config = connector.config()
+        assert CDNConnector.from_config(config).config() == config
+
+        key, metrics = connector.put(data)
+        assert key.codec == 'zlib'
+        assert metrics['saved_bytes'] > 0
+        stored = cdn_gateway.objects[('user', key.cdn_key)]
+        assert len(stored) == metrics['stored_size'] < len(data)
+        assert connector.get(key) == data
+        assert connector.get_range(key, 5, 10) == data[5:15]
+        path = tmp_path / 'object'
+        assert connector.get_to_file(key, str(path)) == len(data)
+        assert path.read_bytes() == data
+
+        dispersed, _ = connector.put(
+            data,
+            number_of_chunks=3,
+            required_chunks=2,
+            disperse='IDA',
+        )
+        assert dispersed.codec == 'zlib'
+        assert connector.get(dispersed) == data
+
+        random = os.urandom(1000)
+        key, metrics = connector.put(random)
+        assert key.codec is None
+        assert metrics['codec'] is None
+        assert connector.get(key) == random
+
+    with pytest.raises(ValueError, match='Unknown compression codec'):
+        CDNConnector(
+            catalog='catalog',
+            user_token='user',
+            gateway=cdn_gateway.address,
+            compression=['missing'],
+        )
+
+
+def test_put_resumable(
+    cdn_gateway: CDNGateway,
+    tmp_path: pathlib.Path,
+) -> None:
+    data = os.urandom(1000)
+    path = tmp_path / 'object'
+    path.write_bytes(data)
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=cdn_gateway.address,
+        upload_part_size=300,
+    ) as connector:
+        config = connector.config()
+        assert CDNConnector.from_config(config).config() == config
+
+        key, metrics = connector.put(data, workers=2)
+        assert metrics['parts'] == 4
+        assert connector.get(key) == data
+        key, metrics = connector.put(filepath=str(path))
+        assert metrics['parts'] == 4
+        assert connector.get(key) == data
+        key, metrics = connector.put(b'small')
+        assert 'parts' not in metrics
+        assert cdn_gateway.count('POST', 'uploads') == 2 * 2
+
+
+def test_multiple_gateways(cdn_gateway: CDNGateway) -> None:
+    dead = f'localhost:{open_port()}'
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=f'{dead}, {cdn_gateway.address}',
+    ) as connector:
+        assert connector.gateways == [dead, cdn_gateway.address]
+        first, second = connector.clients.values()
+        assert first.session is second.session is connector._session
+        assert first.metadata_cache is second.metadata_cache
+        assert first.content_index is second.content_index
+        assert first.node_latency is second.node_latency
+        config = connector.config()
+        with CDNConnector.from_config(config) as copy:
+            assert copy.config() == config
+
+        keys = [connector.put(bytes([i]) * 10)[0] for i in range(5)]
+        assert connector.get_batch(keys) == [bytes([i]) * 10 for i in range(5)]
+        assert connector.exists(keys[0])
+
+        stats = connector.gateway_stats()
+        # The dead gateway is skipped once a request failed to connect.
+        assert stats[dead]['failures'] <= 1
+        assert stats[dead]['requests'] == stats[dead]['failures']
+        assert stats[cdn_gateway.address]['requests'] >= 10
+        assert stats[cdn_gateway.address]['healthy']
+
+
+def test_all_gateways_unreachable() -> None:
+    gateways = [f'localhost:{open_port()}' for _ in range(2)]
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=gateways,
+    ) as connector:
+        with pytest.raises(CDNConnectorError):
+            connector.put(b'data')
+        stats = connector.gateway_stats()
+        assert all(stats[g]['failures'] == 1 for g in gateways)
+
+
+def test_get_hedged(cdn_gateway: CDNGateway) -> None:
+    dead = f'localhost:{open_port()}'
+    with CDNConnector(
+        catalog='catalog',
+        user_token='user',
+        gateway=[cdn_gateway.address, dead],
+        hedge_percentile=0.9,
+        hedge_timeout=5,
+    ) as connector:
+        config = connector.config()
+        with CDNConnector.from_config(config) as copy:
+            assert copy.config() == config
+
+        key, _ = connector.put(b'data')
+        cdn_gateway.failed_gets = 1
+        for _ in range(5):
+            assert connector.get(key) == b'data'
+        assert connector.hedge is not None
+        assert connector.hedge.stats()['reads'] == 5
+        with pytest.raises(CDNConnectorError):
+            connector.get(connector.new_key())
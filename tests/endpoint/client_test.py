@@ -8,6 +8,9 @@ import requests
 
 from proxystore.endpoint import client
 from proxystore.endpoint.config import EndpointConfig
+from proxystore.utils.hedging import HedgePolicy
+from proxystore.utils.hedging import RetryBudget
+from testing.utils import open_port
 
 
 def test_basic_client_interaction(endpoint: EndpointConfig) -> None:
@@ -59,3 +62,18 @@ def test_errors_raised() -> None:
 
         with pytest.raises(requests.exceptions.RequestException):
             client.get(address, key)
+
+
+def test_get_hedged(endpoint: EndpointConfig) -> None:
+    address = f'http://{endpoint.host}:{endpoint.port}'
+    dead = f'http://localhost:{open_port()}'
+    key = str(uuid.uuid4())
+    client.put(address, key, b'test')
+
+    hedge = HedgePolicy(timeout=5, budget=RetryBudget())
+    assert client.get(address, key, hedge=hedge) == b'test'
+    # Retried on the replica when the first endpoint is unreachable.
+    assert client.get(dead, key, hedge=hedge, replicas=[address]) == b'test'
+    assert client.get(dead, 'missing', hedge=hedge, replicas=[address]) is None
+    assert hedge.stats()['retries'] == 2
+    hedge.close()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+import requests
+
+from proxystore.utils.hedging import HEDGE_MIN_SAMPLES
+from proxystore.utils.hedging import HedgePolicy
+from proxystore.utils.hedging import is_transient
+from proxystore.utils.hedging import LatencyTracker
+from proxystore.utils.hedging import RetryBudget
+
+
+def _server_error(status: int) -> requests.exceptions.RequestException:
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.RequestException(response=response)
+
+
+def test_is_transient() -> None:
+    assert is_transient(requests.exceptions.ConnectionError())
+    assert is_transient(requests.exceptions.ReadTimeout())
+    assert is_transient(_server_error(503))
+    assert not is_transient(_server_error(404))
+    assert not is_transient(requests.exceptions.RequestException())
+    assert not is_transient(ValueError())
+
+
+def test_retry_budget() -> None:
+    budget = RetryBudget(ratio=0.5, reserve=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+    with pytest.raises(ValueError, match='non-negative'):
+        RetryBudget(ratio=-1)
+
+
+def test_latency_tracker() -> None:
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(0.5) is None
+    for i in range(20):
+        tracker.record(float(i))
+    assert len(tracker) == 10
+    assert tracker.percentile(0) == 10
+    assert tracker.percentile(0.5) == 15
+    assert tracker.percentile(1) == 19
+
+
+def test_policy_invalid() -> None:
+    with pytest.raises(ValueError, match='percentile'):
+        HedgePolicy(percentile=0)
+    with pytest.raises(ValueError, match='max_attempts'):
+        HedgePolicy(max_attempts=0)
+
+
+def test_policy_delay() -> None:
+    policy = HedgePolicy(percentile=0.5, initial_delay=1)
+    assert policy.delay() == 1
+    for _ in range(HEDGE_MIN_SAMPLES):
+        assert policy.run(lambda attempt: attempt) == 0
+    assert policy.delay() < 1
+    assert policy.stats()['reads'] == HEDGE_MIN_SAMPLES
+    assert policy.stats()['hedges'] == 0
+    policy.close()
+
+
+def test_hedge_slow_request() -> None:
+    release = threading.Event()
+
+    def _request(attempt: int) -> int:
+        if attempt == 0:
+            release.wait(5)
+        return attempt
+
+    policy = HedgePolicy(initial_delay=0.01, budget=RetryBudget())
+    start = time.perf_counter()
+    try:
+        assert policy.run(_request) == 1
+    finally:
+        release.set()
+        policy.close()
+    assert time.perf_counter() - start < 5
+    stats = policy.stats()
+    assert stats['hedges'] == stats['hedge_wins'] == 1
+
+
+def test_retry_transient_errors() -> None:
+    calls: list[int] = []
+
+    def _request(attempt: int) -> int:
+        calls.append(attempt)
+        if attempt < 2:
+            raise _server_error(503)
+        return attempt
+
+    policy = HedgePolicy(max_attempts=3, budget=RetryBudget())
+    assert policy.run(_request) == 2
+    assert calls == [0, 1, 2]
+    assert policy.stats()['retries'] == 2
+
+    calls.clear()
+    with pytest.raises(requests.exceptions.RequestException):
+        policy.run(lambda attempt: _request(attempt - 5))
+    assert len(calls) == 3
+    policy.close()
+
+
+def test_errors_not_retried() -> None:
+    calls: list[int] = []
+
+    def _request(attempt: int) -> int:
+        calls.append(attempt)
+        raise _server_error(404)
+
+    policy = HedgePolicy(budget=RetryBudget())
+    with pytest.raises(requests.exceptions.RequestException):
+        policy.run(_request)
+    assert calls == [0]
+    policy.close()
+
+
+def test_budget_limits_retries() -> None:
+    def _request(attempt: int) -> int:
+        raise requests.exceptions.ConnectionError()
+
+    policy = HedgePolicy(max_attempts=10, budget=RetryBudget(0, reserve=2))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.run(_request)
+    stats = policy.stats()
+    assert stats['retries'] == 2
+    assert stats['denied'] == 1
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.run(_request)
+    assert policy.stats()['retries'] == 2
+    policy.close()
+
+
+def test_single_attempt() -> None:
+    calls: list[int] = []
+
+    def _request(attempt: int) -> int:
+        calls.append(attempt)
+        raise requests.exceptions.ConnectionError()
+
+    policy = HedgePolicy(max_attempts=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.run(_request)
+    assert calls == [0]